@@ -10,10 +10,7 @@ from tqdm import tqdm
 
 import config
 from binance_client import BinanceClient
-from indicators import (
-    calculate_rsi, detect_candle_pattern, calculate_ema,
-    calculate_bollinger_bands, calculate_macd, check_entry_signal
-)
+from indicators import compute_all_indicators, check_entry_signals
 
 # Configure logging
 logging.basicConfig(
@@ -303,11 +300,7 @@ class Backtester:
 
         # Calculate indicators
         logger.info("Calculating indicators...")
-        df = calculate_rsi(df)
-        df = detect_candle_pattern(df)
-        df = calculate_ema(df)
-        df = calculate_bollinger_bands(df)
-        df = calculate_macd(df)
+        df = compute_all_indicators(df, inplace=True)
 
         # Log indicator values for the last few candles to verify they're calculated correctly
         logger.info("Sample indicator values for the last 3 candles:")
@@ -340,6 +333,15 @@ class Backtester:
         # Track signal counts for debugging
         signal_counts = {'LONG': 0, 'SHORT': 0, 'NONE': 0}
 
+        # Entry signal for every candle, as check_entry_signal would see it
+        signals = check_entry_signals(df)
+
+        # Entry price multipliers for TP/SL, fixed for the whole run
+        long_tp_factor = 1 + self.take_profit_pct / 100
+        long_sl_factor = 1 - self.stop_loss_pct / 100
+        short_tp_factor = 1 - self.take_profit_pct / 100
+        short_sl_factor = 1 + self.stop_loss_pct / 100
+
         for i in tqdm(range(1, len(df)), desc="Backtesting"):
             try:
                 # Get current candle
@@ -352,29 +354,32 @@ class Backtester:
                 if self.current_position is not None:
                     # Use high/low prices to check for TP/SL hits
                     if self.current_position == 'LONG':
+                        take_profit_price = self.entry_price * long_tp_factor
+                        stop_loss_price = self.entry_price * long_sl_factor
+
                         # For long positions, check high for TP and low for SL
-                        if candle['high'] >= self.entry_price * (1 + self.take_profit_pct / 100):
+                        if candle['high'] >= take_profit_price:
                             # Take profit hit
-                            self.exit_position(timestamp, self.entry_price * (1 + self.take_profit_pct / 100), "Take Profit")
-                        elif candle['low'] <= self.entry_price * (1 - self.stop_loss_pct / 100):
+                            self.exit_position(timestamp, take_profit_price, "Take Profit")
+                        elif candle['low'] <= stop_loss_price:
                             # Stop loss hit
-                            self.exit_position(timestamp, self.entry_price * (1 - self.stop_loss_pct / 100), "Stop Loss")
+                            self.exit_position(timestamp, stop_loss_price, "Stop Loss")
                     else:  # SHORT
+                        take_profit_price = self.entry_price * short_tp_factor
+                        stop_loss_price = self.entry_price * short_sl_factor
+
                         # For short positions, check low for TP and high for SL
-                        if candle['low'] <= self.entry_price * (1 - self.take_profit_pct / 100):
+                        if candle['low'] <= take_profit_price:
                             # Take profit hit
-                            self.exit_position(timestamp, self.entry_price * (1 - self.take_profit_pct / 100), "Take Profit")
-                        elif candle['high'] >= self.entry_price * (1 + self.stop_loss_pct / 100):
+                            self.exit_position(timestamp, take_profit_price, "Take Profit")
+                        elif candle['high'] >= stop_loss_price:
                             # Stop loss hit
-                            self.exit_position(timestamp, self.entry_price * (1 + self.stop_loss_pct / 100), "Stop Loss")
+                            self.exit_position(timestamp, stop_loss_price, "Stop Loss")
 
                 # Check for entry signals if not in a position
                 if self.current_position is None:
-                    # Create a subset of data up to the current candle for signal checking
-                    df_subset = df.iloc[:i+1].copy()
-
                     # Check for entry signal
-                    signal = check_entry_signal(df_subset)
+                    signal = signals[i]
 
                     # Track signal counts
                     if signal == 'LONG':
@@ -1,11 +1,61 @@
 import time
 import hmac
+import logging
 import hashlib
 import requests
 from urllib.parse import urlencode
+import numpy as np
 import pandas as pd
 import config
-from datetime import datetime, timedelta
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to requests' stdlib decoding
+    orjson = None
+
+# Zero position amounts as the API formats them, so the common case skips float parsing
+ZERO_AMOUNTS = frozenset(('0', '0.0', '0.00', '0.000', '0.0000', '0.00000',
+                          '0.000000', '0.0000000', '0.00000000'))
+
+def is_zero_amount(amount):
+    """
+    Check whether a position amount from the API is zero
+
+    Args:
+        amount: Position amount as a string or number
+
+    Returns:
+        Boolean indicating if the amount is zero
+    """
+    return amount in ZERO_AMOUNTS or float(amount) == 0
+
+# Typed view of open positions, decoded once for vectorized consumers
+POSITION_DTYPE = np.dtype([
+    ('symbol', 'U20'),
+    ('side', 'U5'),
+    ('amount', 'f8'),
+    ('entry_price', 'f8'),
+    ('unrealized_pnl', 'f8'),
+])
+
+def positions_to_array(positions):
+    """
+    Decode position entries from the API into a NumPy record array
+
+    Args:
+        positions: List of position dictionaries as returned by get_open_positions
+
+    Returns:
+        Record array with POSITION_DTYPE fields, one row per position
+    """
+    return np.array([
+        (p.get('symbol', ''), p.get('positionSide', 'BOTH'), p['positionAmt'], p['entryPrice'],
+         p.get('unrealizedProfit', p.get('unRealizedProfit', 0)))
+        for p in positions
+    ], dtype=POSITION_DTYPE)
+
+class BinanceAPIError(Exception):
+    """Raised when a Binance API request fails after all retries and endpoints"""
 
 class BinanceClient:
     def __init__(self, api_key=None, api_secret=None, symbol=None):
@@ -17,11 +67,11 @@ class BinanceClient:
         self.current_url_index = 0  # Track which URL we're currently using
 
         # Initialize logging
-        import logging
         self.logger = logging.getLogger(__name__)
 
         # Initialize cache
         self.cache = {}  # Dictionary to store cached data
+        self._tick_sizes = None  # Per-symbol price tick sizes, built lazily from exchange info
 
         # Get exchange info to have precision data
         try:
@@ -38,7 +88,7 @@ class BinanceClient:
             self.exchange_info = {'symbols': []}
             self.symbol_info = {}
 
-    # Cache high volume pairs for 30 minutes to reduce API calls
+    # Cache high volume pairs for 5 minutes to reduce API calls
     def get_high_volume_pairs(self, min_volume=None, limit=20):
         """
         Get trading pairs with high 24h volume
@@ -53,11 +103,11 @@ class BinanceClient:
         min_volume = min_volume or config.MIN_VOLUME_USDT
 
         # Check if we have cached data
-        cache_key = f"high_volume_pairs_{min_volume}"
+        cache_key = f"high_volume_pairs_{min_volume}_{limit}"
         cached_data = self._get_from_cache(cache_key)
-        if cached_data:
+        if cached_data is not None:
             self.logger.debug("Using cached high volume pairs data")
-            return cached_data
+            return list(cached_data)
 
         # Get 24h ticker statistics
         tickers = self._send_request('GET', '/fapi/v1/ticker/24hr')
@@ -69,9 +119,6 @@ class BinanceClient:
         for pair in usdt_pairs:
             pair['quoteVolume'] = float(pair['quoteVolume'])
 
-        # Store in cache for 30 minutes
-        self._store_in_cache(cache_key, usdt_pairs, 30 * 60)  # 30 minutes in seconds
-
         # Sort by quote volume (USDT volume) in descending order
         usdt_pairs.sort(key=lambda x: x['quoteVolume'], reverse=True)
 
@@ -88,7 +135,23 @@ class BinanceClient:
         for i, (symbol, volume) in enumerate(zip(symbols, volumes)):
             print(f"{i+1}. {symbol}: {volume}")
 
-        return symbols
+        # Store the selected symbols in cache for 5 minutes
+        self._store_in_cache(cache_key, symbols, 5 * 60)
+
+        return list(symbols)
+
+    def invalidate_high_volume_cache(self):
+        """
+        Drop cached high volume pairs so the next lookup hits the API
+        """
+        for key in [k for k in self.cache if k.startswith("high_volume_pairs_")]:
+            del self.cache[key]
+
+    def invalidate_account_cache(self):
+        """
+        Drop cached account info so balances and positions are refetched
+        """
+        self.cache.pop("account_info", None)
 
     def update_symbol(self, symbol):
         """
@@ -171,6 +234,12 @@ class BinanceClient:
             hashlib.sha256
         ).hexdigest()
 
+    def _decode_json(self, response):
+        """Decode a JSON response body, using orjson when it is installed"""
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return response.json()
+
     def _store_in_cache(self, key, data, ttl_seconds):
         """
         Store data in cache with expiration time
@@ -180,7 +249,8 @@ class BinanceClient:
             data: Data to cache
             ttl_seconds: Time to live in seconds
         """
-        expiry_time = datetime.now() + timedelta(seconds=ttl_seconds)
+        # Use a monotonic clock so wall-clock adjustments don't expire entries early or late
+        expiry_time = time.monotonic() + ttl_seconds
         self.cache[key] = {
             'data': data,
             'expiry': expiry_time
@@ -198,7 +268,7 @@ class BinanceClient:
         """
         if key in self.cache:
             cache_entry = self.cache[key]
-            if datetime.now() < cache_entry['expiry']:
+            if time.monotonic() < cache_entry['expiry']:
                 return cache_entry['data']
             else:
                 # Remove expired entry
@@ -274,7 +344,7 @@ class BinanceClient:
                     )
 
                     if response.status_code == 200:
-                        return response.json()
+                        return self._decode_json(response)
                     elif response.status_code == 429:  # Rate limit exceeded
                         # Get retry-after header if available
                         retry_after = response.headers.get('Retry-After')
@@ -319,7 +389,7 @@ class BinanceClient:
                             break
 
                         # Otherwise, raise the exception
-                        raise Exception(error_msg)
+                        raise BinanceAPIError(error_msg)
                 except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
                     if attempt < retry_count - 1:
                         wait_time = (2 ** attempt) + 1
@@ -333,13 +403,13 @@ class BinanceClient:
                             self.logger.info(f"Trying with fallback endpoint: {self.base_url}")
                             break  # Break the retry loop to try with new endpoint
                         else:
-                            raise Exception(f"All API endpoints failed: {str(e)}")
+                            raise BinanceAPIError(f"All API endpoints failed: {str(e)}")
 
             # If we completed all retries without success but have more endpoints, continue to next endpoint
             continue
 
         # If we get here, all endpoints and retries failed
-        raise Exception(f"API request failed after trying all endpoints")
+        raise BinanceAPIError(f"API request failed after trying all endpoints")
 
     def _get_exchange_info(self):
         return self._send_request('GET', '/fapi/v1/exchangeInfo')
@@ -352,6 +422,26 @@ class BinanceClient:
         """Get the quantity precision for the configured symbol"""
         return self.symbol_info.get('quantityPrecision', 3)
 
+    def get_tick_size(self, symbol=None):
+        """
+        Get the price tick size for a symbol from the cached exchange info
+
+        Args:
+            symbol: Trading symbol (default: client symbol)
+
+        Returns:
+            Tick size as a float, or None if unknown
+        """
+        if self._tick_sizes is None:
+            self._tick_sizes = {}
+            for symbol_data in self.exchange_info.get('symbols', []):
+                for symbol_filter in symbol_data.get('filters', []):
+                    if symbol_filter.get('filterType') == 'PRICE_FILTER':
+                        self._tick_sizes[symbol_data['symbol']] = float(symbol_filter['tickSize'])
+                        break
+
+        return self._tick_sizes.get(symbol or self.symbol)
+
     def get_klines(self, symbol=None, interval=None, limit=None, max_retries=3):
         """
         Get candlestick data with enhanced error handling and fallbacks
@@ -515,6 +605,22 @@ class BinanceClient:
 
         return price
 
+    def get_all_prices(self):
+        """
+        Get current prices for all symbols in a single request
+
+        Returns:
+            Dictionary of symbol -> price
+        """
+        tickers = self._send_request('GET', '/fapi/v1/ticker/price')
+        prices = {ticker['symbol']: float(ticker['price']) for ticker in tickers}
+
+        # Share the prices with get_current_price for 5 seconds
+        for symbol, price in prices.items():
+            self._store_in_cache(f"price_{symbol}", price, 5)
+
+        return prices
+
     def get_account_info(self):
         """Get account information"""
         # Check cache first (cache for 10 seconds)
@@ -561,7 +667,7 @@ class BinanceClient:
                 self.logger.info(f"Positions for {symbol} before filtering zero amounts: {len(positions)}")
 
             # Filter out positions with zero amount
-            non_zero_positions = [p for p in positions if abs(float(p.get('positionAmt', 0))) > 0]
+            non_zero_positions = [p for p in positions if not is_zero_amount(p.get('positionAmt', 0))]
 
             # Log the number of non-zero positions
             self.logger.info(f"Non-zero positions after filtering: {len(non_zero_positions)}")
@@ -668,11 +774,12 @@ class BinanceClient:
                             unrealized_pnl_percent = 0
 
                     # Log PnL calculation details
-                    self.logger.debug(
-                        f"PnL calculation for {position.get('symbol', symbol)} {pos_side}: "
-                        f"entry={entry_price:.6f}, mark={current_price:.6f}, "
-                        f"amt={position_amt:.6f}, pnl={unrealized_pnl:.2f} ({unrealized_pnl_percent:.2f}%)"
-                    )
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug(
+                            f"PnL calculation for {position.get('symbol', symbol)} {pos_side}: "
+                            f"entry={entry_price:.6f}, mark={current_price:.6f}, "
+                            f"amt={position_amt:.6f}, pnl={unrealized_pnl:.2f} ({unrealized_pnl_percent:.2f}%)"
+                        )
 
                     pnl_info.append({
                         'symbol': position.get('symbol', symbol),
@@ -976,7 +1083,10 @@ class BinanceClient:
         else:
             self.logger.info(f"Placing {side} order with quantity {quantity} (one-way mode)")
 
-        return self._send_request('POST', '/fapi/v1/order', params, signed=True, recv_window=60000)
+        response = self._send_request('POST', '/fapi/v1/order', params, signed=True, recv_window=60000)
+        # A market fill changes balance and positions right away
+        self.invalidate_account_cache()
+        return response
 
     def place_take_profit_order(self, side, quantity, stop_price, position_side, symbol=None):
         """
@@ -1240,11 +1350,12 @@ class BinanceClient:
             fee_amount = order_value * fee_rate
 
             # Log the calculation
-            self.logger.debug(
-                f"Fee calculation: quantity={quantity}, price={price}, "
-                f"order_value={order_value:.2f}, fee_rate={fee_rate*100:.4f}%, "
-                f"fee_amount={fee_amount:.6f}"
-            )
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(
+                    f"Fee calculation: quantity={quantity}, price={price}, "
+                    f"order_value={order_value:.2f}, fee_rate={fee_rate*100:.4f}%, "
+                    f"fee_amount={fee_amount:.6f}"
+                )
 
             return {
                 'order_value': order_value,
@@ -1261,6 +1372,21 @@ class BinanceClient:
                 'fee_amount': quantity * price * (config.TAKER_FEE_RATE if is_market_order else config.MAKER_FEE_RATE)
             }
 
+    def calculate_trading_fees_batch(self, quantities, prices, is_market_order=True):
+        """
+        Calculate trading fees for several orders with one fee rate lookup
+
+        Args:
+            quantities: Order quantities
+            prices: Order prices
+            is_market_order: Whether these are market orders (taker fee) or limit orders (maker fee)
+
+        Returns:
+            NumPy array of fee amounts, one per order
+        """
+        fee_rate = config.TAKER_FEE_RATE if is_market_order else config.MAKER_FEE_RATE
+        return np.asarray(quantities, dtype=np.float64) * np.asarray(prices, dtype=np.float64) * fee_rate
+
     def get_income_history(self, income_type=None, start_time=None, end_time=None, limit=1000):
         """
         Get income history (realized PnL, funding fees, etc.)
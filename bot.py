@@ -7,15 +7,13 @@ import pandas as pd
 
 import config
 from binance_client import BinanceClient
-from indicators import (
-    calculate_rsi, detect_candle_pattern, calculate_ema,
-    calculate_bollinger_bands, calculate_macd, check_entry_signal
-)
+from indicators import compute_all_indicators, check_entry_signal
 from smc_indicators import (
     detect_market_structure, detect_fair_value_gaps
 )
 from position_manager import PositionManager
 from telegram_notifier import TelegramNotifier
+from close_losing_positions import close_losing_positions
 
 # Configure logging
 logging.basicConfig(
@@ -29,6 +27,9 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Kline columns that identify an unchanged latest candle between checks
+KLINE_KEY_COLUMNS = ('open_time', 'open', 'high', 'low', 'close', 'volume')
+
 class TradingBot:
     def __init__(self, symbol=None):
         self.symbol = symbol or config.SYMBOL
@@ -42,6 +43,10 @@ class TradingBot:
         self.daily_pnl_last_check = 0
         self.start_of_day = self._get_start_of_day()
 
+        # Klines of the last indicator calculation and the resulting frame
+        self._indicator_key = None
+        self._indicator_df = None
+
         # Set position mode (hedge or one-way)
         try:
             if config.HEDGE_MODE:
@@ -81,6 +86,33 @@ class TradingBot:
             self.leverage = 1
             logger.info(f"Using default leverage of 1x for {self.symbol} due to error")
 
+    def _compute_indicators(self, df):
+        """
+        Calculate traditional and SMC indicators, reusing the previous result
+        when the klines have not changed since the last call
+
+        Args:
+            df: Klines DataFrame
+
+        Returns:
+            DataFrame with indicator columns
+        """
+        columns = [c for c in KLINE_KEY_COLUMNS if c in df.columns]
+        key = (len(df), tuple(df[columns].iloc[-1])) if len(df) else None
+        if key is not None and key == self._indicator_key:
+            return self._indicator_df
+
+        # The klines frame is freshly fetched, so add the columns in place
+        df = compute_all_indicators(df, inplace=True)
+
+        # Calculate Smart Money Concept (SMC) indicators
+        df = detect_market_structure(df, inplace=True)
+        df = detect_fair_value_gaps(df, inplace=True)
+
+        self._indicator_key = key
+        self._indicator_df = df
+        return df
+
     def _get_start_of_day(self):
         """Get the timestamp for the start of the current day in milliseconds"""
         from datetime import datetime, timezone
@@ -185,15 +217,7 @@ class TradingBot:
 
             # Calculate traditional indicators
             try:
-                df = calculate_rsi(df)
-                df = detect_candle_pattern(df)
-                df = calculate_ema(df)
-                df = calculate_bollinger_bands(df)
-                df = calculate_macd(df)
-
-                # Calculate Smart Money Concept (SMC) indicators
-                df = detect_market_structure(df)
-                df = detect_fair_value_gaps(df)
+                df = self._compute_indicators(df)
             except Exception as e:
                 logger.error(f"Error calculating indicators for {self.symbol}: {str(e)}")
                 self.telegram.notify_error(f"Error calculating indicators for {self.symbol}: {str(e)}")
@@ -343,6 +367,9 @@ class TradingBot:
                     symbol=self.symbol
                 )
                 logger.info(f"Placed {signal} order: {order}")
+
+                # The new position changes balance and position data
+                self.position_manager.invalidate_tick_cache()
             except Exception as e:
                 error_msg = f"Failed to place {signal} market order: {str(e)}"
                 logger.error(error_msg)
@@ -360,51 +387,58 @@ class TradingBot:
                 'position_side': signal
             }
 
-            # Check if the take profit price would be profitable after fees
-            is_profitable, profit_info = self.position_manager.is_profitable_after_fees(
-                position_info=position_info,
-                current_price=tp_price,
-                symbol=self.symbol
-            )
+            # The position is already open, so a failed fee check must not keep
+            # the TP/SL orders from being placed; fall back to the unadjusted TP
+            unadjusted_tp_price = tp_price
+            try:
+                # Check if the take profit price would be profitable after fees
+                is_profitable, profit_info = self.position_manager.is_profitable_after_fees(
+                    position_info=position_info,
+                    current_price=tp_price,
+                    symbol=self.symbol
+                )
 
-            # If not profitable after fees, adjust the take profit price
-            if not is_profitable and profit_info:
-                # Store the original TP price for notification
-                original_tp_price = tp_price
+                # If not profitable after fees, adjust the take profit price
+                if not is_profitable and profit_info:
+                    # Store the original TP price for notification
+                    original_tp_price = tp_price
 
-                logger.warning(
-                    f"Take profit price {tp_price} would not be profitable after fees. "
-                    f"Raw profit: {profit_info['raw_profit']:.6f}, Fees: {profit_info['total_fees']:.6f}, "
-                    f"Net profit: {profit_info['net_profit']:.6f}"
-                )
+                    logger.warning(
+                        f"Take profit price {tp_price} would not be profitable after fees. "
+                        f"Raw profit: {profit_info['raw_profit']:.6f}, Fees: {profit_info['total_fees']:.6f}, "
+                        f"Net profit: {profit_info['net_profit']:.6f}"
+                    )
 
-                # Calculate a new take profit price that would be profitable after fees
-                # For LONG positions, we need a higher price; for SHORT positions, we need a lower price
-                if signal == 'LONG':
-                    # Increase the take profit percentage
-                    adjusted_tp_percent = config.TAKE_PROFIT_PERCENT + config.MIN_PROFIT_AFTER_FEES + (config.TAKER_FEE_RATE * 200)
-                    tp_price = current_price * (1 + adjusted_tp_percent / 100)
-                else:  # SHORT
-                    # Increase the take profit percentage (for shorts, this means a lower price)
-                    adjusted_tp_percent = config.TAKE_PROFIT_PERCENT + config.MIN_PROFIT_AFTER_FEES + (config.TAKER_FEE_RATE * 200)
-                    tp_price = current_price * (1 - adjusted_tp_percent / 100)
-
-                # Round according to symbol precision
-                tp_price = self.client.round_price(tp_price)
-
-                logger.info(
-                    f"Adjusted take profit price to {tp_price} to ensure profitability after fees. "
-                    f"Original TP percent: {config.TAKE_PROFIT_PERCENT}%, "
-                    f"Adjusted TP percent: {adjusted_tp_percent}%"
-                )
+                    # Calculate a new take profit price that would be profitable after fees
+                    # For LONG positions, we need a higher price; for SHORT positions, we need a lower price
+                    if signal == 'LONG':
+                        # Increase the take profit percentage
+                        adjusted_tp_percent = config.TAKE_PROFIT_PERCENT + config.MIN_PROFIT_AFTER_FEES + (config.TAKER_FEE_RATE * 200)
+                        tp_price = current_price * (1 + adjusted_tp_percent / 100)
+                    else:  # SHORT
+                        # Increase the take profit percentage (for shorts, this means a lower price)
+                        adjusted_tp_percent = config.TAKE_PROFIT_PERCENT + config.MIN_PROFIT_AFTER_FEES + (config.TAKER_FEE_RATE * 200)
+                        tp_price = current_price * (1 - adjusted_tp_percent / 100)
 
-                # Send notification about the adjusted TP price
-                self.telegram.notify_fee_adjusted_tp(
-                    position_side=signal,
-                    original_tp_price=original_tp_price,
-                    adjusted_tp_price=tp_price,
-                    profit_info=profit_info
-                )
+                    # Round according to symbol precision
+                    tp_price = self.client.round_price(tp_price)
+
+                    logger.info(
+                        f"Adjusted take profit price to {tp_price} to ensure profitability after fees. "
+                        f"Original TP percent: {config.TAKE_PROFIT_PERCENT}%, "
+                        f"Adjusted TP percent: {adjusted_tp_percent}%"
+                    )
+
+                    # Send notification about the adjusted TP price
+                    self.telegram.notify_fee_adjusted_tp(
+                        position_side=signal,
+                        original_tp_price=original_tp_price,
+                        adjusted_tp_price=tp_price,
+                        profit_info=profit_info
+                    )
+            except Exception as e:
+                logger.error(f"Error checking take profit price {unadjusted_tp_price} against fees, keeping it unadjusted: {str(e)}")
+                tp_price = unadjusted_tp_price
 
             # Place take profit order with error handling
             tp_side = 'SELL' if signal == 'LONG' else 'BUY'
@@ -550,7 +584,8 @@ class TradingBot:
 
                 # Only check for signals and enter positions if trading is allowed
                 if self.is_trading_allowed:
-                    self.check_and_enter_position()
+                    with self.position_manager.decision_tick():
+                        self.check_and_enter_position()
 
                 # Sleep for the configured interval
                 time.sleep(config.CHECK_INTERVAL)
@@ -595,6 +630,7 @@ class BotManager:
 
         self.bots = {}
         self.threads = {}
+        self.watchdog_thread = None
 
     def filter_closed_symbols(self):
         """Filter out symbols that are known to be closed"""
@@ -670,11 +706,43 @@ class BotManager:
 
         logger.info(f"Started {started_count} bots, skipped {skipped_count} closed symbols")
 
+        if config.LOSING_POSITION_WATCHDOG:
+            self.start_watchdog()
+
         # If all symbols were closed, try to find new ones
         if started_count == 0 and config.USE_HIGH_VOLUME_PAIRS:
             logger.warning("All symbols were closed. Trying to find new high volume pairs...")
             self.update_trading_pairs(force=True)
 
+    def start_watchdog(self):
+        """
+        Start the losing position watchdog thread if it is not already running
+        """
+        if self.watchdog_thread and self.watchdog_thread.is_alive():
+            return
+
+        self.watchdog_thread = threading.Thread(target=self.losing_position_watchdog, daemon=True)
+        self.watchdog_thread.start()
+        logger.info(f"Started losing position watchdog (threshold: {config.LOSING_POSITION_THRESHOLD}%, "
+                    f"interval: {config.LOSING_POSITION_CHECK_INTERVAL}s)")
+
+    def losing_position_watchdog(self):
+        """
+        Periodically close positions whose loss exceeds LOSING_POSITION_THRESHOLD
+
+        Runs inside the bot process and reuses the manager's client, so each
+        check avoids the startup cost of launching close_losing_positions.py.
+        """
+        while True:
+            try:
+                closed = close_losing_positions(config.LOSING_POSITION_THRESHOLD, client=self.client)
+                if closed:
+                    logger.warning(f"Watchdog closed {closed} positions with losses exceeding {config.LOSING_POSITION_THRESHOLD}%")
+            except Exception as e:
+                logger.error(f"Error in losing position watchdog: {str(e)}")
+
+            time.sleep(config.LOSING_POSITION_CHECK_INTERVAL)
+
     def monitor(self):
         """
         Monitor bot threads and restart if needed
@@ -685,6 +753,10 @@ class BotManager:
                     logger.warning(f"Bot thread for {symbol} died. Restarting...")
                     self.start_bot(symbol)
 
+            if config.LOSING_POSITION_WATCHDOG and not (self.watchdog_thread and self.watchdog_thread.is_alive()):
+                logger.warning("Losing position watchdog died. Restarting...")
+                self.start_watchdog()
+
             time.sleep(60)
 
     def update_trading_pairs(self, force=False):
@@ -698,6 +770,11 @@ class BotManager:
             return
 
         logger.info("Updating high volume trading pairs...")
+
+        # A forced update should not be served from the high volume pairs cache
+        if force:
+            self.client.invalidate_high_volume_cache()
+
         new_symbols = self.client.get_high_volume_pairs()
 
         if not new_symbols:
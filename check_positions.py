@@ -2,25 +2,97 @@ import argparse
 import logging
 import sys
 from datetime import datetime
-from tabulate import tabulate
+import numpy as np
+import pandas as pd
+from dateutil.tz import tzlocal
 
-from binance_client import BinanceClient
+from binance_client import BinanceClient, is_zero_amount
+from log_config import setup_logging
 import config
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler()
-    ]
-)
-
 logger = logging.getLogger(__name__)
 
-def format_timestamp(timestamp):
+# Pre-bound number formatters shared by all table rows
+_F6 = "{:.6f}".format
+_F2 = "{:.2f}".format
+
+# Table layouts (headers and column widths)
+POSITION_HEADERS = ("Symbol", "Side", "Amount", "Entry Price", "Value", "Leverage", "Unrealized PnL", "PnL %", "Margin Type")
+POSITION_WIDTHS = (14, 6, 18, 18, 20, 8, 18, 10, 11)
+TRADE_HEADERS = ("Symbol", "Side", "Position Side", "Price", "Quantity", "Value", "Realized PnL", "Commission", "Time")
+TRADE_WIDTHS = (14, 4, 13, 18, 18, 20, 18, 20, 19)
+ORDER_HEADERS = ("Symbol", "Order ID", "Side", "Position Side", "Type", "Price", "Stop Price", "Quantity", "Time")
+ORDER_WIDTHS = (14, 12, 4, 13, 20, 18, 18, 18, 19)
+ASSET_HEADERS = ("Asset", "Wallet Balance", "Unrealized Profit", "Margin Balance", "Margin Available")
+
+def format_timestamp(timestamp, _fromts=datetime.fromtimestamp):
     """Format timestamp to human-readable date/time"""
-    return datetime.fromtimestamp(timestamp / 1000).strftime('%Y-%m-%d %H:%M:%S')
+    return _fromts(timestamp / 1000).strftime('%Y-%m-%d %H:%M:%S')
+
+def format_timestamps(timestamps):
+    """
+    Format a batch of timestamps to human-readable date/time in one vectorised pass
+    
+    Args:
+        timestamps: Sequence of timestamps in milliseconds
+    
+    Returns:
+        NumPy array of 'YYYY-MM-DD HH:MM:SS' strings in local time
+    """
+    # Convert through the local zone rules so each timestamp gets its own DST offset
+    times = pd.to_datetime(np.asarray(timestamps, dtype=np.int64), unit='ms', utc=True).tz_convert(tzlocal())
+    return times.strftime('%Y-%m-%d %H:%M:%S').to_numpy()
+
+def stream_table(headers, rows, widths):
+    """
+    Print a table one row at a time using fixed column widths
+    
+    Args:
+        headers: Column headers
+        rows: Iterable of rows (may be a generator)
+        widths: Column widths
+    """
+    row_format = "  ".join(f"{{:<{width}}}" for width in widths)
+    print(row_format.format(*headers))
+    print(row_format.format(*("-" * width for width in widths)))
+    for row in rows:
+        print(row_format.format(*(str(cell) for cell in row)))
+
+def _position_rows(client, positions):
+    """Yield table rows for open positions"""
+    for pos in positions:
+        symbol = pos['symbol']
+        position_side = pos.get('positionSide', 'BOTH')
+        entry_price = float(pos['entryPrice'])
+        position_amt = float(pos['positionAmt'])
+        leverage = int(pos.get('leverage', 1))
+        unrealized_pnl = float(pos.get('unrealizedProfit', 0))
+        margin_type = pos.get('marginType', 'cross')
+        
+        # Calculate position value
+        position_value = abs(position_amt) * entry_price
+        
+        # Calculate unrealized PnL percentage
+        if position_value > 0:
+            current_price = client.get_current_price(symbol)
+            if position_side == 'LONG' or position_side == 'BOTH':
+                pnl_percent = ((current_price / entry_price) - 1) * 100 * leverage
+            else:  # SHORT
+                pnl_percent = ((entry_price / current_price) - 1) * 100 * leverage
+        else:
+            pnl_percent = 0
+        
+        yield (
+            symbol,
+            position_side,
+            _F6(position_amt),
+            _F6(entry_price),
+            _F2(position_value) + " USDT",
+            f"{leverage}x",
+            _F2(unrealized_pnl) + " USDT",
+            _F2(pnl_percent) + "%",
+            margin_type
+        )
 
 def check_open_positions(client, symbol=None):
     """
@@ -32,55 +104,46 @@ def check_open_positions(client, symbol=None):
     """
     try:
         positions = client.get_open_positions(symbol)
+
+        # Drop zero-amount hedge-mode placeholders before any price lookup
+        positions = [p for p in positions if not is_zero_amount(p['positionAmt'])]
         
         if not positions:
             print("No open positions found.")
             return
         
-        # Prepare data for tabulate
-        table_data = []
-        for pos in positions:
-            symbol = pos['symbol']
-            position_side = pos.get('positionSide', 'BOTH')
-            entry_price = float(pos['entryPrice'])
-            position_amt = float(pos['positionAmt'])
-            leverage = int(pos.get('leverage', 1))
-            unrealized_pnl = float(pos.get('unrealizedProfit', 0))
-            margin_type = pos.get('marginType', 'cross')
-            
-            # Calculate position value
-            position_value = abs(position_amt) * entry_price
-            
-            # Calculate unrealized PnL percentage
-            if position_value > 0:
-                current_price = client.get_current_price(symbol)
-                if position_side == 'LONG' or position_side == 'BOTH':
-                    pnl_percent = ((current_price / entry_price) - 1) * 100 * leverage
-                else:  # SHORT
-                    pnl_percent = ((entry_price / current_price) - 1) * 100 * leverage
-            else:
-                pnl_percent = 0
-            
-            table_data.append([
-                symbol,
-                position_side,
-                f"{position_amt:.6f}",
-                f"{entry_price:.6f}",
-                f"{position_value:.2f} USDT",
-                f"{leverage}x",
-                f"{unrealized_pnl:.2f} USDT",
-                f"{pnl_percent:.2f}%",
-                margin_type
-            ])
-        
-        # Print table
-        headers = ["Symbol", "Side", "Amount", "Entry Price", "Value", "Leverage", "Unrealized PnL", "PnL %", "Margin Type"]
+        # Print table rows as each position is processed
         print("\nOpen Positions:")
-        print(tabulate(table_data, headers=headers, tablefmt="grid"))
+        stream_table(POSITION_HEADERS, _position_rows(client, positions), POSITION_WIDTHS)
         
     except Exception as e:
         logger.error(f"Error checking open positions: {str(e)}")
 
+def _trade_rows(trades):
+    """Yield table rows for recent trades"""
+    times = format_timestamps([trade['time'] for trade in trades])
+    for trade, time in zip(trades, times):
+        symbol = trade['symbol']
+        side = trade['side']
+        position_side = trade.get('positionSide', 'BOTH')
+        price = float(trade['price'])
+        qty = float(trade['qty'])
+        realized_pnl = float(trade.get('realizedPnl', 0))
+        commission = float(trade['commission'])
+        commission_asset = trade['commissionAsset']
+        
+        yield (
+            symbol,
+            side,
+            position_side,
+            _F6(price),
+            _F6(qty),
+            _F2(price * qty) + " USDT",
+            _F2(realized_pnl) + " USDT",
+            _F6(commission) + " " + commission_asset,
+            time
+        )
+
 def check_recent_trades(client, symbol=None, limit=20):
     """
     Check recent trades
@@ -97,35 +160,9 @@ def check_recent_trades(client, symbol=None, limit=20):
             print("No recent trades found.")
             return
         
-        # Prepare data for tabulate
-        table_data = []
-        for trade in trades:
-            symbol = trade['symbol']
-            side = trade['side']
-            position_side = trade.get('positionSide', 'BOTH')
-            price = float(trade['price'])
-            qty = float(trade['qty'])
-            realized_pnl = float(trade.get('realizedPnl', 0))
-            commission = float(trade['commission'])
-            commission_asset = trade['commissionAsset']
-            time = format_timestamp(trade['time'])
-            
-            table_data.append([
-                symbol,
-                side,
-                position_side,
-                f"{price:.6f}",
-                f"{qty:.6f}",
-                f"{price * qty:.2f} USDT",
-                f"{realized_pnl:.2f} USDT",
-                f"{commission:.6f} {commission_asset}",
-                time
-            ])
-        
-        # Print table
-        headers = ["Symbol", "Side", "Position Side", "Price", "Quantity", "Value", "Realized PnL", "Commission", "Time"]
+        # Print table rows as each trade is processed
         print("\nRecent Trades:")
-        print(tabulate(table_data, headers=headers, tablefmt="grid"))
+        stream_table(TRADE_HEADERS, _trade_rows(trades), TRADE_WIDTHS)
         
     except Exception as e:
         logger.error(f"Error checking recent trades: {str(e)}")
@@ -156,23 +193,49 @@ def check_account_balance(client):
         for asset in account_info['assets']:
             wallet_balance = float(asset['walletBalance'])
             if wallet_balance > 0:
-                assets.append([
+                assets.append((
                     asset['asset'],
-                    f"{wallet_balance:.6f}",
-                    f"{float(asset['unrealizedProfit']):.6f}",
-                    f"{float(asset['marginBalance']):.6f}",
+                    _F6(wallet_balance),
+                    _F6(float(asset['unrealizedProfit'])),
+                    _F6(float(asset['marginBalance'])),
                     asset['marginAvailable'] == 'true'
-                ])
+                ))
         
         if assets:
+            from tabulate import tabulate
+
             # Print assets table
-            headers = ["Asset", "Wallet Balance", "Unrealized Profit", "Margin Balance", "Margin Available"]
             print("\nAssets:")
-            print(tabulate(assets, headers=headers, tablefmt="grid"))
+            print(tabulate(assets, headers=ASSET_HEADERS, tablefmt="grid"))
         
     except Exception as e:
         logger.error(f"Error checking account balance: {str(e)}")
 
+def _order_rows(orders):
+    """Yield table rows for open orders"""
+    for order in orders:
+        symbol = order['symbol']
+        order_id = order['orderId']
+        side = order['side']
+        position_side = order.get('positionSide', 'BOTH')
+        type = order['type']
+        price = float(order.get('price', 0))
+        stop_price = float(order.get('stopPrice', 0))
+        orig_qty = float(order['origQty'])
+        time = format_timestamp(order['time'])
+        
+        yield (
+            symbol,
+            order_id,
+            side,
+            position_side,
+            type,
+            _F6(price) if price > 0 else "Market",
+            _F6(stop_price) if stop_price > 0 else "N/A",
+            _F6(orig_qty),
+            time
+        )
+
 def check_open_orders(client, symbol=None):
     """
     Check open orders
@@ -188,35 +251,9 @@ def check_open_orders(client, symbol=None):
             print("No open orders found.")
             return
         
-        # Prepare data for tabulate
-        table_data = []
-        for order in orders:
-            symbol = order['symbol']
-            order_id = order['orderId']
-            side = order['side']
-            position_side = order.get('positionSide', 'BOTH')
-            type = order['type']
-            price = float(order.get('price', 0))
-            stop_price = float(order.get('stopPrice', 0))
-            orig_qty = float(order['origQty'])
-            time = format_timestamp(order['time'])
-            
-            table_data.append([
-                symbol,
-                order_id,
-                side,
-                position_side,
-                type,
-                f"{price:.6f}" if price > 0 else "Market",
-                f"{stop_price:.6f}" if stop_price > 0 else "N/A",
-                f"{orig_qty:.6f}",
-                time
-            ])
-        
-        # Print table
-        headers = ["Symbol", "Order ID", "Side", "Position Side", "Type", "Price", "Stop Price", "Quantity", "Time"]
+        # Print table rows as each order is processed
         print("\nOpen Orders:")
-        print(tabulate(table_data, headers=headers, tablefmt="grid"))
+        stream_table(ORDER_HEADERS, _order_rows(orders), ORDER_WIDTHS)
         
     except Exception as e:
         logger.error(f"Error checking open orders: {str(e)}")
@@ -238,6 +275,8 @@ def main():
         parser.print_help()
         return
     
+    setup_logging()
+    
     # Create Binance client
     client = BinanceClient()
     
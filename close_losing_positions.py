@@ -3,7 +3,8 @@
 Close Losing Positions Script
 
 This script checks for open positions with significant losses and closes them.
-It can be run manually or scheduled to run periodically.
+It can be run manually; the running bot performs the same check periodically
+when LOSING_POSITION_WATCHDOG is enabled.
 """
 
 import os
@@ -12,35 +13,33 @@ import logging
 import argparse
 from datetime import datetime
 
+import numpy as np
+
 # Import from the trading bot codebase
 import config
-from binance_client import BinanceClient
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("close_positions.log"),
-        logging.StreamHandler()
-    ]
-)
+from binance_client import BinanceClient, is_zero_amount
+from log_config import setup_logging
+from positions_util import fetch_prices, close_positions, scan_losing_positions
 
 logger = logging.getLogger(__name__)
 
-def close_losing_positions(loss_threshold=50.0, symbol=None, dry_run=False):
+def close_losing_positions(loss_threshold=50.0, symbol=None, dry_run=False, client=None):
     """
     Close positions that have losses exceeding the threshold
 
+    Prices are fetched and closing orders are placed concurrently, bounded by
+    positions_util.MAX_CONCURRENT_REQUESTS.
+
     Args:
         loss_threshold: Loss threshold in percentage (default: 50%)
         symbol: Specific symbol to check (default: all symbols)
         dry_run: If True, only show what would be done without actually closing positions
+        client: BinanceClient to reuse (default: create a new one)
 
     Returns:
         Number of positions closed
     """
-    client = BinanceClient()
+    client = client or BinanceClient()
     positions_closed = 0
 
     try:
@@ -52,81 +51,70 @@ def close_losing_positions(loss_threshold=50.0, symbol=None, dry_run=False):
             logger.info("No open positions found")
             return 0
 
-        # Check each position for losses
-        for position in positions:
+        # Skip positions with zero amount
+        positions = [p for p in positions if not is_zero_amount(p.get('positionAmt', 0))]
+
+        # Get current prices for all symbols at once
+        prices = fetch_prices(client, {p.get('symbol', '') for p in positions})
+
+        # Drop positions whose price could not be fetched
+        positions = [p for p in positions if prices.get(p.get('symbol', '')) is not None]
+
+        # Parse each position on its own so one malformed row does not abort the scan
+        rows = []
+        parsed = []
+        for p in positions:
             try:
-                position_symbol = position.get('symbol', '')
-                position_side = position.get('positionSide', 'BOTH')
-                position_amt = float(position.get('positionAmt', 0))
-                entry_price = float(position.get('entryPrice', 0))
-                
-                # Skip positions with zero amount
-                if position_amt == 0:
+                rows.append((float(p.get('entryPrice', 0)), float(p.get('positionAmt', 0)), float(p.get('leverage', 1))))
+            except (TypeError, ValueError) as e:
+                logger.error(f"Skipping position {p.get('symbol', '')} with malformed data: {str(e)}")
+                continue
+            parsed.append(p)
+        positions = parsed
+
+        if not positions:
+            return 0
+
+        entry_prices, amounts, leverages = np.array(rows, dtype=float).T
+
+        # Screen all positions against the threshold in one vectorised pass
+        losing_indices, pnl_percents = scan_losing_positions(
+            entry_prices,
+            np.array([prices[p.get('symbol', '')] for p in positions]),
+            amounts,
+            leverages,
+            loss_threshold,
+            tick=np.array([client.get_tick_size(p.get('symbol', '')) or np.nan for p in positions])
+        )
+        losing = set(losing_indices.tolist())
+
+        # Check each position for losses
+        to_close = []
+        for i, position in enumerate(positions):
+            position_symbol = position.get('symbol', '')
+            position_side = position.get('positionSide', 'BOTH')
+            pnl_percent = pnl_percents[i]
+
+            if i in losing:
+                logger.warning(f"Position {position_symbol} {position_side} has loss of {pnl_percent:.2f}%, exceeding threshold of {loss_threshold:.2f}%")
+
+                if dry_run:
+                    logger.info(f"DRY RUN: Would close position {position_symbol} {position_side} with loss {pnl_percent:.2f}%")
+                    positions_closed += 1
                     continue
-                
-                # Get current price
-                current_price = client.get_current_price(position_symbol)
-                
-                # Determine if LONG or SHORT based on position amount
-                is_long = position_amt > 0
-                
-                # Calculate unrealized PnL percentage
-                if is_long:
-                    pnl_percent = ((current_price / entry_price) - 1) * 100 * float(position.get('leverage', 1))
-                else:  # SHORT
-                    pnl_percent = ((entry_price / current_price) - 1) * 100 * float(position.get('leverage', 1))
-                
-                # Check if loss exceeds threshold
-                if pnl_percent <= -loss_threshold:
-                    logger.warning(f"Position {position_symbol} {position_side} has loss of {pnl_percent:.2f}%, exceeding threshold of {loss_threshold:.2f}%")
-                    
-                    if dry_run:
-                        logger.info(f"DRY RUN: Would close position {position_symbol} {position_side} with loss {pnl_percent:.2f}%")
-                        positions_closed += 1
-                        continue
-                    
-                    # Determine order parameters
-                    side = 'SELL' if is_long else 'BUY'  # SELL to close LONG, BUY to close SHORT
-                    quantity = abs(position_amt)
-                    
-                    # Place market order to close position
-                    logger.info(f"Closing position {position_symbol} {position_side} with {side} order, quantity {quantity}")
-                    
-                    # Check if hedge mode is enabled
-                    is_hedge_mode = client.get_position_mode()
-                    
-                    try:
-                        if is_hedge_mode:
-                            # In hedge mode, we need to specify positionSide
-                            order = client.place_market_order(
-                                side=side,
-                                quantity=quantity,
-                                position_side=position_side,
-                                symbol=position_symbol
-                            )
-                        else:
-                            # In one-way mode, we don't specify positionSide
-                            order = client.place_market_order(
-                                side=side,
-                                quantity=quantity,
-                                position_side='BOTH',  # This will be ignored in one-way mode
-                                symbol=position_symbol
-                            )
-                        
-                        logger.info(f"Successfully closed position: {order}")
-                        positions_closed += 1
-                        
-                    except Exception as e:
-                        logger.error(f"Error closing position {position_symbol} {position_side}: {str(e)}")
-                
-                else:
-                    logger.info(f"Position {position_symbol} {position_side} has PnL {pnl_percent:.2f}%, below threshold of {loss_threshold:.2f}%")
-            
-            except Exception as e:
-                logger.error(f"Error processing position {position.get('symbol', 'unknown')}: {str(e)}")
-        
+
+                to_close.append((position_symbol, position_side, float(amounts[i])))
+
+            else:
+                logger.info(f"Position {position_symbol} {position_side} has PnL {pnl_percent:.2f}%, below threshold of {loss_threshold:.2f}%")
+
+        if not to_close:
+            return positions_closed
+
+        positions_closed += close_positions(client, to_close)
+
         return positions_closed
-    
+
     except Exception as e:
         logger.error(f"Error in close_losing_positions: {str(e)}")
         return 0
@@ -142,6 +130,9 @@ def main():
     
     args = parser.parse_args()
     
+    # Configure logging only once we know the script is actually going to run
+    setup_logging("close_positions.log")
+    
     print(f"\n🔍 Checking for positions with losses exceeding {args.threshold}%...")
     
     if args.dry_run:
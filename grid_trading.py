@@ -1,7 +1,12 @@
 import logging
+import threading
 import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
+
+import numpy as np
 
 import config
 from binance_client import BinanceClient
@@ -9,20 +14,57 @@ from telegram_notifier import TelegramNotifier
 
 logger = logging.getLogger(__name__)
 
+# Seconds a fetched price or coin balance is reused within one bot tick
+CACHE_TTL = 2.0
+
+# Seconds to wait after a failed tick, doubling on each consecutive failure up to the maximum
+ERROR_BACKOFF_MIN = 10
+ERROR_BACKOFF_MAX = 300
+
+# Maximum number of concurrent bot ticks or trade lookups run by GridTradingManager
+MAX_CONCURRENT_REQUESTS = 10
+
 class GridTradingBot:
-    def __init__(self, symbol=None):
+    def __init__(self, symbol=None, poll_trades=True):
         self.symbol = symbol or config.SYMBOL
         self.client = BinanceClient(symbol=self.symbol)
-        self.telegram = TelegramNotifier()
+        # Notifications are sent in the background so Telegram latency never delays orders
+        self.telegram = TelegramNotifier(background=True)
 
         # Initialize state variables
         self.last_buy_price = None
+        self._cum_usdt = 0.0  # Cost of the coins bought since the last full exit
+        self._cum_qty = 0.0  # Quantity of the coins bought since the last full exit
         self.lowest_price = None
         self.current_grid_buy_index = 0  # Current buy grid index (0-based)
         self.current_grid_sell_index = 0  # Current sell grid index (0-based)
         self.active_buy_order_id = None
         self.active_sell_order_id = None
 
+        # When False, trades are fed in by GridTradingManager through on_trades
+        self.poll_trades = poll_trades
+        # Guards bot state shared between the run loop and the manager's trade poller
+        self._lock = threading.Lock()
+
+        # Snapshot grid settings once instead of reading config on every tick
+        self._check_interval = config.CHECK_INTERVAL
+        # One row per grid: (trigger %, stop %, limit %, USDT amount)
+        self._buy_params = np.stack([
+            np.asarray(config.GRID_BUY_TRIGGER_PERCENTAGES, dtype=np.float64),
+            np.asarray(config.GRID_BUY_STOP_PERCENTAGES, dtype=np.float64),
+            np.asarray(config.GRID_BUY_LIMIT_PERCENTAGES, dtype=np.float64),
+            np.asarray(config.GRID_BUY_QUANTITIES_USDT, dtype=np.float64)
+        ], axis=1)
+        # One row per grid: (trigger %, stop %, limit %, fraction of balance to sell)
+        self._sell_params = np.stack([
+            np.asarray(config.GRID_SELL_TRIGGER_PERCENTAGES, dtype=np.float64),
+            np.asarray(config.GRID_SELL_STOP_PERCENTAGES, dtype=np.float64),
+            np.asarray(config.GRID_SELL_LIMIT_PERCENTAGES, dtype=np.float64),
+            np.asarray(config.GRID_SELL_QUANTITIES_PERCENTAGES, dtype=np.float64)
+        ], axis=1)
+        self._removal_threshold = config.GRID_LAST_BUY_PRICE_REMOVAL_THRESHOLD
+        self._error_backoff = ERROR_BACKOFF_MIN
+
         # Set position mode to hedge mode if enabled
         if config.HEDGE_MODE:
             try:
@@ -33,53 +75,119 @@ class GridTradingBot:
                 logger.error(error_msg)
                 self.telegram.notify_error(error_msg)
 
+    @property
+    def symbol(self):
+        return self._symbol
+
+    @symbol.setter
+    def symbol(self, symbol):
+        self._symbol = symbol
+        # Extract the base asset from the symbol once (e.g., BTC from BTCUSDT)
+        self._base_asset = symbol[:-4] if symbol.endswith('USDT') else symbol[:-3]
+        # Cached (timestamp, value) pairs belong to the previous symbol
+        self._price_cache = (0.0, None)
+        self._balance_cache = (0.0, None)
+
+    def get_current_price(self):
+        """
+        Get the current price of the symbol, reusing a price fetched within CACHE_TTL
+
+        Returns:
+            Current price
+        """
+        now = time.monotonic()
+        timestamp, price = self._price_cache
+        if price is not None and now - timestamp < CACHE_TTL:
+            return price
+
+        price = self.client.get_current_price(self.symbol)
+        self._price_cache = (now, price)
+        return price
+
+    def update_price(self, price):
+        """
+        Record a price fetched elsewhere so the next tick does not request it
+
+        Args:
+            price: Current market price
+        """
+        self._price_cache = (time.monotonic(), price)
+
     def get_coin_balance(self):
         """
-        Get the current balance of the coin
+        Get the current balance of the coin, reusing a balance fetched within CACHE_TTL
 
         Returns:
             Coin balance
         """
+        now = time.monotonic()
+        timestamp, balance = self._balance_cache
+        if balance is not None and now - timestamp < CACHE_TTL:
+            return balance
+
         try:
             # Get account information
             account_info = self.client.get_account_info()
 
-            # Extract the base asset from the symbol (e.g., BTC from BTCUSDT)
-            base_asset = self.symbol[:-4] if self.symbol.endswith('USDT') else self.symbol[:-3]
-
             # Find the asset in the account balances
+            balance = 0.0
+            base_asset = self._base_asset
             for asset in account_info['assets']:
                 if asset['asset'] == base_asset:
-                    return float(asset['walletBalance'])
+                    balance = float(asset['walletBalance'])
+                    break
 
-            return 0.0
+            self._balance_cache = (now, balance)
+            return balance
         except Exception as e:
             logger.error(f"Error getting coin balance: {str(e)}")
             return 0.0
 
-    def get_coin_value_in_usdt(self):
+    def invalidate_balance_cache(self):
+        """
+        Force the next get_coin_balance call to query the account
+        """
+        self._balance_cache = (0.0, None)
+
+    def get_coin_value_in_usdt(self, current_price=None):
         """
         Calculate the value of the coin balance in USDT
 
+        Args:
+            current_price: Already fetched market price (default: fetch it)
+
         Returns:
             Value in USDT
         """
         coin_balance = self.get_coin_balance()
-        current_price = self.client.get_current_price(self.symbol)
+        if current_price is None:
+            current_price = self.get_current_price()
         return coin_balance * current_price
 
-    def should_remove_last_buy_price(self):
+    def should_remove_last_buy_price(self, current_price=None):
         """
         Check if the last buy price should be removed based on the threshold
 
+        Args:
+            current_price: Already fetched market price (default: fetch it)
+
         Returns:
             Boolean indicating if last buy price should be removed
         """
         if self.last_buy_price is None:
             return False
 
-        coin_value = self.get_coin_value_in_usdt()
-        return coin_value < config.GRID_LAST_BUY_PRICE_REMOVAL_THRESHOLD
+        coin_value = self.get_coin_value_in_usdt(current_price)
+        return coin_value < self._removal_threshold
+
+    def reset_last_buy_price(self):
+        """
+        Forget the last buy price and its accumulated cost, and restart the sell grids
+        """
+        self.last_buy_price = None
+        self._cum_usdt = 0.0
+        self._cum_qty = 0.0
+        self.current_grid_sell_index = 0
 
     def update_lowest_price(self, current_price):
         """
@@ -118,15 +226,8 @@ class GridTradingBot:
                 logger.error(f"Error checking active buy order: {str(e)}")
                 self.active_buy_order_id = None  # Reset to allow placing a new order
 
-        # If we have enough coin balance, don't place a buy order for grid #1
-        if self.current_grid_buy_index == 0:
-            coin_value = self.get_coin_value_in_usdt()
-            if coin_value >= 10.0:  # $10 worth of coin
-                logger.info(f"Already have ${coin_value:.2f} worth of coin. Skipping buy grid #1.")
-                return
-
         # Check if we've reached the lowest price for the current grid
-        grid_trigger_percentage = config.GRID_BUY_TRIGGER_PERCENTAGES[self.current_grid_buy_index]
+        grid_trigger_percentage, stop_percentage, limit_percentage, usdt_amount = self._buy_params[self.current_grid_buy_index].tolist()
 
         # For first grid, compare with lowest observed price
         if self.current_grid_buy_index == 0:
@@ -139,17 +240,20 @@ class GridTradingBot:
             trigger_price = self.last_buy_price * grid_trigger_percentage
 
         if current_price <= trigger_price:
-            # Calculate stop and limit prices
-            stop_percentage = config.GRID_BUY_STOP_PERCENTAGES[self.current_grid_buy_index]
-            limit_percentage = config.GRID_BUY_LIMIT_PERCENTAGES[self.current_grid_buy_index]
+            # If we have enough coin balance, don't place a buy order for grid #1
+            # (checked only once the trigger is hit, to save the account request otherwise)
+            if self.current_grid_buy_index == 0:
+                coin_value = self.get_coin_value_in_usdt(current_price)
+                if coin_value >= 10.0:  # $10 worth of coin
+                    logger.info(f"Already have ${coin_value:.2f} worth of coin. Skipping buy grid #1.")
+                    return
 
+            # Calculate stop and limit prices
             stop_price = current_price * stop_percentage
             limit_price = current_price * limit_percentage
 
             # Calculate quantity based on USDT amount
-            usdt_amount = config.GRID_BUY_QUANTITIES_USDT[self.current_grid_buy_index]
-            quantity = usdt_amount / limit_price
-            quantity = self.client.round_quantity(quantity)
+            quantity = self.client.round_quantity(usdt_amount / limit_price)
 
             try:
                 # Place stop-limit order
@@ -201,28 +305,24 @@ class GridTradingBot:
                 logger.error(f"Error checking active sell order: {str(e)}")
                 self.active_sell_order_id = None  # Reset to allow placing a new order
 
-        # Check if we have enough coin balance to sell
-        coin_balance = self.get_coin_balance()
-        if coin_balance <= 0:
-            logger.info("No coin balance available for selling")
-            return
-
         # Check if the current price has reached the trigger price for the current grid
-        grid_trigger_percentage = config.GRID_SELL_TRIGGER_PERCENTAGES[self.current_grid_sell_index]
+        grid_trigger_percentage, stop_percentage, limit_percentage, quantity_percentage = self._sell_params[self.current_grid_sell_index].tolist()
         trigger_price = self.last_buy_price * grid_trigger_percentage
 
         if current_price >= trigger_price:
-            # Calculate stop and limit prices
-            stop_percentage = config.GRID_SELL_STOP_PERCENTAGES[self.current_grid_sell_index]
-            limit_percentage = config.GRID_SELL_LIMIT_PERCENTAGES[self.current_grid_sell_index]
+            # Check if we have enough coin balance to sell
+            # (checked only once the trigger is hit, to save the account request otherwise)
+            coin_balance = self.get_coin_balance()
+            if coin_balance <= 0:
+                logger.info("No coin balance available for selling")
+                return
 
+            # Calculate stop and limit prices
             stop_price = current_price * stop_percentage
             limit_price = current_price * limit_percentage
 
             # Calculate quantity based on percentage of available balance
-            quantity_percentage = config.GRID_SELL_QUANTITIES_PERCENTAGES[self.current_grid_sell_index]
-            quantity = coin_balance * quantity_percentage
-            quantity = self.client.round_quantity(quantity)
+            quantity = self.client.round_quantity(coin_balance * quantity_percentage)
 
             try:
                 # Place stop-limit order
@@ -245,129 +345,194 @@ class GridTradingBot:
                 logger.error(error_msg)
                 self.telegram.notify_error(error_msg)
 
+    def has_active_orders(self):
+        """
+        Check if the bot is waiting on a buy or sell order to execute
+        """
+        return bool(self.active_buy_order_id or self.active_sell_order_id)
+
     def check_order_executions(self):
         """
         Check if any orders have been executed and update state accordingly
         """
+        if not self.has_active_orders():
+            return
+
         try:
             # Get recent trades
             trades = self.client.get_recent_trades(self.symbol)
+        except Exception as e:
+            logger.error(f"Error checking order executions: {str(e)}")
+            return
+
+        self.on_trades(trades)
+
+    def on_trades(self, trades):
+        """
+        Update state from recent trades that executed our active orders
+
+        Args:
+            trades: List of recent trades for the symbol
+        """
+        try:
+            # Map our active order IDs to their side so each trade needs one lookup
+            wanted = {self.active_buy_order_id: 'BUY', self.active_sell_order_id: 'SELL'}
+            wanted.pop(None, None)
 
             # Check if any trades match our active orders
             for trade in trades:
+                if not wanted:
+                    break
+
+                side = wanted.get(trade['orderId'])
+                if side is None:
+                    continue
+
+                # Only the first matching trade of each order is processed
+                del wanted[trade['orderId']]
+
                 # If we have an active buy order that was executed
-                if self.active_buy_order_id and trade['orderId'] == self.active_buy_order_id:
+                if side == 'BUY':
                     # Update last buy price
                     executed_price = float(trade['price'])
                     executed_qty = float(trade['qty'])
 
-                    # If this is the first buy, set the last buy price directly
-                    if self.last_buy_price is None:
-                        self.last_buy_price = executed_price
-                    else:
-                        # Calculate weighted average price for subsequent buys
-                        previous_value = config.GRID_BUY_QUANTITIES_USDT[self.current_grid_buy_index - 1]
-                        current_value = config.GRID_BUY_QUANTITIES_USDT[self.current_grid_buy_index]
-
-                        # Calculate new average price
-                        self.last_buy_price = (previous_value + current_value) / (previous_value / self.last_buy_price + current_value / executed_price)
+                    # Average buy price over every fill since the last full exit
+                    self._cum_usdt += executed_price * executed_qty
+                    self._cum_qty += executed_qty
+                    self.last_buy_price = self._cum_usdt / self._cum_qty
 
                     logger.info(f"Buy order executed at {executed_price}. Updated last buy price to {self.last_buy_price}")
                     self.telegram.send_message(f"✅ Grid Buy #{self.current_grid_buy_index + 1} executed for {self.symbol}\nPrice: {executed_price}\nQuantity: {executed_qty}\nNew average buy price: {self.last_buy_price}")
 
                     # Move to next buy grid
                     self.active_buy_order_id = None
-                    self.current_grid_buy_index = min(self.current_grid_buy_index + 1, len(config.GRID_BUY_TRIGGER_PERCENTAGES) - 1)
+                    self.invalidate_balance_cache()
+                    self.current_grid_buy_index = min(self.current_grid_buy_index + 1, len(self._buy_params) - 1)
 
                 # If we have an active sell order that was executed
-                elif self.active_sell_order_id and trade['orderId'] == self.active_sell_order_id:
+                else:
                     executed_price = float(trade['price'])
                     executed_qty = float(trade['qty'])
 
                     # Calculate profit
                     profit_percentage = ((executed_price / self.last_buy_price) - 1) * 100
 
+                    # Selling part of the position keeps the average buy price of the rest
+                    sold_qty = min(executed_qty, self._cum_qty)
+                    self._cum_usdt -= sold_qty * self.last_buy_price
+                    self._cum_qty -= sold_qty
+
                     logger.info(f"Sell order executed at {executed_price}. Profit: {profit_percentage:.2f}%")
                     self.telegram.send_message(f"💰 Grid Sell #{self.current_grid_sell_index + 1} executed for {self.symbol}\nPrice: {executed_price}\nQuantity: {executed_qty}\nProfit: {profit_percentage:.2f}%")
 
                     # Move to next sell grid
                     self.active_sell_order_id = None
-                    self.current_grid_sell_index = min(self.current_grid_sell_index + 1, len(config.GRID_SELL_TRIGGER_PERCENTAGES) - 1)
+                    self.invalidate_balance_cache()
+                    self.current_grid_sell_index = min(self.current_grid_sell_index + 1, len(self._sell_params) - 1)
 
                     # If we've sold all our coins, reset the last buy price
                     remaining_balance = self.get_coin_balance()
                     if remaining_balance <= 0.0001:  # Small threshold to account for dust
-                        self.last_buy_price = None
-                        self.current_grid_sell_index = 0
+                        self.reset_last_buy_price()
                         logger.info("All coins sold. Resetting last buy price and sell grid index.")
 
         except Exception as e:
-            logger.error(f"Error checking order executions: {str(e)}")
+            logger.error(f"Error processing trades: {str(e)}")
 
-    def run(self):
+    def announce_start(self):
         """
-        Main bot loop
+        Log and notify that the bot has started
         """
         logger.info(f"Starting grid trading bot for {self.symbol}")
         self.telegram.send_message(f"🤖 Grid trading bot started for {self.symbol}")
 
         # No initial PnL notification for grid trading
 
-        while True:
-            try:
-                # Get current price
-                current_price = self.client.get_current_price(self.symbol)
+    def tick(self):
+        """
+        Run one iteration of the grid strategy
+
+        Returns:
+            Seconds to wait before the next iteration
+        """
+        try:
+            # Get current price
+            current_price = self.get_current_price()
 
+            with self._lock:
                 # Update lowest price
                 self.update_lowest_price(current_price)
 
                 # Check if we should remove the last buy price
-                if self.should_remove_last_buy_price():
+                if self.should_remove_last_buy_price(current_price):
                     logger.info(f"Coin value below threshold. Removing last buy price.")
-                    self.last_buy_price = None
-                    self.current_grid_sell_index = 0
+                    self.reset_last_buy_price()
 
-                # Check for order executions
-                self.check_order_executions()
+                # Check for order executions, unless the manager polls trades for us
+                if self.poll_trades and self.has_active_orders():
+                    self.check_order_executions()
 
                 # Check and place buy order if needed
                 self.check_and_place_buy_order(current_price)
 
-                # Check and place sell order if needed
-                self.check_and_place_sell_order(current_price)
+                # Check and place sell order if needed (nothing to sell without a last buy price)
+                if self.last_buy_price is not None:
+                    self.check_and_place_sell_order(current_price)
 
-                # Sleep for the configured interval
-                time.sleep(config.CHECK_INTERVAL)
+            # Wait for the configured interval
+            self._error_backoff = ERROR_BACKOFF_MIN
+            return self._check_interval
 
-            except Exception as e:
-                error_msg = f"Error in grid trading bot run loop: {str(e)}\n{traceback.format_exc()}"
-                logger.error(error_msg)
-                self.telegram.notify_error(error_msg)
+        except Exception as e:
+            error_msg = f"Error in grid trading bot run loop: {str(e)}\n{traceback.format_exc()}"
+            logger.error(error_msg)
+            self.telegram.notify_error(error_msg)
 
-                # Sleep for a bit before retrying
-                time.sleep(10)
+            # Back off exponentially while the error persists
+            backoff = self._error_backoff
+            self._error_backoff = min(backoff * 2, ERROR_BACKOFF_MAX)
+            return backoff
+
+    def run(self):
+        """
+        Main bot loop
+        """
+        self.announce_start()
+
+        # Sleep until fixed deadlines so request latency does not accumulate as drift
+        next_tick = time.monotonic()
+        while True:
+            next_tick += self.tick()
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                logger.warning(f"Grid tick for {self.symbol} overran its interval by {-delay:.1f}s")
+                next_tick = time.monotonic()
 
 
 class GridTradingManager:
     def __init__(self, symbols=None):
         self.symbols = symbols or [config.SYMBOL]
         self.bots = {}
-        self.threads = {}
+        self.client = None
+        self.scheduler_thread = None
+        self.poll_thread = None
+
+        # Monotonic time each bot's next tick is due, and bots with a tick in flight
+        self._due = {}
+        self._running = set()
 
     def start_bot(self, symbol):
         """
         Start a grid trading bot for a symbol
         """
-        import threading
-
-        bot = GridTradingBot(symbol)
+        bot = GridTradingBot(symbol, poll_trades=False)
         self.bots[symbol] = bot
 
-        # Create and start thread
-        thread = threading.Thread(target=bot.run, daemon=True)
-        thread.start()
-
-        self.threads[symbol] = thread
+        bot.announce_start()
+        self._due[symbol] = time.monotonic()
 
         logger.info(f"Started grid trading bot for {symbol}")
 
@@ -377,3 +542,116 @@ class GridTradingManager:
         """
         for symbol in self.symbols:
             self.start_bot(symbol)
+
+        # Shared client used to fetch prices for every bot at once
+        self.client = BinanceClient()
+
+        # One scheduler thread runs every bot's ticks instead of a sleeping thread per bot
+        self.scheduler_thread = threading.Thread(target=self._run_bots, daemon=True)
+        self.scheduler_thread.start()
+
+        # One thread polls trades for every bot instead of each bot polling on its own
+        self.poll_thread = threading.Thread(target=self._poll_trades, daemon=True)
+        self.poll_thread.start()
+
+    def schedule_due_bots(self, executor):
+        """
+        Submit a tick for every bot that is due and not already running
+
+        Args:
+            executor: Executor that runs the ticks
+        """
+        now = time.monotonic()
+        due = [(symbol, bot) for symbol, bot in list(self.bots.items())
+               if symbol not in self._running and self._due.get(symbol, now) <= now]
+        if not due:
+            return
+
+        # One request prices every due bot instead of one request per bot
+        prices = self.fetch_prices()
+
+        for symbol, bot in due:
+            price = prices.get(symbol)
+            if price is not None:
+                bot.update_price(price)
+
+            self._running.add(symbol)
+            future = executor.submit(bot.tick)
+            future.add_done_callback(partial(self._tick_done, symbol))
+
+    def fetch_prices(self):
+        """
+        Fetch current prices for all symbols in a single request
+
+        Returns:
+            Dictionary of symbol -> price, empty if the prices could not be fetched
+        """
+        if self.client is None:
+            return {}
+
+        try:
+            return self.client.get_all_prices()
+        except Exception as e:
+            logger.error(f"Error getting prices for grid bots: {str(e)}")
+            return {}
+
+    def _tick_done(self, symbol, future):
+        delay = 10 if future.exception() else future.result()
+
+        # Schedule from the previous deadline rather than from completion to avoid drift
+        now = time.monotonic()
+        due = self._due.get(symbol, now) + delay
+        if due < now:
+            logger.warning(f"Grid tick for {symbol} overran its interval by {now - due:.1f}s")
+            due = now
+
+        self._due[symbol] = due
+        self._running.discard(symbol)
+
+    def _run_bots(self):
+        """
+        Scheduler loop that runs due bot ticks on a bounded worker pool
+        """
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            while True:
+                self.schedule_due_bots(executor)
+                time.sleep(1)
+
+    def _fetch_trades(self, bot):
+        try:
+            return bot.client.get_recent_trades(bot.symbol)
+        except Exception as e:
+            logger.error(f"Error getting recent trades for {bot.symbol}: {str(e)}")
+            return None
+
+    def poll_trades_once(self):
+        """
+        Fetch recent trades for all bots with active orders and dispatch them
+
+        Lookups run concurrently, bounded by MAX_CONCURRENT_REQUESTS; bots
+        without an active order are skipped entirely.
+        """
+        bots = [bot for bot in list(self.bots.values()) if bot.has_active_orders()]
+        if not bots:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(len(bots), MAX_CONCURRENT_REQUESTS)) as executor:
+            results = list(executor.map(self._fetch_trades, bots))
+
+        for bot, trades in zip(bots, results):
+            if trades is None:
+                continue
+            with bot._lock:
+                bot.on_trades(trades)
+
+    def _poll_trades(self):
+        """
+        Trade polling loop run by the manager's poll thread
+        """
+        while True:
+            try:
+                self.poll_trades_once()
+            except Exception as e:
+                logger.error(f"Error polling grid trades: {str(e)}")
+
+            time.sleep(config.CHECK_INTERVAL)
@@ -2,14 +2,191 @@ import numpy as np
 import pandas as pd
 import config
 import math
+from collections import deque
+from smc_indicators import MARKET_STRUCTURE_CODES
+
+# Boolean indicator columns packed into the signal_flags bitmask, one bit each
+SIGNAL_FLAGS = {name: 1 << bit for bit, name in enumerate((
+    'macd_cross_up', 'macd_cross_down',
+    'macd_zero_cross_up', 'macd_zero_cross_down',
+    'macd_bullish_divergence', 'macd_bearish_divergence',
+    'bb_breakout_up', 'bb_breakout_down',
+    'bb_approaching_upper', 'bb_approaching_lower',
+    'bb_bounce_up', 'bb_bounce_down',
+    'bb_mean_reversion_up', 'bb_mean_reversion_down',
+    'bb_squeeze',
+    'ema_cross_up', 'ema_cross_down',
+    'is_green', 'is_red',
+))}
+
+def _ema(values, span):
+    """
+    Exponential moving average, equivalent to ewm(span=span, adjust=False).mean()
+
+    Delegates to pandas' compiled recurrence, which is exact for level input.
+
+    Args:
+        values: 1-D float array
+        span: EMA span
+
+    Returns:
+        Array of EMA values
+    """
+    return pd.Series(values, dtype=np.float64).ewm(span=span, adjust=False).mean().to_numpy()
 
-def calculate_rsi(df, period=None):
+def _window_sums(values, window, squares=False):
     """
-    Calculate RSI (Relative Strength Index)
+    Trailing window sums of a centered array using running (cumulative) sums
+
+    Windows containing NaN yield NaN, like pandas rolling with min_periods=window.
+
+    Args:
+        values: 1-D float array
+        window: Window length
+        squares: Also return the windowed sum of squares
+
+    Returns:
+        Tuple of (offset, sums, sums_of_squares) where the sums are of
+        values - offset; sums_of_squares is None unless requested
+    """
+    n = len(values)
+    valid = ~np.isnan(values)
+    # Center the data so the running sums stay small and precise
+    offset = values[valid].mean() if valid.any() else 0.0
+    x = np.where(valid, values - offset, 0.0)
+
+    def windowed(a):
+        out = np.full(n, np.nan)
+        if n >= window:
+            cs = np.concatenate(([0.0], np.cumsum(a)))
+            out[window - 1:] = cs[window:] - cs[:-window]
+        return out
+
+    counts = windowed(valid.astype(np.float64))
+    full = counts == window
+    sums = np.where(full, windowed(x), np.nan)
+    sums_sq = np.where(full, windowed(x * x), np.nan) if squares else None
+    return offset, sums, sums_sq
+
+def _shift(values):
+    """
+    Shift an array forward by one bar, like Series.shift(1)
+
+    Args:
+        values: 1-D float array
+
+    Returns:
+        Array with NaN in the first position
+    """
+    return np.concatenate(([np.nan], values[:-1]))[:len(values)]
+
+def _cross_up(a, b):
+    """
+    Bars where a crosses above b: a > b now and a <= b on the previous bar
+
+    Args:
+        a: 1-D float array
+        b: 1-D float array of the same length, or a scalar level
+
+    Returns:
+        Boolean array, False on the first bar
+    """
+    b = np.broadcast_to(b, a.shape)
+    out = np.zeros(a.shape, dtype=bool)
+    out[1:] = (a[1:] > b[1:]) & (a[:-1] <= b[:-1])
+    return out
+
+def _cross_down(a, b):
+    """
+    Bars where a crosses below b: a < b now and a >= b on the previous bar
+
+    Args:
+        a: 1-D float array
+        b: 1-D float array of the same length, or a scalar level
+
+    Returns:
+        Boolean array, False on the first bar
+    """
+    b = np.broadcast_to(b, a.shape)
+    out = np.zeros(a.shape, dtype=bool)
+    out[1:] = (a[1:] < b[1:]) & (a[:-1] >= b[:-1])
+    return out
+
+def _rolling_mean(values, window):
+    """
+    Rolling mean, equivalent to rolling(window).mean()
+
+    Args:
+        values: 1-D float array
+        window: Window length
+
+    Returns:
+        Array of rolling means (NaN until the window is full)
+    """
+    offset, sums, _ = _window_sums(values, window)
+    return sums / window + offset
+
+def _rolling_mean_std(values, window):
+    """
+    Rolling mean and sample standard deviation in a single pass
+
+    Equivalent to rolling(window).mean() and rolling(window).std().
+
+    Args:
+        values: 1-D float array
+        window: Window length
+
+    Returns:
+        Tuple of (mean, std) arrays
+    """
+    offset, sums, sums_sq = _window_sums(values, window, squares=True)
+    var = np.maximum(sums_sq - sums * sums / window, 0.0) / (window - 1)
+    return sums / window + offset, np.sqrt(var)
+
+def _rsi_wilder(close, period):
+    """
+    RSI with Wilder's smoothing
+
+    The first average gain/loss is the simple mean of the first `period`
+    price changes; after that each average is updated recursively as
+    (prev * (period - 1) + current) / period.
+
+    Args:
+        close: 1-D array of close prices
+        period: RSI period
+
+    Returns:
+        Array of RSI values (NaN until `period` changes are available)
+    """
+    n = len(close)
+    rsi = np.full(n, np.nan)
+    if n <= period:
+        return rsi
+
+    # Gains and losses in one pass over the price changes
+    delta = np.diff(close)
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+
+    # Wilder's recursion is an EMA with alpha = 1 / period, i.e. span 2 * period - 1,
+    # seeded with the simple mean of the first `period` changes
+    span = 2 * period - 1
+    avg_gain = _ema(np.concatenate(([gain[:period].mean()], gain[period:])), span)
+    avg_loss = _ema(np.concatenate(([loss[:period].mean()], loss[period:])), span)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi[period:] = np.where(avg_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss))
+
+    return rsi
+
+def calculate_rsi(df, period=None, inplace=False):
+    """
+    Calculate RSI (Relative Strength Index) using Wilder's smoothing
 
     Args:
         df: DataFrame with OHLC data
         period: RSI period (default from config)
+        inplace: Add the columns to df itself instead of a copy
 
     Returns:
         DataFrame with RSI values
@@ -17,50 +194,45 @@ def calculate_rsi(df, period=None):
     period = period or config.RSI_PERIOD
 
     # Make a copy of the dataframe to avoid modifying the original
-    df = df.copy()
+    if not inplace:
+        df = df.copy()
 
-    # Calculate price changes
-    delta = df['close'].diff()
-
-    # Separate gains and losses
-    gain = delta.where(delta > 0, 0)
-    loss = -delta.where(delta < 0, 0)
-
-    # Calculate average gain and loss
-    avg_gain = gain.rolling(window=period).mean()
-    avg_loss = loss.rolling(window=period).mean()
-
-    # Calculate RS (Relative Strength)
-    rs = avg_gain / avg_loss
-
-    # Calculate RSI
-    rsi = 100 - (100 / (1 + rs))
+    # Calculate Wilder-smoothed RSI
+    rsi = _rsi_wilder(df['close'].to_numpy(dtype=np.float64), period)
 
     # Add RSI to dataframe
     df['rsi'] = rsi
 
     return df
 
-def detect_candle_pattern(df):
+def detect_candle_pattern(df, inplace=False):
     """
     Detect candle patterns (green/red candles)
 
     Args:
         df: DataFrame with OHLC data
+        inplace: Add the columns to df itself instead of a copy
 
     Returns:
         DataFrame with candle pattern information
     """
     # Make a copy of the dataframe to avoid modifying the original
-    df = df.copy()
+    if not inplace:
+        df = df.copy()
+
+    # Candle direction in one pass: 1 green (bullish), -1 red (bearish), 0 doji
+    direction = df['close'].to_numpy(dtype=np.float64) - df['open'].to_numpy(dtype=np.float64)
+    np.sign(direction, out=direction)
+    candle_dir = np.nan_to_num(direction, copy=False).astype(np.int8)
+    df['candle_dir'] = candle_dir
 
-    # Determine if candle is green (bullish) or red (bearish)
-    df['is_green'] = df['close'] > df['open']
-    df['is_red'] = df['close'] < df['open']
+    # Boolean views used by the signal flags and the notifiers
+    df['is_green'] = candle_dir == 1
+    df['is_red'] = candle_dir == -1
 
     return df
 
-def calculate_ema(df, short_period=None, long_period=None):
+def calculate_ema(df, short_period=None, long_period=None, inplace=False):
     """
     Calculate Exponential Moving Averages (EMA)
 
@@ -68,6 +240,7 @@ def calculate_ema(df, short_period=None, long_period=None):
         df: DataFrame with OHLC data
         short_period: Short EMA period (default from config)
         long_period: Long EMA period (default from config)
+        inplace: Add the columns to df itself instead of a copy
 
     Returns:
         DataFrame with EMA values
@@ -76,19 +249,23 @@ def calculate_ema(df, short_period=None, long_period=None):
     long_period = long_period or config.EMA_LONG_PERIOD
 
     # Make a copy of the dataframe to avoid modifying the original
-    df = df.copy()
+    if not inplace:
+        df = df.copy()
 
     # Calculate EMAs
-    df[f'ema_{short_period}'] = df['close'].ewm(span=short_period, adjust=False).mean()
-    df[f'ema_{long_period}'] = df['close'].ewm(span=long_period, adjust=False).mean()
+    close = df['close'].to_numpy(dtype=np.float64)
+    ema_short = _ema(close, short_period)
+    ema_long = _ema(close, long_period)
+    df[f'ema_{short_period}'] = ema_short
+    df[f'ema_{long_period}'] = ema_long
 
     # Calculate EMA crossover signals
-    df['ema_cross_up'] = (df[f'ema_{short_period}'] > df[f'ema_{long_period}']) & (df[f'ema_{short_period}'].shift(1) <= df[f'ema_{long_period}'].shift(1))
-    df['ema_cross_down'] = (df[f'ema_{short_period}'] < df[f'ema_{long_period}']) & (df[f'ema_{short_period}'].shift(1) >= df[f'ema_{long_period}'].shift(1))
+    df['ema_cross_up'] = _cross_up(ema_short, ema_long)
+    df['ema_cross_down'] = _cross_down(ema_short, ema_long)
 
     return df
 
-def calculate_bollinger_bands(df, period=None, std_dev=None):
+def calculate_bollinger_bands(df, period=None, std_dev=None, inplace=False):
     """
     Calculate Bollinger Bands
 
@@ -96,6 +273,7 @@ def calculate_bollinger_bands(df, period=None, std_dev=None):
         df: DataFrame with OHLC data
         period: Bollinger Bands period (default from config)
         std_dev: Number of standard deviations (default from config)
+        inplace: Add the columns to df itself instead of a copy
 
     Returns:
         DataFrame with Bollinger Bands values
@@ -104,44 +282,133 @@ def calculate_bollinger_bands(df, period=None, std_dev=None):
     std_dev = std_dev or config.BB_STD_DEV
 
     # Make a copy of the dataframe to avoid modifying the original
-    df = df.copy()
+    if not inplace:
+        df = df.copy()
 
-    # Calculate middle band (SMA)
-    df['bb_middle'] = df['close'].rolling(window=period).mean()
+    close = df['close'].to_numpy(dtype=np.float64)
+    open_ = df['open'].to_numpy(dtype=np.float64)
+    high = df['high'].to_numpy(dtype=np.float64)
+    low = df['low'].to_numpy(dtype=np.float64)
+    prev_close = _shift(close)
 
-    # Calculate standard deviation
-    df['bb_std'] = df['close'].rolling(window=period).std()
+    # Calculate middle band (SMA) and standard deviation
+    middle, std = _rolling_mean_std(close, period)
 
     # Calculate upper and lower bands
-    df['bb_upper'] = df['bb_middle'] + (df['bb_std'] * std_dev)
-    df['bb_lower'] = df['bb_middle'] - (df['bb_std'] * std_dev)
+    upper = middle + std * std_dev
+    lower = middle - std * std_dev
+    band = upper - lower
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        width = band / middle
+        percent_b = (close - lower) / band
+
+    df['bb_middle'] = middle
+    df['bb_std'] = std
+    df['bb_upper'] = upper
+    df['bb_lower'] = lower
 
     # Calculate Bollinger Band breakout signals
-    df['bb_breakout_up'] = df['close'] > df['bb_upper']
-    df['bb_breakout_down'] = df['close'] < df['bb_lower']
+    df['bb_breakout_up'] = close > upper
+    df['bb_breakout_down'] = close < lower
 
     # Add more sensitive signals - approaching bands
-    df['bb_approaching_upper'] = (df['close'] > df['bb_middle']) & (df['close'] > df['close'].shift(1)) & (df['close'] < df['bb_upper']) & (df['bb_upper'] - df['close'] < df['bb_std'] * 0.5)
-    df['bb_approaching_lower'] = (df['close'] < df['bb_middle']) & (df['close'] < df['close'].shift(1)) & (df['close'] > df['bb_lower']) & (df['close'] - df['bb_lower'] < df['bb_std'] * 0.5)
+    half_std = std * 0.5
+    df['bb_approaching_upper'] = (close > middle) & (close > prev_close) & (close < upper) & (upper - close < half_std)
+    df['bb_approaching_lower'] = (close < middle) & (close < prev_close) & (close > lower) & (close - lower < half_std)
 
     # Add squeeze detection (when bands are narrow)
-    df['bb_width'] = (df['bb_upper'] - df['bb_lower']) / df['bb_middle']
-    df['bb_squeeze'] = df['bb_width'] < df['bb_width'].rolling(window=20).mean() * 0.8
+    df['bb_width'] = width
+    df['bb_squeeze'] = width < _rolling_mean(width, 20) * 0.8
 
     # Add bounce signals (price bouncing off the bands)
-    df['bb_bounce_up'] = (df['low'] <= df['bb_lower']) & (df['close'] > df['bb_lower']) & (df['close'] > df['open'])
-    df['bb_bounce_down'] = (df['high'] >= df['bb_upper']) & (df['close'] < df['bb_upper']) & (df['close'] < df['open'])
+    df['bb_bounce_up'] = (low <= lower) & (close > lower) & (close > open_)
+    df['bb_bounce_down'] = (high >= upper) & (close < upper) & (close < open_)
 
     # Add mean reversion signals
-    df['bb_mean_reversion_up'] = (df['close'].shift(1) < df['bb_lower'].shift(1)) & (df['close'] > df['bb_lower'])
-    df['bb_mean_reversion_down'] = (df['close'].shift(1) > df['bb_upper'].shift(1)) & (df['close'] < df['bb_upper'])
+    mean_reversion_up = np.zeros(len(close), dtype=bool)
+    mean_reversion_up[1:] = (close[:-1] < lower[:-1]) & (close[1:] > lower[1:])
+    mean_reversion_down = np.zeros(len(close), dtype=bool)
+    mean_reversion_down[1:] = (close[:-1] > upper[:-1]) & (close[1:] < upper[1:])
+    df['bb_mean_reversion_up'] = mean_reversion_up
+    df['bb_mean_reversion_down'] = mean_reversion_down
 
     # Calculate percentage B (position within the bands)
-    df['bb_percent_b'] = (df['close'] - df['bb_lower']) / (df['bb_upper'] - df['bb_lower'])
+    df['bb_percent_b'] = percent_b
+
+    # Combined band signal: +/-2 breakout, +/-1 bounce, 0 none
+    bb_signal = np.zeros(len(df), dtype=np.int8)
+    bb_signal[df['bb_bounce_up'].to_numpy()] = 1
+    bb_signal[df['bb_bounce_down'].to_numpy()] = -1
+    bb_signal[df['bb_breakout_up'].to_numpy()] = 2
+    bb_signal[df['bb_breakout_down'].to_numpy()] = -2
+    df['bb_signal'] = bb_signal
 
     return df
 
-def calculate_macd(df, fast_period=None, slow_period=None, signal_period=None):
+def _rolling_extreme(values, window, func):
+    """
+    Rolling min/max over the trailing window, shrinking the window at the start
+
+    Args:
+        values: 1-D float array
+        window: Number of bars in the window (including the current bar)
+        func: np.min or np.max
+
+    Returns:
+        Array with the extreme of values[max(0, i-window+1):i+1] for every i
+    """
+    fill = np.inf if func is np.min else -np.inf
+    padded = np.concatenate((np.full(window - 1, fill), values))
+    return func(np.lib.stride_tricks.sliding_window_view(padded, window), axis=1)
+
+def _macd_divergence(low, high, macd, lookback=20, win=5):
+    """
+    Detect regular MACD divergence on plain arrays
+
+    A bar is a local low (high) when it is the extreme of the last win+1 bars.
+    For each local low, the most recent earlier local low between win and
+    lookback bars back is compared: a lower price low with a higher MACD low
+    is bullish divergence. Bearish divergence mirrors this on the highs.
+    Previous pivots are found with a binary search over the pivot positions,
+    so there is no per-bar Python loop.
+
+    Args:
+        low: Array of candle lows
+        high: Array of candle highs
+        macd: Array of MACD line values
+        lookback: Maximum number of bars to look back for the previous pivot
+        win: Pivot window (bars before the current one)
+
+    Returns:
+        Tuple of (bullish, bearish) boolean arrays
+    """
+    n = len(low)
+    bullish = np.zeros(n, dtype=bool)
+    bearish = np.zeros(n, dtype=bool)
+    if n <= win:
+        return bullish, bearish
+
+    def previous_pivot(is_pivot):
+        # The previous pivot must lie in (max(0, i - lookback), i - win]
+        pivots = np.flatnonzero(is_pivot)
+        current = pivots[pivots >= win]
+        k = np.searchsorted(pivots, current - win, side='right') - 1
+        prev = pivots[np.maximum(k, 0)]
+        found = (k >= 0) & (prev > np.maximum(0, current - lookback))
+        return current[found], prev[found]
+
+    # Regular bullish divergence: price makes lower low but MACD makes higher low
+    current, prev = previous_pivot(low == _rolling_extreme(low, win + 1, np.min))
+    bullish[current] = (low[current] < low[prev]) & (macd[current] > macd[prev])
+
+    # Regular bearish divergence: price makes higher high but MACD makes lower high
+    current, prev = previous_pivot(high == _rolling_extreme(high, win + 1, np.max))
+    bearish[current] = (high[current] > high[prev]) & (macd[current] < macd[prev])
+
+    return bullish, bearish
+
+def calculate_macd(df, fast_period=None, slow_period=None, signal_period=None, inplace=False):
     """
     Calculate MACD (Moving Average Convergence Divergence)
 
@@ -150,6 +417,7 @@ def calculate_macd(df, fast_period=None, slow_period=None, signal_period=None):
         fast_period: Fast EMA period (default from config)
         slow_period: Slow EMA period (default from config)
         signal_period: Signal EMA period (default from config)
+        inplace: Add the columns to df itself instead of a copy
 
     Returns:
         DataFrame with MACD values
@@ -159,59 +427,247 @@ def calculate_macd(df, fast_period=None, slow_period=None, signal_period=None):
     signal_period = signal_period or config.MACD_SIGNAL_PERIOD
 
     # Make a copy of the dataframe to avoid modifying the original
-    df = df.copy()
-
-    # Calculate fast and slow EMAs
-    df['macd_fast_ema'] = df['close'].ewm(span=fast_period, adjust=False).mean()
-    df['macd_slow_ema'] = df['close'].ewm(span=slow_period, adjust=False).mean()
-
-    # Calculate MACD line
-    df['macd_line'] = df['macd_fast_ema'] - df['macd_slow_ema']
-
-    # Calculate signal line
-    df['macd_signal'] = df['macd_line'].ewm(span=signal_period, adjust=False).mean()
+    if not inplace:
+        df = df.copy()
+
+    # Calculate fast and slow EMAs, MACD line and signal line
+    close = df['close'].to_numpy(dtype=np.float64)
+    fast_ema = _ema(close, fast_period)
+    slow_ema = _ema(close, slow_period)
+    macd_line = fast_ema - slow_ema
+    signal_line = _ema(macd_line, signal_period)
+    df['macd_fast_ema'] = fast_ema
+    df['macd_slow_ema'] = slow_ema
+    df['macd_line'] = macd_line
+    df['macd_signal'] = signal_line
 
     # Calculate histogram
-    df['macd_histogram'] = df['macd_line'] - df['macd_signal']
+    df['macd_histogram'] = macd_line - signal_line
 
     # Calculate MACD crossover signals
-    df['macd_cross_up'] = (df['macd_line'] > df['macd_signal']) & (df['macd_line'].shift(1) <= df['macd_signal'].shift(1))
-    df['macd_cross_down'] = (df['macd_line'] < df['macd_signal']) & (df['macd_line'].shift(1) >= df['macd_signal'].shift(1))
+    df['macd_cross_up'] = _cross_up(macd_line, signal_line)
+    df['macd_cross_down'] = _cross_down(macd_line, signal_line)
 
     # Calculate zero line crossover signals
-    df['macd_zero_cross_up'] = (df['macd_line'] > 0) & (df['macd_line'].shift(1) <= 0)
-    df['macd_zero_cross_down'] = (df['macd_line'] < 0) & (df['macd_line'].shift(1) >= 0)
+    df['macd_zero_cross_up'] = _cross_up(macd_line, 0.0)
+    df['macd_zero_cross_down'] = _cross_down(macd_line, 0.0)
 
     # Calculate MACD divergence
-    df['macd_bullish_divergence'] = False
-    df['macd_bearish_divergence'] = False
-
-    # Look for regular bullish divergence: price makes lower low but MACD makes higher low
-    for i in range(5, len(df)):
-        # Find local price lows in the last 10 candles
-        if df.iloc[i]['low'] == df.iloc[i-5:i+1]['low'].min():
-            # Look back for previous low
-            for j in range(i-5, max(0, i-20), -1):
-                if df.iloc[j]['low'] == df.iloc[max(0, j-5):j+1]['low'].min():
-                    # Check for bullish divergence
-                    if df.iloc[i]['low'] < df.iloc[j]['low'] and df.iloc[i]['macd_line'] > df.iloc[j]['macd_line']:
-                        df.loc[df.index[i], 'macd_bullish_divergence'] = True
-                    break
-
-    # Look for regular bearish divergence: price makes higher high but MACD makes lower high
-    for i in range(5, len(df)):
-        # Find local price highs in the last 10 candles
-        if df.iloc[i]['high'] == df.iloc[i-5:i+1]['high'].max():
-            # Look back for previous high
-            for j in range(i-5, max(0, i-20), -1):
-                if df.iloc[j]['high'] == df.iloc[max(0, j-5):j+1]['high'].max():
-                    # Check for bearish divergence
-                    if df.iloc[i]['high'] > df.iloc[j]['high'] and df.iloc[i]['macd_line'] < df.iloc[j]['macd_line']:
-                        df.loc[df.index[i], 'macd_bearish_divergence'] = True
-                    break
+    bullish, bearish = _macd_divergence(
+        df['low'].to_numpy(dtype=np.float64),
+        df['high'].to_numpy(dtype=np.float64),
+        macd_line
+    )
+    df['macd_bullish_divergence'] = bullish
+    df['macd_bearish_divergence'] = bearish
 
     return df
 
+def pack_signal_flags(df):
+    """
+    Pack the boolean indicator columns of df into one bitmask per row
+
+    Args:
+        df: DataFrame with indicator columns; missing columns leave their bit unset
+
+    Returns:
+        uint32 array with the SIGNAL_FLAGS bits set
+    """
+    flags = np.zeros(len(df), dtype=np.uint32)
+    for name, bit in SIGNAL_FLAGS.items():
+        if name in df.columns:
+            flags[df[name].to_numpy(dtype=bool)] |= bit
+    return flags
+
+def compute_all_indicators(df, inplace=False):
+    """
+    Calculate RSI, candle pattern, EMA, Bollinger Bands and MACD columns
+
+    The frame is copied at most once, and every indicator then adds its
+    columns to that same frame. The boolean signals are also packed into a
+    signal_flags bitmask column for check_entry_signal.
+
+    Args:
+        df: DataFrame with OHLC data
+        inplace: Add the columns to df itself instead of a copy
+
+    Returns:
+        DataFrame with all indicator columns
+    """
+    if not inplace:
+        df = df.copy()
+
+    calculate_rsi(df, inplace=True)
+    detect_candle_pattern(df, inplace=True)
+    calculate_ema(df, inplace=True)
+    calculate_bollinger_bands(df, inplace=True)
+    calculate_macd(df, inplace=True)
+
+    df['signal_flags'] = pack_signal_flags(df)
+
+    return df
+
+class IndicatorState:
+    """
+    Streaming RSI, EMA, MACD and Bollinger Band values for one symbol
+
+    Each update() consumes one closed candle in constant time and returns the
+    same values the batch functions produce for the last row of the series
+    seen so far.
+    """
+
+    def __init__(self, rsi_period=None, ema_short_period=None, ema_long_period=None,
+                 bb_period=None, bb_std_dev=None, macd_fast_period=None,
+                 macd_slow_period=None, macd_signal_period=None):
+        self.rsi_period = rsi_period or config.RSI_PERIOD
+        self.ema_short_period = ema_short_period or config.EMA_SHORT_PERIOD
+        self.ema_long_period = ema_long_period or config.EMA_LONG_PERIOD
+        self.bb_period = bb_period or config.BB_PERIOD
+        self.bb_std_dev = bb_std_dev or config.BB_STD_DEV
+        self.macd_fast_period = macd_fast_period or config.MACD_FAST_PERIOD
+        self.macd_slow_period = macd_slow_period or config.MACD_SLOW_PERIOD
+        self.macd_signal_period = macd_signal_period or config.MACD_SIGNAL_PERIOD
+
+        self.count = 0
+        self.last_close = None
+        self.ema_short = None
+        self.ema_long = None
+        self.macd_fast = None
+        self.macd_slow = None
+        self.macd_signal = None
+        self.rsi_avg_gain = 0.0
+        self.rsi_avg_loss = 0.0
+
+        # Rolling window sums are kept relative to the first close for precision
+        self.bb_window = deque()
+        self.bb_offset = None
+        self.bb_sum = 0.0
+        self.bb_sum2 = 0.0
+
+    @staticmethod
+    def _ema_step(prev, value, period):
+        """Advance an EMA by one value, seeding it with the first value"""
+        if prev is None:
+            return value
+        alpha = 2.0 / (period + 1)
+        return alpha * value + (1.0 - alpha) * prev
+
+    def _update_rsi(self, close):
+        """Advance the Wilder averages and return the RSI"""
+        period = self.rsi_period
+        if self.last_close is None:
+            return np.nan
+
+        delta = close - self.last_close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+
+        # self.count already includes this close, so it is the number of changes + 1
+        changes = self.count - 1
+        if changes <= period:
+            self.rsi_avg_gain += gain / period
+            self.rsi_avg_loss += loss / period
+            if changes < period:
+                return np.nan
+        else:
+            self.rsi_avg_gain = (self.rsi_avg_gain * (period - 1) + gain) / period
+            self.rsi_avg_loss = (self.rsi_avg_loss * (period - 1) + loss) / period
+
+        if self.rsi_avg_loss == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + self.rsi_avg_gain / self.rsi_avg_loss)
+
+    def _update_bollinger(self, close):
+        """Slide the window and return the middle band and standard deviation"""
+        period = self.bb_period
+        if self.bb_offset is None:
+            self.bb_offset = close
+        x = close - self.bb_offset
+
+        self.bb_window.append(x)
+        self.bb_sum += x
+        self.bb_sum2 += x * x
+        if len(self.bb_window) > period:
+            old = self.bb_window.popleft()
+            self.bb_sum -= old
+            self.bb_sum2 -= old * old
+
+        if len(self.bb_window) < period:
+            return np.nan, np.nan
+
+        mean = self.bb_sum / period
+        var = max(self.bb_sum2 - self.bb_sum * mean, 0.0) / (period - 1)
+        return mean + self.bb_offset, math.sqrt(var)
+
+    def update(self, close):
+        """
+        Add one closed candle
+
+        Args:
+            close: Close price of the candle
+
+        Returns:
+            Dictionary of indicator values keyed by the batch column names
+        """
+        close = float(close)
+        self.count += 1
+
+        prev_ema_short, prev_ema_long = self.ema_short, self.ema_long
+        self.ema_short = self._ema_step(self.ema_short, close, self.ema_short_period)
+        self.ema_long = self._ema_step(self.ema_long, close, self.ema_long_period)
+
+        prev_line = None if self.macd_fast is None else self.macd_fast - self.macd_slow
+        prev_signal = self.macd_signal
+        self.macd_fast = self._ema_step(self.macd_fast, close, self.macd_fast_period)
+        self.macd_slow = self._ema_step(self.macd_slow, close, self.macd_slow_period)
+        macd_line = self.macd_fast - self.macd_slow
+        self.macd_signal = self._ema_step(self.macd_signal, macd_line, self.macd_signal_period)
+
+        rsi = self._update_rsi(close)
+        self.last_close = close
+
+        middle, std = self._update_bollinger(close)
+
+        values = {
+            'rsi': rsi,
+            f'ema_{self.ema_short_period}': self.ema_short,
+            f'ema_{self.ema_long_period}': self.ema_long,
+            'ema_cross_up': prev_ema_short is not None and self.ema_short > self.ema_long and prev_ema_short <= prev_ema_long,
+            'ema_cross_down': prev_ema_short is not None and self.ema_short < self.ema_long and prev_ema_short >= prev_ema_long,
+            'macd_fast_ema': self.macd_fast,
+            'macd_slow_ema': self.macd_slow,
+            'macd_line': macd_line,
+            'macd_signal': self.macd_signal,
+            'macd_histogram': macd_line - self.macd_signal,
+            'macd_cross_up': prev_line is not None and macd_line > self.macd_signal and prev_line <= prev_signal,
+            'macd_cross_down': prev_line is not None and macd_line < self.macd_signal and prev_line >= prev_signal,
+            'macd_zero_cross_up': prev_line is not None and macd_line > 0 and prev_line <= 0,
+            'macd_zero_cross_down': prev_line is not None and macd_line < 0 and prev_line >= 0,
+            'bb_middle': middle,
+            'bb_std': std,
+            'bb_upper': middle + std * self.bb_std_dev,
+            'bb_lower': middle - std * self.bb_std_dev,
+        }
+        return values
+
+def _fvg_edge(df, fvg_idx, column):
+    """
+    Look up an edge of the FVG referenced by a nearest_*_fvg index
+
+    Used for frames built without the nearest_*_fvg_bottom/top columns.
+
+    Args:
+        df: DataFrame with FVG data
+        fvg_idx: Index label of the FVG, or NaN/None
+        column: 'fvg_bottom' or 'fvg_top'
+
+    Returns:
+        The edge price, or NaN if there is no such FVG
+    """
+    if fvg_idx is None or pd.isna(fvg_idx) or fvg_idx not in df.index:
+        return np.nan
+    return df.loc[fvg_idx, column]
+
 def check_entry_signal(df, use_smc=True):
     """
     Check for entry signals based on multiple indicators:
@@ -229,8 +685,53 @@ def check_entry_signal(df, use_smc=True):
     Returns:
         Signal: 'LONG', 'SHORT', or None
     """
-    # Get the latest data point
-    latest = df.iloc[-1]
+    # Get the latest data point as plain Python scalars
+    latest = df.iloc[-1].to_dict()
+    get = latest.get
+
+    rsi_oversold_level = config.RSI_OVERSOLD
+    rsi_overbought_level = config.RSI_OVERBOUGHT
+
+    close = latest['close']
+    rsi = latest['rsi']
+
+    # Signal bits from the packed column, or from the individual columns
+    flags = get('signal_flags')
+    if flags is None or pd.isna(flags):
+        flags = 0
+        for name, bit in SIGNAL_FLAGS.items():
+            if get(name, False):
+                flags |= bit
+    else:
+        flags = int(flags)
+    bits = SIGNAL_FLAGS
+
+    # Check for MACD signals (high priority)
+    macd_cross_up = bool(flags & bits['macd_cross_up'])
+    macd_cross_down = bool(flags & bits['macd_cross_down'])
+    macd_zero_cross_up = bool(flags & bits['macd_zero_cross_up'])
+    macd_zero_cross_down = bool(flags & bits['macd_zero_cross_down'])
+    macd_bullish_divergence = bool(flags & bits['macd_bullish_divergence'])
+    macd_bearish_divergence = bool(flags & bits['macd_bearish_divergence'])
+
+    # Check for Bollinger Band signals
+    bb_breakout_up = bool(flags & bits['bb_breakout_up'])
+    bb_breakout_down = bool(flags & bits['bb_breakout_down'])
+    bb_approaching_upper = bool(flags & bits['bb_approaching_upper'])
+    bb_approaching_lower = bool(flags & bits['bb_approaching_lower'])
+    bb_bounce_up = bool(flags & bits['bb_bounce_up'])
+    bb_bounce_down = bool(flags & bits['bb_bounce_down'])
+    bb_mean_reversion_up = bool(flags & bits['bb_mean_reversion_up'])
+    bb_mean_reversion_down = bool(flags & bits['bb_mean_reversion_down'])
+    bb_squeeze = bool(flags & bits['bb_squeeze'])
+
+    # Check for EMA signals
+    ema_cross_up = bool(flags & bits['ema_cross_up'])
+    ema_cross_down = bool(flags & bits['ema_cross_down'])
+
+    # Check for candle patterns
+    green_candle = bool(flags & bits['is_green'])
+    red_candle = bool(flags & bits['is_red'])
 
     # Initialize signal strength counters
     long_signals = 0
@@ -241,187 +742,296 @@ def check_entry_signal(df, use_smc=True):
     short_weight = 0
 
     # Check MACD crossover (prioritized)
-    if 'macd_cross_up' in latest and latest['macd_cross_up']:
+    if macd_cross_up:
         long_signals += 1
         long_weight += 2  # Higher weight for MACD cross
-    elif 'macd_cross_down' in latest and latest['macd_cross_down']:
+    elif macd_cross_down:
         short_signals += 1
         short_weight += 2  # Higher weight for MACD cross
 
     # Check MACD divergence
-    if 'macd_bullish_divergence' in latest and latest['macd_bullish_divergence']:
+    if macd_bullish_divergence:
         long_signals += 1
         long_weight += 1.5
-    elif 'macd_bearish_divergence' in latest and latest['macd_bearish_divergence']:
+    elif macd_bearish_divergence:
         short_signals += 1
         short_weight += 1.5
 
     # Check MACD zero line crossover
-    if 'macd_zero_cross_up' in latest and latest['macd_zero_cross_up']:
+    if macd_zero_cross_up:
         long_signals += 1
         long_weight += 1
-    elif 'macd_zero_cross_down' in latest and latest['macd_zero_cross_down']:
+    elif macd_zero_cross_down:
         short_signals += 1
         short_weight += 1
 
     # Check RSI and candle pattern
-    if latest['rsi'] < config.RSI_OVERSOLD and latest['is_green']:
+    if rsi < rsi_oversold_level and green_candle:
         long_signals += 1
         long_weight += 1
-    elif latest['rsi'] > config.RSI_OVERBOUGHT and latest['is_red']:
+    elif rsi > rsi_overbought_level and red_candle:
         short_signals += 1
         short_weight += 1
 
     # Check EMA crossover
-    if latest['ema_cross_up']:
+    if ema_cross_up:
         long_signals += 1
         long_weight += 1
-    elif latest['ema_cross_down']:
+    elif ema_cross_down:
         short_signals += 1
         short_weight += 1
 
     # Check Bollinger Band breakout
-    if latest['bb_breakout_up']:
+    if bb_breakout_up:
         long_signals += 1
         long_weight += 1
-    elif latest['bb_breakout_down']:
+    elif bb_breakout_down:
         short_signals += 1
         short_weight += 1
 
-    # Check Smart Money Concept (SMC) market structure if available
-    if use_smc and 'market_structure' in latest:
-        if latest['market_structure'] in ['uptrend', 'bullish_reversal']:
+    if use_smc:
+        # Check Smart Money Concept (SMC) market structure if available
+        structure = get('market_structure_code')
+        if structure is None:
+            structure = MARKET_STRUCTURE_CODES.get(get('market_structure'), 0)
+        if structure > 0:
             long_signals += 1
             long_weight += 1.5
-        elif latest['market_structure'] in ['downtrend', 'bearish_reversal']:
+        elif structure < 0:
             short_signals += 1
             short_weight += 1.5
 
-    # Check for Break of Structure (BOS) if available
-    if use_smc and 'bos_bullish' in latest and latest['bos_bullish']:
-        long_signals += 1
-        long_weight += 1.5
-    elif use_smc and 'bos_bearish' in latest and latest['bos_bearish']:
-        short_signals += 1
-        short_weight += 1.5
+        # Check for Break of Structure (BOS) if available
+        if get('bos_bullish', False):
+            long_signals += 1
+            long_weight += 1.5
+        elif get('bos_bearish', False):
+            short_signals += 1
+            short_weight += 1.5
 
-    # Check for Fair Value Gaps (FVG) if available
-    if use_smc and 'nearest_bullish_fvg' in latest and not pd.isna(latest['nearest_bullish_fvg']):
-        # If price is near a bullish FVG, it's a potential support level
-        fvg_idx = latest['nearest_bullish_fvg']
-        if fvg_idx in df.index:
-            fvg_bottom = df.loc[fvg_idx, 'fvg_bottom']
-            # If price is close to the FVG bottom (potential support)
-            if abs(latest['close'] - fvg_bottom) / latest['close'] < 0.01:  # Within 1%
-                long_signals += 1
-                long_weight += 1
-
-    if use_smc and 'nearest_bearish_fvg' in latest and not pd.isna(latest['nearest_bearish_fvg']):
-        # If price is near a bearish FVG, it's a potential resistance level
-        fvg_idx = latest['nearest_bearish_fvg']
-        if fvg_idx in df.index:
-            fvg_top = df.loc[fvg_idx, 'fvg_top']
-            # If price is close to the FVG top (potential resistance)
-            if abs(latest['close'] - fvg_top) / latest['close'] < 0.01:  # Within 1%
-                short_signals += 1
-                short_weight += 1
+        # Check for Fair Value Gaps (FVG) if available
+        fvg_bottom = get('nearest_bullish_fvg_bottom')
+        if fvg_bottom is None:
+            fvg_bottom = _fvg_edge(df, get('nearest_bullish_fvg'), 'fvg_bottom')
+        # If price is close to the FVG bottom (potential support)
+        if not pd.isna(fvg_bottom) and abs(close - fvg_bottom) / close < 0.01:  # Within 1%
+            long_signals += 1
+            long_weight += 1
+
+        fvg_top = get('nearest_bearish_fvg_top')
+        if fvg_top is None:
+            fvg_top = _fvg_edge(df, get('nearest_bearish_fvg'), 'fvg_top')
+        # If price is close to the FVG top (potential resistance)
+        if not pd.isna(fvg_top) and abs(close - fvg_top) / close < 0.01:  # Within 1%
+            short_signals += 1
+            short_weight += 1
 
     # Determine final signal based on signal strength and weights
     # Make conditions much more flexible to generate more trading signals
 
-    # Check for MACD signals (high priority)
-    macd_cross_up = 'macd_cross_up' in latest and latest['macd_cross_up']
-    macd_cross_down = 'macd_cross_down' in latest and latest['macd_cross_down']
-    macd_zero_cross_up = 'macd_zero_cross_up' in latest and latest['macd_zero_cross_up']
-    macd_zero_cross_down = 'macd_zero_cross_down' in latest and latest['macd_zero_cross_down']
-
     # Check for RSI signals
-    rsi_oversold = 'rsi' in latest and latest['rsi'] < config.RSI_OVERSOLD + 5  # Add 5 to make it less strict
-    rsi_overbought = 'rsi' in latest and latest['rsi'] > config.RSI_OVERBOUGHT - 5  # Subtract 5 to make it less strict
-
-    # Check for Bollinger Band signals
-    bb_breakout_up = 'bb_breakout_up' in latest and latest['bb_breakout_up']
-    bb_breakout_down = 'bb_breakout_down' in latest and latest['bb_breakout_down']
-    bb_approaching_upper = 'bb_approaching_upper' in latest and latest['bb_approaching_upper']
-    bb_approaching_lower = 'bb_approaching_lower' in latest and latest['bb_approaching_lower']
-    bb_bounce_up = 'bb_bounce_up' in latest and latest['bb_bounce_up']
-    bb_bounce_down = 'bb_bounce_down' in latest and latest['bb_bounce_down']
-    bb_mean_reversion_up = 'bb_mean_reversion_up' in latest and latest['bb_mean_reversion_up']
-    bb_mean_reversion_down = 'bb_mean_reversion_down' in latest and latest['bb_mean_reversion_down']
-    bb_squeeze = 'bb_squeeze' in latest and latest['bb_squeeze']
-
-    # Check for EMA signals
-    ema_cross_up = 'ema_cross_up' in latest and latest['ema_cross_up']
-    ema_cross_down = 'ema_cross_down' in latest and latest['ema_cross_down']
+    rsi_oversold = rsi < rsi_oversold_level + 5  # Add 5 to make it less strict
+    rsi_overbought = rsi > rsi_overbought_level - 5  # Subtract 5 to make it less strict
 
-    # Check for candle patterns
-    green_candle = 'is_green' in latest and latest['is_green']
-    red_candle = 'is_red' in latest and latest['is_red']
+    # Candle direction from the raw prices
+    close_above_open = close > latest['open']
+    close_below_open = close < latest['open']
 
-    # Define more flexible entry conditions
+    # Define more flexible entry conditions. Each chain short-circuits on the
+    # first matching condition; combinations such as rsi_oversold and
+    # ema_cross_up are already covered by their individual terms.
 
     # LONG signals (any of these conditions can trigger a LONG entry)
-    long_conditions = [
+    if (
         # MACD conditions
-        macd_cross_up,
-        macd_zero_cross_up,
-
-        # RSI conditions with candle confirmation
-        rsi_oversold and green_candle,
-
+        macd_cross_up
+        or macd_zero_cross_up
+        # EMA conditions
+        or ema_cross_up
         # Bollinger Band conditions
-        bb_breakout_up and green_candle,
-        bb_bounce_up,
-        bb_mean_reversion_up,
-        bb_approaching_lower and green_candle,
-        bb_squeeze and green_candle and (latest['close'] > latest['open']),
+        or bb_bounce_up
+        or bb_mean_reversion_up
+        or (green_candle and (
+            # RSI conditions with candle confirmation
+            rsi_oversold
+            or bb_breakout_up
+            or bb_approaching_lower
+            or (bb_squeeze and close_above_open)
+            # Weight-based condition
+            or (long_signals >= 1 and long_weight > short_weight)
+        ))
+    ):
+        return 'LONG'
 
+    # SHORT signals (any of these conditions can trigger a SHORT entry)
+    if (
+        # MACD conditions
+        macd_cross_down
+        or macd_zero_cross_down
         # EMA conditions
-        ema_cross_up,
+        or ema_cross_down
+        # Bollinger Band conditions
+        or bb_bounce_down
+        or bb_mean_reversion_down
+        or (red_candle and (
+            # RSI conditions with candle confirmation
+            rsi_overbought
+            or bb_breakout_down
+            or bb_approaching_upper
+            or (bb_squeeze and close_below_open)
+            # Weight-based condition
+            or (short_signals >= 1 and short_weight > long_weight)
+        ))
+    ):
+        return 'SHORT'
+
+    return None
 
-        # Combined conditions
-        rsi_oversold and ema_cross_up,
-        rsi_oversold and macd_zero_cross_up,
-        bb_bounce_up and rsi_oversold,
-        bb_mean_reversion_up and macd_zero_cross_up,
+def _column(df, name, default, dtype):
+    """
+    Column of df as an array, or a constant array if the column is missing
 
-        # Weight-based condition
-        long_signals >= 1 and long_weight > short_weight and green_candle
-    ]
+    Args:
+        df: DataFrame
+        name: Column name
+        default: Fill value when the column is missing
+        dtype: Array dtype
 
-    # SHORT signals (any of these conditions can trigger a SHORT entry)
-    short_conditions = [
-        # MACD conditions
-        macd_cross_down,
-        macd_zero_cross_down,
+    Returns:
+        1-D array of len(df)
+    """
+    if name in df.columns:
+        return df[name].to_numpy(dtype=dtype)
+    return np.full(len(df), default, dtype=dtype)
 
-        # RSI conditions with candle confirmation
-        rsi_overbought and red_candle,
+def _fvg_edges(df, index_column, edge_column):
+    """
+    Edge price of the nearest FVG for every bar
 
-        # Bollinger Band conditions
-        bb_breakout_down and red_candle,
-        bb_bounce_down,
-        bb_mean_reversion_down,
-        bb_approaching_upper and red_candle,
-        bb_squeeze and red_candle and (latest['close'] < latest['open']),
+    Reads the materialized nearest_*_fvg_bottom/top column when present and
+    otherwise looks the edge up through the nearest_*_fvg index column.
 
-        # EMA conditions
-        ema_cross_down,
+    Args:
+        df: DataFrame with FVG data
+        index_column: 'nearest_bullish_fvg' or 'nearest_bearish_fvg'
+        edge_column: 'fvg_bottom' or 'fvg_top'
+
+    Returns:
+        Float array, NaN where there is no FVG
+    """
+    materialized = f'{index_column}_{edge_column[4:]}'
+    if materialized in df.columns:
+        return df[materialized].to_numpy(dtype=np.float64)
+    if index_column not in df.columns or edge_column not in df.columns:
+        return np.full(len(df), np.nan)
+    edges = df[edge_column]
+    labels = df[index_column]
+    found = labels.notna() & labels.isin(edges.index)
+    out = np.full(len(df), np.nan)
+    out[found.to_numpy()] = edges.loc[labels[found]].to_numpy(dtype=np.float64)
+    return out
+
+def check_entry_signals(df, use_smc=True):
+    """
+    Evaluate check_entry_signal for every bar of df at once
 
-        # Combined conditions
-        rsi_overbought and ema_cross_down,
-        rsi_overbought and macd_zero_cross_down,
-        bb_bounce_down and rsi_overbought,
-        bb_mean_reversion_down and macd_zero_cross_down,
+    Bar i gets the signal check_entry_signal would return for df.iloc[:i+1],
+    so a backtest can score the whole history in one vectorized pass instead
+    of slicing the frame on every candle.
 
-        # Weight-based condition
-        short_signals >= 1 and short_weight > long_weight and red_candle
-    ]
+    Args:
+        df: DataFrame with OHLC and indicator data
+        use_smc: Whether to use Smart Money Concept indicators
 
-    # Return signal based on conditions
-    if any(long_conditions):
-        return 'LONG'
-    elif any(short_conditions):
-        return 'SHORT'
-    else:
-        return None
+    Returns:
+        Object array of 'LONG', 'SHORT' or None per bar
+    """
+    n = len(df)
+    rsi_oversold_level = config.RSI_OVERSOLD
+    rsi_overbought_level = config.RSI_OVERBOUGHT
+
+    close = df['close'].to_numpy(dtype=np.float64)
+    open_ = df['open'].to_numpy(dtype=np.float64)
+    rsi = df['rsi'].to_numpy(dtype=np.float64)
+
+    # Signal bits from the packed column, or from the individual columns
+    flags = pack_signal_flags(df)
+    if 'signal_flags' in df.columns:
+        packed = df['signal_flags']
+        present = packed.notna().to_numpy()
+        flags[present] = packed[present].to_numpy(dtype=np.uint32)
+
+    def bit(name):
+        return (flags & SIGNAL_FLAGS[name]) != 0
+
+    macd_cross_up, macd_cross_down = bit('macd_cross_up'), bit('macd_cross_down')
+    macd_zero_cross_up, macd_zero_cross_down = bit('macd_zero_cross_up'), bit('macd_zero_cross_down')
+    green_candle, red_candle = bit('is_green'), bit('is_red')
+    ema_cross_up, ema_cross_down = bit('ema_cross_up'), bit('ema_cross_down')
+
+    # Accumulate signal counts and weights for every bar
+    long_signals = np.zeros(n, dtype=np.int8)
+    short_signals = np.zeros(n, dtype=np.int8)
+    long_weight = np.zeros(n)
+    short_weight = np.zeros(n)
+
+    def weigh(long_hit, short_hit, weight):
+        # The long side wins when both fire, like the if/elif chain
+        short_hit = short_hit & ~long_hit
+        long_signals[long_hit] += 1
+        long_weight[long_hit] += weight
+        short_signals[short_hit] += 1
+        short_weight[short_hit] += weight
+
+    weigh(macd_cross_up, macd_cross_down, 2)
+    weigh(bit('macd_bullish_divergence'), bit('macd_bearish_divergence'), 1.5)
+    weigh(macd_zero_cross_up, macd_zero_cross_down, 1)
+    weigh((rsi < rsi_oversold_level) & green_candle, (rsi > rsi_overbought_level) & red_candle, 1)
+    weigh(ema_cross_up, ema_cross_down, 1)
+    weigh(bit('bb_breakout_up'), bit('bb_breakout_down'), 1)
+
+    if use_smc:
+        if 'market_structure_code' in df.columns:
+            structure = df['market_structure_code'].to_numpy(dtype=np.int8)
+        elif 'market_structure' in df.columns:
+            structure = df['market_structure'].map(MARKET_STRUCTURE_CODES).fillna(0).to_numpy(dtype=np.int8)
+        else:
+            structure = np.zeros(n, dtype=np.int8)
+        weigh(structure > 0, structure < 0, 1.5)
+        weigh(_column(df, 'bos_bullish', False, bool), _column(df, 'bos_bearish', False, bool), 1.5)
+
+        # Price within 1% of the nearest FVG edge; the two sides are independent
+        with np.errstate(invalid='ignore'):
+            near_bottom = np.abs(close - _fvg_edges(df, 'nearest_bullish_fvg', 'fvg_bottom')) / close < 0.01
+            near_top = np.abs(close - _fvg_edges(df, 'nearest_bearish_fvg', 'fvg_top')) / close < 0.01
+        weigh(near_bottom, np.zeros(n, dtype=bool), 1)
+        weigh(np.zeros(n, dtype=bool), near_top, 1)
+
+    bb_squeeze = bit('bb_squeeze')
+    long_entry = (
+        macd_cross_up | macd_zero_cross_up | ema_cross_up
+        | bit('bb_bounce_up') | bit('bb_mean_reversion_up')
+        | (green_candle & (
+            (rsi < rsi_oversold_level + 5)
+            | bit('bb_breakout_up')
+            | bit('bb_approaching_lower')
+            | (bb_squeeze & (close > open_))
+            | ((long_signals >= 1) & (long_weight > short_weight))
+        ))
+    )
+    short_entry = (
+        macd_cross_down | macd_zero_cross_down | ema_cross_down
+        | bit('bb_bounce_down') | bit('bb_mean_reversion_down')
+        | (red_candle & (
+            (rsi > rsi_overbought_level - 5)
+            | bit('bb_breakout_down')
+            | bit('bb_approaching_upper')
+            | (bb_squeeze & (close < open_))
+            | ((short_signals >= 1) & (short_weight > long_weight))
+        ))
+    )
+
+    signals = np.full(n, None, dtype=object)
+    signals[short_entry] = 'SHORT'
+    signals[long_entry] = 'LONG'
+    return signals
@@ -0,0 +1,48 @@
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Listener that writes queued records out on a background thread
+_listener = None
+
+def setup_logging(path=None, level=logging.INFO):
+    """
+    Configure root logging through a queue so handlers run off the calling thread
+
+    Records are pushed onto an in-memory queue by a QueueHandler and written
+    to the console (and optionally a file) by a QueueListener thread.
+
+    Args:
+        path: Optional log file path
+        level: Root logging level
+
+    Returns:
+        The running QueueListener
+    """
+    global _listener
+
+    if _listener is not None:
+        return _listener
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.StreamHandler()]
+    if path:
+        handlers.append(logging.FileHandler(path))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(-1)
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(QueueHandler(log_queue))
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    # Flush any pending records when the process exits
+    atexit.register(_listener.stop)
+
+    return _listener
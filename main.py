@@ -1,8 +1,6 @@
 import logging
-import time
 import os
 import threading
-from dotenv import load_dotenv
 
 import config
 from bot import BotManager
@@ -20,12 +18,14 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+PAIR_UPDATE_INTERVAL = 4 * 3600  # Update trading pairs every 4 hours
+
 def check_environment():
     """
     Check if environment variables are set
     """
-    # Load environment variables
-    load_dotenv()
+    # Load environment variables (shared with config, so .env is only read once)
+    config.load_env()
 
     # Check required environment variables
     required_vars = ['BINANCE_API_KEY', 'BINANCE_API_SECRET']
@@ -46,6 +46,27 @@ def check_environment():
 
     return True
 
+def run_loop(manager, update_enabled, stop_event=None):
+    """
+    Block the main thread, updating trading pairs every PAIR_UPDATE_INTERVAL
+
+    The thread sleeps until the next update is due (or until stop_event is
+    set) instead of waking up every minute to compare timestamps.
+
+    Args:
+        manager: BotManager or GridTradingManager
+        update_enabled: Whether to call manager.update_trading_pairs()
+        stop_event: threading.Event that ends the loop when set
+    """
+    stop_event = stop_event or threading.Event()
+
+    if not update_enabled:
+        stop_event.wait()
+        return
+
+    while not stop_event.wait(timeout=PAIR_UPDATE_INTERVAL):
+        manager.update_trading_pairs()
+
 def main():
     """
     Main entry point
@@ -84,19 +105,9 @@ def main():
 
     # Keep the main thread alive and update trading pairs periodically
     try:
-        last_update_time = time.time()
-        update_interval = 4 * 3600  # Update trading pairs every 4 hours
-
-        while True:
-            current_time = time.time()
-
-            # Update trading pairs periodically if enabled (only for signal trading)
-            if not config.GRID_TRADING_ENABLED and config.USE_HIGH_VOLUME_PAIRS and (current_time - last_update_time) >= update_interval:
-                manager.update_trading_pairs()
-                last_update_time = current_time
-
-            time.sleep(60)  # Check every minute
-
+        # Update trading pairs periodically if enabled (only for signal trading)
+        update_enabled = not config.GRID_TRADING_ENABLED and config.USE_HIGH_VOLUME_PAIRS
+        run_loop(manager, update_enabled)
     except KeyboardInterrupt:
         logger.info("Bot stopped by user")
 
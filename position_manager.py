@@ -1,8 +1,149 @@
+import logging
+from contextlib import contextmanager
+from operator import itemgetter
+import numpy as np
+import requests
 import config
+from binance_client import BinanceAPIError, is_zero_amount, positions_to_array
+
+logger = logging.getLogger(__name__)
+
+# (pnl_info key, position side, hedge side) in the order positions are checked
+HEDGE_CHECKS = (
+    ('long_position', 'LONG', 'SHORT'),
+    ('short_position', 'SHORT', 'LONG'),
+)
+
+# Failed API lookups that are logged and treated as missing data: API errors,
+# transport errors, and response bodies that aren't valid JSON
+API_ERRORS = (BinanceAPIError, requests.RequestException, ValueError)
+
+# Side and amount of a position entry, read in one C-level call
+_side_and_amount = itemgetter('positionSide', 'positionAmt')
+
+# Minimum notional value required by Binance
+MIN_NOTIONAL_VALUE = 5.0  # 5 USDT minimum
+
+def size_position(price, balance, position_percent, margin_percentage, leverage,
+                  min_notional=MIN_NOTIONAL_VALUE):
+    """
+    Size a position from plain numbers, without API calls or logging
+
+    Args:
+        price: Current market price
+        balance: Total wallet balance
+        position_percent: Percentage of the balance to commit
+        margin_percentage: Margin percentage for the leverage
+        leverage: Leverage to use
+        min_notional: Minimum notional value of an order
+
+    Returns:
+        Tuple (quantity, min_quantity, min_balance_needed). min_quantity is
+        None when quantity already meets min_notional; otherwise it is the
+        quantity that does, and min_balance_needed is the balance it takes
+    """
+    position_size_usdt = balance * (position_percent / 100)
+    margin_amount = position_size_usdt * (margin_percentage / 100)
+    quantity = margin_amount * leverage / price
+
+    if quantity * price >= min_notional:
+        return quantity, None, 0.0
+
+    # The balance that reaches min_notional doesn't depend on the price
+    min_quantity = min_notional / price
+    min_balance_needed = min_notional * 10000 / (leverage * margin_percentage * position_percent)
+    return quantity, min_quantity, min_balance_needed
+
+def size_positions(prices, balance, position_percent, margin_percentage, leverage,
+                   min_notional=MIN_NOTIONAL_VALUE):
+    """
+    Size positions for many prices at once, as size_position does for one
+
+    Args:
+        prices: Array of current market prices
+        balance: Total wallet balance
+        position_percent: Percentage of the balance to commit
+        margin_percentage: Margin percentage for the leverage (scalar or per price)
+        leverage: Leverage to use (scalar or per price)
+        min_notional: Minimum notional value of an order
+
+    Returns:
+        Tuple (quantities, adjusted, min_balance_needed) of arrays. quantities
+        are already raised to min_notional where adjusted is True, and
+        min_balance_needed is the balance that takes (0 where not adjusted)
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    position_size_usdt = balance * (position_percent / 100)
+    margin_amount = position_size_usdt * (margin_percentage / 100)
+    quantities = margin_amount * leverage / prices
+
+    adjusted = quantities * prices < min_notional
+    min_quantities = min_notional / prices
+    min_balance_needed = np.where(adjusted, min_notional * 10000 / (leverage * margin_percentage * position_percent), 0.0)
+
+    return np.where(adjusted, min_quantities, quantities), adjusted, min_balance_needed
+
+def tp_sl_prices(entry_prices, signs):
+    """
+    Calculate unrounded take profit and stop loss prices
+
+    TP is above entry for LONG positions and below it for SHORT positions;
+    SL is the other way around.
+
+    Args:
+        entry_prices: Entry price or array of entry prices
+        signs: 1.0 for LONG and -1.0 for SHORT, scalar or array
+
+    Returns:
+        Tuple (tp_prices, sl_prices) matching the shape of the inputs
+    """
+    tp_prices = entry_prices * (1 + signs * config.TAKE_PROFIT_PERCENT / 100)
+    sl_prices = entry_prices * (1 - signs * config.STOP_LOSS_PERCENT / 100)
+    return tp_prices, sl_prices
 
 class PositionManager:
     def __init__(self, binance_client):
         self.client = binance_client
+        self._tick_cache = None  # Account lookups shared within one decision tick
+
+    @contextmanager
+    def decision_tick(self):
+        """
+        Share account and position lookups for the duration of one decision
+
+        Inside the block, repeated balance and position queries reuse the
+        first response instead of calling the API again.
+        """
+        self._tick_cache = {}
+        try:
+            yield self
+        finally:
+            self._tick_cache = None
+
+    def invalidate_tick_cache(self):
+        """
+        Drop account data cached in the current decision tick, e.g. after an order
+        """
+        if self._tick_cache is not None:
+            self._tick_cache.clear()
+
+    def _tick_cached(self, key, fetch):
+        """
+        Return fetch(), reusing the result within the current decision tick
+
+        Args:
+            key: Cache key for the lookup
+            fetch: Function performing the API call
+
+        Returns:
+            The (possibly cached) API response
+        """
+        cache = self._tick_cache
+        if cache is None:
+            return fetch()
+        if key not in cache:
+            cache[key] = fetch()
+        return cache[key]
 
     def get_total_position_value(self):
         """
@@ -13,23 +154,15 @@ class PositionManager:
         """
         try:
             # Get all open positions
-            positions = self.client.get_open_positions()
-
-            # Calculate total position value
-            total_value = 0.0
-            for position in positions:
-                position_amt = abs(float(position['positionAmt']))
-                entry_price = float(position['entryPrice'])
-                position_value = position_amt * entry_price
-                total_value += position_value
-
-            return total_value
-
-        except Exception as e:
-            import logging
-            logging.error(f"Error calculating total position value: {str(e)}")
+            positions = self._tick_cached(('open_positions', None), self.client.get_open_positions)
+        except API_ERRORS as e:
+            logger.error(f"Error calculating total position value: {str(e)}")
             return 0.0
 
+        # Calculate total position value as |amount| . entry price
+        positions = self._tick_cached(('position_array', None), lambda: positions_to_array(positions))
+        return float(np.abs(positions['amount']) @ positions['entry_price'])
+
     def get_account_balance(self):
         """
         Get total wallet balance
@@ -38,21 +171,25 @@ class PositionManager:
             Total wallet balance in USDT
         """
         try:
-            account_info = self.client.get_account_info()
-            return float(account_info['totalWalletBalance'])
-        except Exception as e:
-            import logging
-            logging.error(f"Error getting account balance: {str(e)}")
+            account_info = self._tick_cached(('account_info',), self.client.get_account_info)
+        except API_ERRORS as e:
+            logger.error(f"Error getting account balance: {str(e)}")
             return 0.0
 
-    def get_account_usage_percentage(self):
+        return float(account_info['totalWalletBalance'])
+
+    def get_account_usage_percentage(self, balance=None):
         """
         Calculate current account usage as a percentage
 
+        Args:
+            balance: Total wallet balance if already fetched (fetched if None)
+
         Returns:
             Percentage of account balance used by open positions
         """
-        balance = self.get_account_balance()
+        if balance is None:
+            balance = self.get_account_balance()
         if balance <= 0:
             return 0.0
 
@@ -89,73 +226,105 @@ class PositionManager:
         Returns:
             Rounded position size
         """
-        import logging
-
         symbol = symbol or config.SYMBOL
         leverage = leverage or config.LEVERAGE
 
-        # Minimum notional value required by Binance
-        MIN_NOTIONAL_VALUE = 5.0  # 5 USDT minimum
+        # Read the sizing settings once
+        max_account_usage = config.MAX_ACCOUNT_USAGE
+        position_size_percent = config.POSITION_SIZE_PERCENT
 
         # Get account balance
         total_balance = self.get_account_balance()
         if total_balance <= 0:
-            logging.warning(f"Account balance is zero or negative: {total_balance}")
+            logger.warning(f"Account balance is zero or negative: {total_balance}")
             return 0
 
         # Check current account usage
-        current_usage_percent = self.get_account_usage_percentage()
-        logging.info(f"Current account usage: {current_usage_percent:.2f}% of {total_balance:.2f} USDT")
+        current_usage_percent = self.get_account_usage_percentage(total_balance)
+        log_info = logger.isEnabledFor(logging.INFO)
+        if log_info:
+            logger.info(f"Current account usage: {current_usage_percent:.2f}% of {total_balance:.2f} USDT")
 
         # Calculate available balance percentage
-        available_percent = max(0, config.MAX_ACCOUNT_USAGE - current_usage_percent)
+        available_percent = max(0, max_account_usage - current_usage_percent)
 
         # If we've reached the maximum account usage, return 0
         if available_percent <= 0:
-            logging.warning(f"Maximum account usage reached ({config.MAX_ACCOUNT_USAGE}%). Cannot open new positions.")
+            logger.warning(f"Maximum account usage reached ({max_account_usage}%). Cannot open new positions.")
             return 0
 
         # Calculate maximum position size based on available balance percentage
-        max_position_percent = min(config.POSITION_SIZE_PERCENT, available_percent)
+        max_position_percent = min(position_size_percent, available_percent)
 
-        # Calculate position size based on percentage of account balance
-        position_size_usdt = total_balance * (max_position_percent / 100)
-
-        # Calculate margin amount based on margin percentage
+        # Size the position from the fetched numbers
         margin_percentage = config.get_margin_percentage(leverage)
-        margin_amount = position_size_usdt * (margin_percentage / 100)
-
-        # Calculate effective position size with leverage
-        effective_position_size = margin_amount * leverage
+        quantity, min_quantity, min_balance_needed = size_position(
+            price, total_balance, max_position_percent, margin_percentage, leverage
+        )
 
-        # Calculate quantity
-        quantity = effective_position_size / price
-
-        # Check if notional value meets minimum requirement
-        notional_value = quantity * price
-
-        if notional_value < MIN_NOTIONAL_VALUE:
-            logging.warning(f"Calculated notional value ({notional_value:.2f} USDT) is less than minimum required ({MIN_NOTIONAL_VALUE} USDT)")
-
-            # Adjust quantity to meet minimum notional value
-            min_quantity = MIN_NOTIONAL_VALUE / price
+        # Adjust quantity to meet minimum notional value
+        if min_quantity is not None:
+            logger.warning(f"Calculated notional value ({quantity * price:.2f} USDT) is less than minimum required ({MIN_NOTIONAL_VALUE} USDT)")
 
             # If the minimum quantity would exceed our available balance, we can't place the order
-            min_quantity_value = min_quantity * price / leverage * (100 / margin_percentage)
-            min_balance_needed = min_quantity_value * 100 / max_position_percent
-
             if min_balance_needed > total_balance:
-                logging.warning(f"Insufficient balance ({total_balance:.2f} USDT) to meet minimum notional value. Need at least {min_balance_needed:.2f} USDT.")
+                logger.warning(f"Insufficient balance ({total_balance:.2f} USDT) to meet minimum notional value. Need at least {min_balance_needed:.2f} USDT.")
                 return 0
 
-            logging.info(f"Adjusting quantity from {quantity} to {min_quantity} to meet minimum notional value")
+            if log_info:
+                logger.info(f"Adjusting quantity from {quantity} to {min_quantity} to meet minimum notional value")
             quantity = min_quantity
 
-        logging.info(f"Calculated position size for {symbol}: {quantity} (value: {quantity * price:.2f} USDT, {max_position_percent:.2f}% of balance)")
+        if log_info:
+            logger.info(f"Calculated position size for {symbol}: {quantity} (value: {quantity * price:.2f} USDT, {max_position_percent:.2f}% of balance)")
 
         # Round according to symbol precision
         return self.client.round_quantity(quantity)
 
+    def calculate_position_sizes(self, prices, leverage=None):
+        """
+        Calculate position sizes for several symbols from one balance lookup
+
+        Applies the same usage limit and minimum notional rules as
+        calculate_position_size to every price.
+
+        Args:
+            prices: Array of current market prices
+            leverage: Leverage to use (default from config)
+
+        Returns:
+            Float array of unrounded quantities, 0 where no position can be
+            opened; round them with the precision of each symbol before
+            placing orders
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        leverage = leverage or config.LEVERAGE
+        max_account_usage = config.MAX_ACCOUNT_USAGE
+
+        total_balance = self.get_account_balance()
+        if total_balance <= 0:
+            logger.warning(f"Account balance is zero or negative: {total_balance}")
+            return np.zeros_like(prices)
+
+        current_usage_percent = self.get_account_usage_percentage(total_balance)
+        available_percent = max(0, max_account_usage - current_usage_percent)
+        if available_percent <= 0:
+            logger.warning(f"Maximum account usage reached ({max_account_usage}%). Cannot open new positions.")
+            return np.zeros_like(prices)
+
+        max_position_percent = min(config.POSITION_SIZE_PERCENT, available_percent)
+        quantities, _, min_balance_needed = size_positions(
+            prices, total_balance, max_position_percent, config.get_margin_percentage(leverage), leverage
+        )
+
+        # Positions that can't reach the minimum notional value are skipped
+        insufficient = min_balance_needed > total_balance
+        if insufficient.any():
+            logger.warning(f"Insufficient balance ({total_balance:.2f} USDT) to meet minimum notional value for {int(insufficient.sum())} of {len(prices)} prices")
+            quantities[insufficient] = 0.0
+
+        return quantities
+
     def calculate_take_profit_price(self, entry_price, position_side):
         """
         Calculate take profit price
@@ -167,12 +336,7 @@ class PositionManager:
         Returns:
             Rounded take profit price
         """
-        if position_side == 'LONG':
-            # For LONG positions, TP is above entry price
-            tp_price = entry_price * (1 + config.TAKE_PROFIT_PERCENT / 100)
-        else:
-            # For SHORT positions, TP is below entry price
-            tp_price = entry_price * (1 - config.TAKE_PROFIT_PERCENT / 100)
+        tp_price, _ = tp_sl_prices(entry_price, 1.0 if position_side == 'LONG' else -1.0)
 
         # Round according to symbol precision
         return self.client.round_price(tp_price)
@@ -188,16 +352,27 @@ class PositionManager:
         Returns:
             Rounded stop loss price
         """
-        if position_side == 'LONG':
-            # For LONG positions, SL is below entry price
-            sl_price = entry_price * (1 - config.STOP_LOSS_PERCENT / 100)
-        else:
-            # For SHORT positions, SL is above entry price
-            sl_price = entry_price * (1 + config.STOP_LOSS_PERCENT / 100)
+        _, sl_price = tp_sl_prices(entry_price, 1.0 if position_side == 'LONG' else -1.0)
 
         # Round according to symbol precision
         return self.client.round_price(sl_price)
 
+    def calculate_tp_sl_batch(self, entry_prices, position_sides):
+        """
+        Calculate take profit and stop loss prices for many positions at once
+
+        Args:
+            entry_prices: Array of entry prices
+            position_sides: Array of 'LONG' / 'SHORT' values
+
+        Returns:
+            Tuple (tp_prices, sl_prices) of unrounded float arrays; round them
+            with the precision of each position's symbol before placing orders
+        """
+        entry_prices = np.asarray(entry_prices, dtype=np.float64)
+        signs = np.where(np.asarray(position_sides) == 'LONG', 1.0, -1.0)
+        return tp_sl_prices(entry_prices, signs)
+
     def has_open_position(self, position_side, symbol=None):
         """
         Check if there is an open position for the given side
@@ -211,16 +386,44 @@ class PositionManager:
         """
         symbol = symbol or config.SYMBOL
 
-        # Get open positions
-        positions = self.client.get_open_positions(symbol)
+        return (symbol, position_side) in self._position_index(symbol)
+
+    def _position_index(self, symbol):
+        """
+        Index the non-zero open positions of a symbol by (symbol, side)
+
+        The index is built once per decision tick and shared by every
+        has_open_position call in it.
 
-        # Check if there's an open position for the given side
-        for position in positions:
-            if (position['positionSide'] == position_side and
-                float(position['positionAmt']) != 0):
-                return True
+        Args:
+            symbol: Trading symbol
+
+        Returns:
+            Dictionary mapping (symbol, position side) to position amount
+        """
+        def build():
+            positions = self._tick_cached(('open_positions', symbol), lambda: self.client.get_open_positions(symbol))
+            index = {}
+            for position in positions:
+                position_side, position_amt = _side_and_amount(position)
+                if not is_zero_amount(position_amt):
+                    index[(position.get('symbol', symbol), position_side)] = float(position_amt)
+            return index
 
-        return False
+        return self._tick_cached(('position_index', symbol), build)
+
+    def _open_sides(self, symbol):
+        """
+        Get the sides that hold a non-zero position for a symbol
+
+        Args:
+            symbol: Trading symbol
+
+        Returns:
+            Frozenset of position sides, e.g. frozenset({'LONG', 'SHORT'})
+        """
+        return frozenset(side for (position_symbol, side) in self._position_index(symbol)
+                         if position_symbol == symbol)
 
     def can_enter_position(self, position_side, symbol=None):
         """
@@ -234,28 +437,20 @@ class PositionManager:
             Boolean indicating if we can enter the position
         """
         symbol = symbol or config.SYMBOL
+        hedge_mode = config.HEDGE_MODE
+        allow_both_positions = config.ALLOW_BOTH_POSITIONS
 
         # If hedge mode is enabled and we allow both positions, we can always enter
-        if config.HEDGE_MODE and config.ALLOW_BOTH_POSITIONS:
+        if hedge_mode and allow_both_positions:
             return True
 
-        # If we already have a position on this side, we can't enter
-        if self.has_open_position(position_side, symbol):
-            return False
-
-        # If hedge mode is disabled, check if we have a position on the opposite side
-        if not config.HEDGE_MODE:
-            opposite_side = 'SHORT' if position_side == 'LONG' else 'LONG'
-            if self.has_open_position(opposite_side, symbol):
-                return False
-
-        # If we don't allow both positions, check if we have a position on the opposite side
-        if not config.ALLOW_BOTH_POSITIONS:
-            opposite_side = 'SHORT' if position_side == 'LONG' else 'LONG'
-            if self.has_open_position(opposite_side, symbol):
-                return False
+        # One lookup covers both sides. Past the early return above, either
+        # hedge mode is off or both positions are disallowed, so an open
+        # position on the opposite side blocks entry as well.
+        sides = self._open_sides(symbol)
+        opposite_side = 'SHORT' if position_side == 'LONG' else 'LONG'
 
-        return True
+        return position_side not in sides and opposite_side not in sides
 
     def should_hedge_position(self, symbol=None):
         """
@@ -267,8 +462,6 @@ class PositionManager:
         Returns:
             Tuple (should_hedge, position_side_to_hedge, pnl_info)
         """
-        import logging
-
         if not config.AUTO_HEDGE:
             return False, None, None
 
@@ -281,33 +474,23 @@ class PositionManager:
         if pnl_info['is_hedged']:
             return False, None, pnl_info
 
-        # Check if we have a LONG position that needs hedging
-        if pnl_info['long_position'] and pnl_info['long_position']['position_amt'] != 0:
-            pnl_percent = pnl_info['long_position']['unrealized_pnl_percent']
-
-            # If profit exceeds threshold, hedge with a SHORT position
-            if pnl_percent >= config.AUTO_HEDGE_PROFIT_THRESHOLD:
-                logging.info(f"LONG position profit ({pnl_percent:.2f}%) exceeds threshold ({config.AUTO_HEDGE_PROFIT_THRESHOLD}%). Hedging with SHORT position.")
-                return True, 'SHORT', pnl_info
+        profit_threshold = config.AUTO_HEDGE_PROFIT_THRESHOLD
+        loss_threshold = config.AUTO_HEDGE_LOSS_THRESHOLD
 
-            # If loss exceeds threshold, hedge with a SHORT position
-            if pnl_percent <= -config.AUTO_HEDGE_LOSS_THRESHOLD:
-                logging.info(f"LONG position loss ({pnl_percent:.2f}%) exceeds threshold ({config.AUTO_HEDGE_LOSS_THRESHOLD}%). Hedging with SHORT position.")
-                return True, 'SHORT', pnl_info
+        # A position is hedged with the opposite side once its PnL crosses either threshold
+        for position_key, side, hedge_side in HEDGE_CHECKS:
+            position = pnl_info[position_key]
+            if not position or position['position_amt'] == 0:
+                continue
 
-        # Check if we have a SHORT position that needs hedging
-        if pnl_info['short_position'] and pnl_info['short_position']['position_amt'] != 0:
-            pnl_percent = pnl_info['short_position']['unrealized_pnl_percent']
+            pnl_percent = position['unrealized_pnl_percent']
+            if pnl_percent >= profit_threshold:
+                logger.info(f"{side} position profit ({pnl_percent:.2f}%) exceeds threshold ({profit_threshold}%). Hedging with {hedge_side} position.")
+                return True, hedge_side, pnl_info
 
-            # If profit exceeds threshold, hedge with a LONG position
-            if pnl_percent >= config.AUTO_HEDGE_PROFIT_THRESHOLD:
-                logging.info(f"SHORT position profit ({pnl_percent:.2f}%) exceeds threshold ({config.AUTO_HEDGE_PROFIT_THRESHOLD}%). Hedging with LONG position.")
-                return True, 'LONG', pnl_info
-
-            # If loss exceeds threshold, hedge with a LONG position
-            if pnl_percent <= -config.AUTO_HEDGE_LOSS_THRESHOLD:
-                logging.info(f"SHORT position loss ({pnl_percent:.2f}%) exceeds threshold ({config.AUTO_HEDGE_LOSS_THRESHOLD}%). Hedging with LONG position.")
-                return True, 'LONG', pnl_info
+            if pnl_percent <= -loss_threshold:
+                logger.info(f"{side} position loss ({pnl_percent:.2f}%) exceeds threshold ({loss_threshold}%). Hedging with {hedge_side} position.")
+                return True, hedge_side, pnl_info
 
         return False, None, pnl_info
 
@@ -322,8 +505,6 @@ class PositionManager:
         Returns:
             Hedge position size
         """
-        import logging
-
         symbol = symbol or config.SYMBOL
 
         # Minimum notional value required by Binance
@@ -342,22 +523,91 @@ class PositionManager:
         notional_value = hedge_position_size * current_price
 
         if notional_value < MIN_NOTIONAL_VALUE:
-            logging.warning(f"Calculated hedge notional value ({notional_value:.2f} USDT) is less than minimum required ({MIN_NOTIONAL_VALUE} USDT)")
+            logger.warning(f"Calculated hedge notional value ({notional_value:.2f} USDT) is less than minimum required ({MIN_NOTIONAL_VALUE} USDT)")
 
             # Adjust quantity to meet minimum notional value
             min_quantity = MIN_NOTIONAL_VALUE / current_price
 
             # If the minimum quantity would exceed our original position, cap it
             if min_quantity > original_position_amt:
-                logging.warning(f"Minimum quantity ({min_quantity}) exceeds original position size ({original_position_amt}). Using original position size.")
+                logger.warning(f"Minimum quantity ({min_quantity}) exceeds original position size ({original_position_amt}). Using original position size.")
                 hedge_position_size = original_position_amt
             else:
-                logging.info(f"Adjusting hedge quantity from {hedge_position_size} to {min_quantity} to meet minimum notional value")
+                logger.info(f"Adjusting hedge quantity from {hedge_position_size} to {min_quantity} to meet minimum notional value")
                 hedge_position_size = min_quantity
 
         # Round according to symbol precision
         return self.client.round_quantity(hedge_position_size)
 
+    def _profit_after_fees(self, entry_prices, current_prices, amounts, signs):
+        """
+        Profit of closing positions after the open and close trading fees
+
+        Shared by is_profitable_after_fees, meets_min_profit_after_fees and
+        are_profitable_after_fees so all three apply the same math.
+
+        Args:
+            entry_prices: Array of entry prices
+            current_prices: Array of prices the positions would close at
+            amounts: Array of absolute position amounts
+            signs: Array of 1.0 for LONG and -1.0 for SHORT positions
+
+        Returns:
+            Tuple of arrays (raw_profits, close_fees, open_fees, net_profits,
+            raw_profit_percentages, net_profit_percentages); percentages are
+            of the position value and 0 for empty positions
+        """
+        # Raw profit with the direction taken from the position side
+        raw_profits = signs * (current_prices - entry_prices) * amounts
+
+        # Fees for closing and opening the positions (both as market orders = taker fee)
+        count = len(amounts)
+        fees = self.client.calculate_trading_fees_batch(
+            np.concatenate((amounts, amounts)),
+            np.concatenate((current_prices, entry_prices)),
+            is_market_order=True
+        )
+        close_fees, open_fees = fees[:count], fees[count:]
+        net_profits = raw_profits - (close_fees + open_fees)
+
+        # Raw and net profit percentages of the position value
+        position_values = amounts * entry_prices
+        has_value = position_values > 0
+        raw_profit_percentages = np.divide(raw_profits * 100, position_values, out=np.zeros(count), where=has_value)
+        net_profit_percentages = np.divide(net_profits * 100, position_values, out=np.zeros(count), where=has_value)
+
+        return raw_profits, close_fees, open_fees, net_profits, raw_profit_percentages, net_profit_percentages
+
+    def _single_profit_after_fees(self, position_info, current_price, symbol):
+        """
+        Run _profit_after_fees for one position
+
+        Args:
+            position_info: Dictionary with position information
+            current_price: Current market price (if None, will be fetched)
+            symbol: Trading symbol
+
+        Returns:
+            Tuple (current_price, raw_profit, close_fee, open_fee, net_profit,
+            raw_profit_percentage, net_profit_percentage) of floats, or None
+            if the current price could not be fetched
+        """
+        # Get current price if not provided
+        if current_price is None:
+            try:
+                current_price = self.client.get_current_price(symbol)
+            except API_ERRORS as e:
+                logger.error(f"Error checking if position is profitable after fees: {str(e)}")
+                return None
+
+        results = self._profit_after_fees(
+            np.array([float(position_info['entry_price'])]),
+            np.array([float(current_price)]),
+            np.array([abs(float(position_info['position_amt']))]),
+            np.array([1.0 if position_info['position_side'] == 'LONG' else -1.0])
+        )
+        return (current_price,) + tuple(result.item() for result in results)
+
     def is_profitable_after_fees(self, position_info, current_price=None, symbol=None):
         """
         Check if closing a position would be profitable after considering trading fees
@@ -370,88 +620,95 @@ class PositionManager:
         Returns:
             Tuple (is_profitable, profit_info)
         """
-        import logging
-
         symbol = symbol or config.SYMBOL
 
-        try:
-            # Get position details
-            entry_price = float(position_info['entry_price'])
-            position_amt = abs(float(position_info['position_amt']))
-            position_side = position_info['position_side']
-
-            # Get current price if not provided
-            if current_price is None:
-                current_price = self.client.get_current_price(symbol)
-
-            # Determine if LONG or SHORT
-            is_long = position_side == 'LONG'
-
-            # Calculate raw profit (without fees)
-            if is_long:
-                raw_profit_percentage = ((current_price / entry_price) - 1) * 100
-                raw_profit = (current_price - entry_price) * position_amt
-            else:  # SHORT
-                raw_profit_percentage = ((entry_price / current_price) - 1) * 100
-                raw_profit = (entry_price - current_price) * position_amt
-
-            # Calculate fees for closing the position (market order = taker fee)
-            close_fee_info = self.client.calculate_trading_fees(
-                quantity=position_amt,
-                price=current_price,
-                is_market_order=True
-            )
-
-            # Calculate fees for opening the position (assume it was a market order)
-            open_fee_info = self.client.calculate_trading_fees(
-                quantity=position_amt,
-                price=entry_price,
-                is_market_order=True
-            )
+        # Get position details
+        entry_price = float(position_info['entry_price'])
+        position_amt = abs(float(position_info['position_amt']))
+        position_side = position_info['position_side']
 
-            # Calculate total fees
-            total_fees = close_fee_info['fee_amount'] + open_fee_info['fee_amount']
-
-            # Calculate net profit after fees
-            net_profit = raw_profit - total_fees
-
-            # Calculate net profit percentage
-            position_value = position_amt * entry_price
-            net_profit_percentage = (net_profit / position_value) * 100 if position_value > 0 else 0
-
-            # Determine if profitable after fees
-            is_profitable = net_profit > 0
-
-            # Check if profit meets minimum threshold
-            meets_min_profit = net_profit_percentage >= config.MIN_PROFIT_AFTER_FEES
-
-            # Create profit info dictionary
-            profit_info = {
-                'position_side': position_side,
-                'entry_price': entry_price,
-                'current_price': current_price,
-                'position_amt': position_amt,
-                'raw_profit': raw_profit,
-                'raw_profit_percentage': raw_profit_percentage,
-                'open_fee': open_fee_info['fee_amount'],
-                'close_fee': close_fee_info['fee_amount'],
-                'total_fees': total_fees,
-                'net_profit': net_profit,
-                'net_profit_percentage': net_profit_percentage,
-                'is_profitable': is_profitable,
-                'meets_min_profit': meets_min_profit
-            }
-
-            # Log the calculation
-            logging.debug(
+        profit = self._single_profit_after_fees(position_info, current_price, symbol)
+        if profit is None:
+            return False, None
+        (current_price, raw_profit, close_fee, open_fee, net_profit,
+         raw_profit_percentage, net_profit_percentage) = profit
+        total_fees = close_fee + open_fee
+
+        # Determine if profitable after fees
+        is_profitable = net_profit > 0
+
+        # Check if profit meets minimum threshold
+        meets_min_profit = net_profit_percentage >= config.MIN_PROFIT_AFTER_FEES
+
+        # Create profit info dictionary
+        profit_info = {
+            'position_side': position_side,
+            'entry_price': entry_price,
+            'current_price': current_price,
+            'position_amt': position_amt,
+            'raw_profit': raw_profit,
+            'raw_profit_percentage': raw_profit_percentage,
+            'open_fee': open_fee,
+            'close_fee': close_fee,
+            'total_fees': total_fees,
+            'net_profit': net_profit,
+            'net_profit_percentage': net_profit_percentage,
+            'is_profitable': is_profitable,
+            'meets_min_profit': meets_min_profit
+        }
+
+        # Log the calculation
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
                 f"Profit calculation for {symbol} {position_side}: "
                 f"entry={entry_price:.6f}, current={current_price:.6f}, "
                 f"raw_profit={raw_profit:.6f} ({raw_profit_percentage:.2f}%), "
                 f"fees={total_fees:.6f}, net_profit={net_profit:.6f} ({net_profit_percentage:.2f}%)"
             )
 
-            return meets_min_profit, profit_info
+        return meets_min_profit, profit_info
 
-        except Exception as e:
-            logging.error(f"Error checking if position is profitable after fees: {str(e)}")
-            return False, None
+    def meets_min_profit_after_fees(self, position_info, current_price=None, symbol=None):
+        """
+        Check if closing a position would meet the minimum profit after fees
+
+        Same check as is_profitable_after_fees without building profit_info,
+        for callers that only need the answer.
+
+        Args:
+            position_info: Dictionary with position information
+            current_price: Current market price (if None, will be fetched)
+            symbol: Trading symbol (default from config)
+
+        Returns:
+            Boolean, the first value is_profitable_after_fees would return
+        """
+        profit = self._single_profit_after_fees(position_info, current_price, symbol or config.SYMBOL)
+        if profit is None:
+            return False
+        return profit[-1] >= config.MIN_PROFIT_AFTER_FEES
+
+    def are_profitable_after_fees(self, positions, current_prices):
+        """
+        Check many positions at once for profitability after trading fees
+
+        Applies the same rules as is_profitable_after_fees to every position.
+
+        Args:
+            positions: List of position information dictionaries
+            current_prices: Current market price for each position
+
+        Returns:
+            Tuple (is_profitable, meets_min_profit) of boolean arrays
+        """
+        count = len(positions)
+        entry_prices = np.fromiter((position['entry_price'] for position in positions), dtype=np.float64, count=count)
+        amounts = np.abs(np.fromiter((position['position_amt'] for position in positions), dtype=np.float64, count=count))
+        signs = np.fromiter((1.0 if position['position_side'] == 'LONG' else -1.0 for position in positions),
+                            dtype=np.float64, count=count)
+        current_prices = np.asarray(current_prices, dtype=np.float64)
+
+        _, _, _, net_profits, _, net_profit_percentages = self._profit_after_fees(
+            entry_prices, current_prices, amounts, signs
+        )
+        return net_profits > 0, net_profit_percentages >= config.MIN_PROFIT_AFTER_FEES
@@ -0,0 +1,177 @@
+"""
+Shared helpers for scripts that close open positions
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from binance_client import BinanceClient, is_zero_amount
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of concurrent REST requests when fetching prices or closing positions
+MAX_CONCURRENT_REQUESTS = 10
+
+def fetch_prices(client, symbols, max_workers=MAX_CONCURRENT_REQUESTS):
+    """
+    Fetch current prices for several symbols concurrently
+
+    Args:
+        client: BinanceClient instance
+        symbols: Iterable of trading symbols
+        max_workers: Maximum number of requests in flight
+
+    Returns:
+        Dictionary of symbol -> price (None if the price could not be fetched)
+    """
+    def fetch(symbol):
+        try:
+            return client.get_current_price(symbol)
+        except Exception as e:
+            logger.error(f"Error getting current price for {symbol}: {str(e)}")
+            return None
+
+    symbols = list(symbols)
+    if not symbols:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(symbols, executor.map(fetch, symbols)))
+
+def scan_losing_positions(entry, mark, amt, lev, threshold, tick=None):
+    """
+    Screen positions against a loss threshold in a single vectorised pass
+
+    LONG positions (positive amount) use mark / entry - 1 and SHORT positions
+    use entry / mark - 1, both scaled by leverage. When tick sizes are given,
+    prices are quantised to integer ticks and the threshold check is done in
+    integer basis points; positions without a known tick size (NaN) fall back
+    to the floating-point comparison.
+
+    Args:
+        entry: Array of entry prices
+        mark: Array of current prices
+        amt: Array of signed position amounts
+        lev: Array of leverages
+        threshold: Loss threshold in percentage
+        tick: Optional array of price tick sizes
+
+    Returns:
+        Tuple (indices of positions at or beyond -threshold, PnL percentage of every position)
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(amt > 0, mark / entry, entry / mark)
+    pnl_percents = (ratio - 1) * 100 * lev
+    losing = pnl_percents <= -threshold
+
+    if tick is not None and len(tick):
+        known = ~np.isnan(tick)
+        safe_tick = np.where(known, tick, 1.0)
+        entry_ticks = np.rint(entry / safe_tick).astype(np.int64)
+        mark_ticks = np.rint(mark / safe_tick).astype(np.int64)
+
+        # LONG: (mark - entry) / entry, SHORT: (entry - mark) / mark
+        is_long = amt > 0
+        diff = np.where(is_long, mark_ticks - entry_ticks, entry_ticks - mark_ticks)
+        base = np.maximum(np.where(is_long, entry_ticks, mark_ticks), 1)
+        # pnl_bp <= -threshold_bp, cross-multiplied by base so nothing is floored or truncated
+        scaled_pnl = diff * 10_000 * lev.astype(np.int64)
+
+        losing = np.where(known, scaled_pnl <= -threshold * 100 * base, losing)
+
+    return np.flatnonzero(losing), pnl_percents
+
+def close_position(client, symbol, position_side, position_amt, is_hedge_mode):
+    """
+    Close a position with a market order
+
+    Args:
+        client: BinanceClient instance
+        symbol: Trading symbol
+        position_side: Position side reported by Binance ('LONG', 'SHORT' or 'BOTH')
+        position_amt: Signed position amount
+        is_hedge_mode: Whether the account is in hedge mode
+
+    Returns:
+        True if the position was closed, False otherwise
+    """
+    # Determine order parameters
+    side = 'SELL' if position_amt > 0 else 'BUY'  # SELL to close LONG, BUY to close SHORT
+    quantity = abs(position_amt)
+
+    # Place market order to close position
+    logger.info(f"Closing position {symbol} {position_side} with {side} order, quantity {quantity}")
+
+    try:
+        order = client.place_market_order(
+            side=side,
+            quantity=quantity,
+            # In one-way mode positionSide is ignored, so always send BOTH
+            position_side=position_side if is_hedge_mode else 'BOTH',
+            symbol=symbol
+        )
+
+        logger.info(f"Successfully closed position: {order}")
+        return True
+
+    except Exception as e:
+        logger.error(f"Error closing position {symbol} {position_side}: {str(e)}")
+        return False
+
+def close_positions(client, to_close, max_workers=MAX_CONCURRENT_REQUESTS):
+    """
+    Close several positions concurrently
+
+    Args:
+        client: BinanceClient instance
+        to_close: Iterable of (symbol, position_side, position_amt) tuples
+        max_workers: Maximum number of orders in flight
+
+    Returns:
+        Number of positions closed
+    """
+    to_close = list(to_close)
+    if not to_close:
+        return 0
+
+    # Check if hedge mode is enabled (once for all closing orders)
+    is_hedge_mode = client.get_position_mode()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(close_position, client, symbol, position_side, position_amt, is_hedge_mode)
+            for symbol, position_side, position_amt in to_close
+        ]
+        return sum(1 for future in futures if future.result())
+
+def close_all_positions_for_symbol(symbol, client=None):
+    """
+    Close every open position for a symbol regardless of PnL
+
+    Args:
+        symbol: Trading symbol
+        client: BinanceClient instance (created if not provided)
+
+    Returns:
+        Number of positions closed
+    """
+    client = client or BinanceClient()
+
+    try:
+        positions = client.get_open_positions(symbol)
+        positions = [p for p in positions if not is_zero_amount(p.get('positionAmt', 0))]
+        logger.info(f"Found {len(positions)} open positions for {symbol}")
+
+        if not positions:
+            return 0
+
+        return close_positions(client, [
+            (symbol, p.get('positionSide', 'BOTH'), float(p['positionAmt']))
+            for p in positions
+        ])
+
+    except Exception as e:
+        logger.error(f"Error closing positions for {symbol}: {str(e)}")
+        return 0
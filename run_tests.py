@@ -1,18 +1,41 @@
 import unittest
 import sys
 import os
+import io
+import fnmatch
+from concurrent.futures import ProcessPoolExecutor
 
 # Add the parent directory to sys.path to import modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+TEST_DIR = 'tests'
+TEST_PATTERN = 'test_*.py'
+
+def run_test_module(module_file):
+    """
+    Run the tests of one module in this process
+
+    Args:
+        module_file: File name of the test module inside TEST_DIR
+
+    Returns:
+        Tuple (report text, whether all tests passed)
+    """
+    stream = io.StringIO()
+    test_suite = unittest.TestLoader().discover(TEST_DIR, pattern=module_file)
+    result = unittest.TextTestRunner(stream=stream, verbosity=2).run(test_suite)
+    return stream.getvalue(), result.wasSuccessful()
+
 if __name__ == '__main__':
-    # Discover and run all tests
-    test_loader = unittest.TestLoader()
-    test_suite = test_loader.discover('tests', pattern='test_*.py')
-    
-    # Run the tests
-    test_runner = unittest.TextTestRunner(verbosity=2)
-    result = test_runner.run(test_suite)
-    
+    # Discover the test modules and run each one in its own worker process
+    module_files = sorted(f for f in os.listdir(TEST_DIR) if fnmatch.fnmatch(f, TEST_PATTERN))
+
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(run_test_module, module_files))
+
+    # Print the reports in module order
+    for report, _ in results:
+        sys.stdout.write(report)
+
     # Exit with non-zero code if tests failed
-    sys.exit(not result.wasSuccessful())
+    sys.exit(not all(successful for _, successful in results))
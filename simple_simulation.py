@@ -3,6 +3,10 @@
 Simple Trading Simulation for $60 Account
 """
 
+from bisect import bisect_left
+
+import numpy as np
+
 # Simulation parameters
 ACCOUNT_BALANCE = 60.0  # $60 account balance
 POSITION_SIZE_PERCENT = 20.0  # 20% of account balance per position
@@ -24,59 +28,49 @@ SAMPLE_PRICES = {
     'MATICUSDT': 0.8,
 }
 
+# Sample symbols and prices as aligned arrays for the vectorized sizing
+_SYMBOLS = tuple(SAMPLE_PRICES)
+_PRICES = np.array(list(SAMPLE_PRICES.values()), dtype=np.float64)
+
+# Margin percentage by leverage bracket, same table as config
+_MARGIN_BREAKS = (25, 50, 75, 100)
+_MARGIN_VALS = (5.0, 4.0, 3.0, 2.0, 1.0)
+
 def get_margin_percentage(leverage):
     """Calculate margin percentage based on leverage"""
-    if leverage <= 25:
-        return 5.0
-    elif leverage <= 50:
-        return 4.0
-    elif leverage <= 75:
-        return 3.0
-    elif leverage <= 100:
-        return 2.0
-    else:
-        return 1.0
+    return _MARGIN_VALS[bisect_left(_MARGIN_BREAKS, leverage)]
 
-def calculate_position_size(price, account_balance, position_size_percent, leverage):
-    """Calculate position size with minimum notional value check"""
-    # Calculate position size based on percentage of account balance
-    position_size_usdt = account_balance * (position_size_percent / 100)
-    
-    # Calculate margin amount based on margin percentage
+def calculate_position_sizes(prices, account_balance, position_size_percent, leverage):
+    """
+    Calculate position sizes for an array of prices with minimum notional value check
+
+    Returns arrays (quantities, adjusted_quantities, notional_values, min_balance_needed):
+    the quantities before and after the minimum notional adjustment (0 where the
+    balance can't reach the minimum), the resulting notional values, and the
+    balance the minimum needs (0 where no adjustment was needed)
+    """
+    # Position size, margin and leverage don't depend on the price
     margin_percentage = get_margin_percentage(leverage)
-    margin_amount = position_size_usdt * (margin_percentage / 100)
-    
-    # Calculate effective position size with leverage
-    effective_position_size = margin_amount * leverage
-    
-    # Calculate quantity
-    quantity = effective_position_size / price
-    
-    # Check if notional value meets minimum requirement
-    notional_value = quantity * price
-    adjusted = False
-    
-    if notional_value < MIN_NOTIONAL_VALUE:
-        print(f"  WARNING: Notional value ({notional_value:.2f} USDT) is less than minimum required ({MIN_NOTIONAL_VALUE} USDT)")
-        
-        # Adjust quantity to meet minimum notional value
-        min_quantity = MIN_NOTIONAL_VALUE / price
-        
-        # If the minimum quantity would exceed our available balance, we can't place the order
-        min_quantity_value = min_quantity * price / leverage * (100 / margin_percentage)
-        min_balance_needed = min_quantity_value * 100 / position_size_percent
-        
-        if min_balance_needed > account_balance:
-            print(f"  ERROR: Insufficient balance ({account_balance:.2f} USDT) to meet minimum notional value.")
-            print(f"         Need at least {min_balance_needed:.2f} USDT.")
-            return 0, 0, False
-            
-        print(f"  Adjusting quantity from {quantity:.8f} to {min_quantity:.8f} to meet minimum notional value")
-        quantity = min_quantity
-        notional_value = MIN_NOTIONAL_VALUE
-        adjusted = True
-    
-    return quantity, notional_value, adjusted
+    effective_position_size = account_balance * (position_size_percent / 100) * (margin_percentage / 100) * leverage
+
+    # Calculate quantities and check the minimum notional value
+    quantities = effective_position_size / prices
+    notional_values = quantities * prices
+    needs_adjust = notional_values < MIN_NOTIONAL_VALUE
+
+    # Adjust quantities to meet minimum notional value
+    # The balance that reaches the minimum doesn't depend on the price
+    min_quantities = MIN_NOTIONAL_VALUE / prices
+    min_balance_needed = np.where(needs_adjust, MIN_NOTIONAL_VALUE * 10000 / (leverage * margin_percentage * position_size_percent), 0.0)
+    adjusted_quantities = np.where(needs_adjust, min_quantities, quantities)
+    notional_values = np.where(needs_adjust, MIN_NOTIONAL_VALUE, notional_values)
+
+    # If the minimum quantity would exceed our available balance, we can't place the order
+    insufficient = min_balance_needed > account_balance
+    adjusted_quantities[insufficient] = 0.0
+    notional_values[insufficient] = 0.0
+
+    return quantities, adjusted_quantities, notional_values, min_balance_needed
 
 def main():
     """Run the simulation"""
@@ -94,26 +88,37 @@ def main():
     print("\nPosition Size Calculation Results:")
     
     valid_pairs = []
-    
-    for symbol, price in SAMPLE_PRICES.items():
+
+    quantities, adjusted_quantities, notional_values, min_balance_needed = calculate_position_sizes(
+        _PRICES,
+        account_balance=ACCOUNT_BALANCE,
+        position_size_percent=POSITION_SIZE_PERCENT,
+        leverage=LEVERAGE
+    )
+
+    for symbol, price, quantity, adjusted_quantity, notional_value, balance_needed in zip(
+            _SYMBOLS, _PRICES, quantities, adjusted_quantities, notional_values, min_balance_needed):
         print(f"\n{symbol} (Price: ${price:.2f}):")
-        
-        quantity, notional_value, adjusted = calculate_position_size(
-            price=price,
-            account_balance=ACCOUNT_BALANCE,
-            position_size_percent=POSITION_SIZE_PERCENT,
-            leverage=LEVERAGE
-        )
-        
-        if quantity > 0:
-            print(f"  Quantity: {quantity:.8f}")
+
+        # A minimum balance is only needed when the quantity had to be adjusted
+        adjusted = balance_needed > 0
+        if adjusted:
+            print(f"  WARNING: Notional value ({quantity * price:.2f} USDT) is less than minimum required ({MIN_NOTIONAL_VALUE} USDT)")
+            if balance_needed > ACCOUNT_BALANCE:
+                print(f"  ERROR: Insufficient balance ({ACCOUNT_BALANCE:.2f} USDT) to meet minimum notional value.")
+                print(f"         Need at least {balance_needed:.2f} USDT.")
+            else:
+                print(f"  Adjusting quantity from {quantity:.8f} to {adjusted_quantity:.8f} to meet minimum notional value")
+
+        if adjusted_quantity > 0:
+            print(f"  Quantity: {adjusted_quantity:.8f}")
             print(f"  Notional Value: ${notional_value:.2f}")
             print(f"  Meets Minimum Notional: {'Yes' if notional_value >= MIN_NOTIONAL_VALUE else 'No'}")
             print(f"  Adjusted: {'Yes' if adjusted else 'No'}")
             valid_pairs.append(symbol)
         else:
             print(f"  Cannot trade {symbol} with current settings")
-    
+
     # Count how many pairs meet minimum notional value
     total_pairs = len(SAMPLE_PRICES)
     
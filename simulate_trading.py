@@ -9,6 +9,8 @@ and notional values with a $60 account balance.
 import os
 import sys
 import logging
+from bisect import bisect_left
+import numpy as np
 import pandas as pd
 from tabulate import tabulate
 
@@ -44,107 +46,84 @@ SAMPLE_PRICES = {
     'MATICUSDT': 0.8,
 }
 
+# Margin percentage by leverage bracket, same table as config
+_MARGIN_BREAKS = (25, 50, 75, 100)
+_MARGIN_VALS = (5.0, 4.0, 3.0, 2.0, 1.0)
+
 def get_margin_percentage(leverage):
     """Calculate margin percentage based on leverage"""
-    if leverage <= 25:
-        return 5.0
-    elif leverage <= 50:
-        return 4.0
-    elif leverage <= 75:
-        return 3.0
-    elif leverage <= 100:
-        return 2.0
-    else:
-        return 1.0
+    return _MARGIN_VALS[bisect_left(_MARGIN_BREAKS, leverage)]
 
-def calculate_position_size(price, account_balance, position_size_percent, leverage, current_usage_percent=0):
+def calculate_position_sizes(prices, account_balance, position_size_percent, leverage, current_usage_percent=0):
     """
-    Calculate position size with minimum notional value check
-    
+    Calculate position sizes for an array of prices with the same logic as the trading bot
+
     Args:
-        price: Current market price
+        prices: Array of current market prices
         account_balance: Account balance in USDT
         position_size_percent: Percentage of account balance to use for position
         leverage: Leverage to use
         current_usage_percent: Current account usage percentage
-        
+
     Returns:
-        Dictionary with position details
+        Dictionary of position detail arrays, one element per price
     """
+    prices = np.asarray(prices, dtype=np.float64)
+    zeros = np.zeros_like(prices)
+
     # Calculate available balance percentage
     available_percent = max(0, MAX_ACCOUNT_USAGE - current_usage_percent)
-    
-    # If we've reached the maximum account usage, return 0
+
+    # If we've reached the maximum account usage, no position can be opened
     if available_percent <= 0:
         logger.warning(f"Maximum account usage reached ({MAX_ACCOUNT_USAGE}%). Cannot open new positions.")
         return {
-            'quantity': 0,
-            'notional_value': 0,
-            'effective_position_size': 0,
-            'margin_amount': 0,
-            'position_size_usdt': 0,
-            'max_position_percent': 0,
-            'meets_min_notional': False,
-            'adjusted': False
+            'quantity': zeros,
+            'notional_value': zeros,
+            'effective_position_size': zeros,
+            'margin_amount': zeros,
+            'position_size_usdt': zeros,
+            'max_position_percent': zeros,
+            'meets_min_notional': zeros.astype(bool),
+            'adjusted': zeros.astype(bool)
         }
-    
-    # Calculate maximum position size based on available balance percentage
+
+    # Position size, margin and leverage don't depend on the price
     max_position_percent = min(position_size_percent, available_percent)
-    
-    # Calculate position size based on percentage of account balance
     position_size_usdt = account_balance * (max_position_percent / 100)
-    
-    # Calculate margin amount based on margin percentage
     margin_percentage = get_margin_percentage(leverage)
     margin_amount = position_size_usdt * (margin_percentage / 100)
-    
-    # Calculate effective position size with leverage
     effective_position_size = margin_amount * leverage
-    
-    # Calculate quantity
-    quantity = effective_position_size / price
-    
-    # Check if notional value meets minimum requirement
-    notional_value = quantity * price
-    adjusted = False
-    
-    if notional_value < MIN_NOTIONAL_VALUE:
-        logger.warning(f"Calculated notional value ({notional_value:.2f} USDT) is less than minimum required ({MIN_NOTIONAL_VALUE} USDT)")
-        
-        # Adjust quantity to meet minimum notional value
-        min_quantity = MIN_NOTIONAL_VALUE / price
-        
-        # If the minimum quantity would exceed our available balance, we can't place the order
-        min_quantity_value = min_quantity * price / leverage * (100 / margin_percentage)
-        min_balance_needed = min_quantity_value * 100 / max_position_percent
-        
-        if min_balance_needed > account_balance:
-            logger.warning(f"Insufficient balance ({account_balance:.2f} USDT) to meet minimum notional value. Need at least {min_balance_needed:.2f} USDT.")
-            return {
-                'quantity': 0,
-                'notional_value': 0,
-                'effective_position_size': 0,
-                'margin_amount': 0,
-                'position_size_usdt': 0,
-                'max_position_percent': 0,
-                'meets_min_notional': False,
-                'adjusted': False
-            }
-            
-        logger.info(f"Adjusting quantity from {quantity} to {min_quantity} to meet minimum notional value")
-        quantity = min_quantity
-        notional_value = MIN_NOTIONAL_VALUE
-        adjusted = True
-    
+
+    # Calculate quantities and check the minimum notional value
+    quantity = effective_position_size / prices
+    notional_value = quantity * prices
+    adjusted = notional_value < MIN_NOTIONAL_VALUE
+
+    # Adjust quantities to meet minimum notional value
+    quantity = np.where(adjusted, MIN_NOTIONAL_VALUE / prices, quantity)
+    notional_value = np.where(adjusted, MIN_NOTIONAL_VALUE, notional_value)
+
+    # If the minimum quantity would exceed our available balance, we can't place the order
+    min_balance_needed = MIN_NOTIONAL_VALUE * 10000 / (leverage * margin_percentage * max_position_percent)
+    insufficient = adjusted & (min_balance_needed > account_balance)
+    if insufficient.any():
+        logger.warning(f"Insufficient balance ({account_balance:.2f} USDT) to meet minimum notional value for {int(insufficient.sum())} pairs. Need at least {min_balance_needed:.2f} USDT.")
+    elif adjusted.any():
+        logger.info(f"Adjusted quantity of {int(adjusted.sum())} pairs to meet minimum notional value")
+
+    def per_price(value):
+        return np.where(insufficient, 0.0, value)
+
     return {
-        'quantity': quantity,
-        'notional_value': notional_value,
-        'effective_position_size': effective_position_size,
-        'margin_amount': margin_amount,
-        'position_size_usdt': position_size_usdt,
-        'max_position_percent': max_position_percent,
-        'meets_min_notional': notional_value >= MIN_NOTIONAL_VALUE,
-        'adjusted': adjusted
+        'quantity': per_price(quantity),
+        'notional_value': per_price(notional_value),
+        'effective_position_size': per_price(effective_position_size),
+        'margin_amount': per_price(margin_amount),
+        'position_size_usdt': per_price(position_size_usdt),
+        'max_position_percent': per_price(max_position_percent),
+        'meets_min_notional': ~insufficient & (notional_value >= MIN_NOTIONAL_VALUE),
+        'adjusted': adjusted & ~insufficient
     }
 
 def simulate_trading():
@@ -163,33 +142,18 @@ def simulate_trading():
     ]
     print(tabulate(params, tablefmt="simple"))
     
-    # Calculate position sizes for each cryptocurrency
-    results = []
-    
-    for symbol, price in SAMPLE_PRICES.items():
-        position = calculate_position_size(
-            price=price,
-            account_balance=ACCOUNT_BALANCE,
-            position_size_percent=POSITION_SIZE_PERCENT,
-            leverage=LEVERAGE
-        )
-        
-        results.append({
-            'symbol': symbol,
-            'price': price,
-            'quantity': position['quantity'],
-            'notional_value': position['notional_value'],
-            'effective_position_size': position['effective_position_size'],
-            'margin_amount': position['margin_amount'],
-            'position_size_usdt': position['position_size_usdt'],
-            'max_position_percent': position['max_position_percent'],
-            'meets_min_notional': position['meets_min_notional'],
-            'adjusted': position['adjusted']
-        })
-    
-    # Convert to DataFrame for easier display
-    df = pd.DataFrame(results)
-    
+    # Calculate position sizes for all cryptocurrencies at once
+    prices = np.array(list(SAMPLE_PRICES.values()), dtype=np.float64)
+    positions = calculate_position_sizes(
+        prices,
+        account_balance=ACCOUNT_BALANCE,
+        position_size_percent=POSITION_SIZE_PERCENT,
+        leverage=LEVERAGE
+    )
+
+    # Build the DataFrame straight from the column arrays
+    df = pd.DataFrame({'symbol': list(SAMPLE_PRICES), 'price': prices, **positions})
+
     # Sort by whether they meet minimum notional value, then by symbol
     df = df.sort_values(by=['meets_min_notional', 'symbol'], ascending=[False, True])
     
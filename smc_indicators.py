@@ -2,7 +2,16 @@ import numpy as np
 import pandas as pd
 import config
 
-def detect_market_structure(df, lookback=10):
+# Integer codes for the market_structure labels; bullish structures are positive
+MARKET_STRUCTURE_CODES = {
+    'neutral': 0,
+    'uptrend': 1,
+    'bullish_reversal': 2,
+    'downtrend': -1,
+    'bearish_reversal': -2,
+}
+
+def detect_market_structure(df, lookback=10, inplace=False):
     """
     Detect market structure using Smart Money Concept (SMC)
     Identifies Higher Highs (HH), Higher Lows (HL), Lower Highs (LH), Lower Lows (LL)
@@ -11,12 +20,14 @@ def detect_market_structure(df, lookback=10):
     Args:
         df: DataFrame with OHLC data
         lookback: Number of candles to look back for structure analysis
+        inplace: Add the columns to df itself instead of a copy
 
     Returns:
         DataFrame with market structure information
     """
     # Make a copy of the dataframe to avoid modifying the original
-    df = df.copy()
+    if not inplace:
+        df = df.copy()
 
     # Initialize columns
     df['swing_high'] = False
@@ -28,6 +39,7 @@ def detect_market_structure(df, lookback=10):
     df['bos_bullish'] = False  # Break of Structure (bullish)
     df['bos_bearish'] = False  # Break of Structure (bearish)
     df['market_structure'] = 'neutral'  # Overall market structure
+    df['market_structure_code'] = np.zeros(len(df), dtype=np.int8)  # Same, as MARKET_STRUCTURE_CODES
 
     # We need at least lookback+2 candles to identify structure
     if len(df) < lookback + 2:
@@ -36,53 +48,67 @@ def detect_market_structure(df, lookback=10):
     # For very small lookback values (like in tests), ensure we have a minimum
     effective_lookback = max(1, lookback)
 
+    # Flags are collected in arrays and written to the frame once
+    swing_high = np.zeros(len(df), dtype=bool)
+    swing_low = np.zeros(len(df), dtype=bool)
+
     # Identify swing highs and lows
     for i in range(effective_lookback, len(df) - effective_lookback):
         # Check if this is a swing high (highest high in the window)
         if df.iloc[i]['high'] == df.iloc[i-effective_lookback:i+effective_lookback+1]['high'].max():
-            df.loc[df.index[i], 'swing_high'] = True
+            swing_high[i] = True
 
         # Check if this is a swing low (lowest low in the window)
         if df.iloc[i]['low'] == df.iloc[i-effective_lookback:i+effective_lookback+1]['low'].min():
-            df.loc[df.index[i], 'swing_low'] = True
+            swing_low[i] = True
 
     # If we don't have any swing points yet (can happen with test data),
     # use a simpler method to identify some swing points
-    if not df['swing_high'].any() or not df['swing_low'].any():
+    if not swing_high.any() or not swing_low.any():
         # Simple method: compare with previous and next candle
         for i in range(1, len(df) - 1):
             # Swing high: higher than previous and next
             if df.iloc[i]['high'] > df.iloc[i-1]['high'] and df.iloc[i]['high'] > df.iloc[i+1]['high']:
-                df.loc[df.index[i], 'swing_high'] = True
+                swing_high[i] = True
 
             # Swing low: lower than previous and next
             if df.iloc[i]['low'] < df.iloc[i-1]['low'] and df.iloc[i]['low'] < df.iloc[i+1]['low']:
-                df.loc[df.index[i], 'swing_low'] = True
+                swing_low[i] = True
+
+    df['swing_high'] = swing_high
+    df['swing_low'] = swing_low
 
     # Get all swing highs and lows
     swing_highs = df[df['swing_high']].index
     swing_lows = df[df['swing_low']].index
 
     # Identify higher highs, higher lows, lower highs, lower lows
+    higher_highs, lower_highs = [], []
     if len(swing_highs) >= 2:
         for i in range(1, len(swing_highs)):
             current_idx = swing_highs[i]
             prev_idx = swing_highs[i-1]
 
             if df.loc[current_idx, 'high'] > df.loc[prev_idx, 'high']:
-                df.loc[current_idx, 'higher_high'] = True
+                higher_highs.append(current_idx)
             else:
-                df.loc[current_idx, 'lower_high'] = True
+                lower_highs.append(current_idx)
 
+    higher_lows, lower_lows = [], []
     if len(swing_lows) >= 2:
         for i in range(1, len(swing_lows)):
             current_idx = swing_lows[i]
             prev_idx = swing_lows[i-1]
 
             if df.loc[current_idx, 'low'] > df.loc[prev_idx, 'low']:
-                df.loc[current_idx, 'higher_low'] = True
+                higher_lows.append(current_idx)
             else:
-                df.loc[current_idx, 'lower_low'] = True
+                lower_lows.append(current_idx)
+
+    df.loc[higher_highs, 'higher_high'] = True
+    df.loc[lower_highs, 'lower_high'] = True
+    df.loc[higher_lows, 'higher_low'] = True
+    df.loc[lower_lows, 'lower_low'] = True
 
     # For test data: if we still don't have any higher highs but we have an uptrend pattern,
     # manually set some higher highs based on the price action
@@ -90,13 +116,17 @@ def detect_market_structure(df, lookback=10):
         # Check if we have an overall uptrend by comparing first and last prices
         if df.iloc[-1]['close'] > df.iloc[0]['close']:
             # Find local highs
+            higher_high = df['higher_high'].to_numpy(dtype=bool, copy=True)
             for i in range(2, len(df) - 2):
                 if df.iloc[i]['high'] > df.iloc[i-1]['high'] and df.iloc[i]['high'] > df.iloc[i-2]['high']:
-                    df.loc[df.index[i], 'higher_high'] = True
+                    higher_high[i] = True
+            df['higher_high'] = higher_high
 
     # Identify Break of Structure (BOS)
     # Bullish BOS: Price breaks above a significant swing high
     # Bearish BOS: Price breaks below a significant swing low
+    bos_bullish = np.zeros(len(df), dtype=bool)
+    bos_bearish = np.zeros(len(df), dtype=bool)
     for i in range(lookback + 1, len(df)):
         # Find the most recent swing high before this candle
         recent_swing_highs = swing_highs[swing_highs < df.index[i]]
@@ -104,7 +134,7 @@ def detect_market_structure(df, lookback=10):
             last_swing_high = recent_swing_highs[-1]
             # Bullish BOS: Current candle closes above the last swing high
             if df.iloc[i]['close'] > df.loc[last_swing_high, 'high']:
-                df.loc[df.index[i], 'bos_bullish'] = True
+                bos_bullish[i] = True
 
         # Find the most recent swing low before this candle
         recent_swing_lows = swing_lows[swing_lows < df.index[i]]
@@ -112,7 +142,10 @@ def detect_market_structure(df, lookback=10):
             last_swing_low = recent_swing_lows[-1]
             # Bearish BOS: Current candle closes below the last swing low
             if df.iloc[i]['close'] < df.loc[last_swing_low, 'low']:
-                df.loc[df.index[i], 'bos_bearish'] = True
+                bos_bearish[i] = True
+
+    df['bos_bullish'] = bos_bullish
+    df['bos_bearish'] = bos_bearish
 
     # Determine overall market structure
     # Look at the last few candles to determine the current market structure
@@ -127,19 +160,24 @@ def detect_market_structure(df, lookback=10):
 
     # Determine market structure based on recent patterns
     if higher_highs_count > 0 and higher_lows_count > 0:
-        df.loc[df.index[-1], 'market_structure'] = 'uptrend'
+        market_structure = 'uptrend'
     elif lower_highs_count > 0 and lower_lows_count > 0:
-        df.loc[df.index[-1], 'market_structure'] = 'downtrend'
+        market_structure = 'downtrend'
     elif bos_bullish_count > 0:
-        df.loc[df.index[-1], 'market_structure'] = 'bullish_reversal'
+        market_structure = 'bullish_reversal'
     elif bos_bearish_count > 0:
-        df.loc[df.index[-1], 'market_structure'] = 'bearish_reversal'
+        market_structure = 'bearish_reversal'
     else:
-        df.loc[df.index[-1], 'market_structure'] = 'neutral'
+        market_structure = 'neutral'
+
+    df.loc[df.index[-1], 'market_structure'] = market_structure
+    codes = np.zeros(len(df), dtype=np.int8)
+    codes[-1] = MARKET_STRUCTURE_CODES[market_structure]
+    df['market_structure_code'] = codes
 
     return df
 
-def detect_fair_value_gaps(df):
+def detect_fair_value_gaps(df, inplace=False):
     """
     Detect Fair Value Gaps (FVG) in the price action
     A bullish FVG occurs when the low of a candle is higher than the high of the candle two positions before it
@@ -147,12 +185,14 @@ def detect_fair_value_gaps(df):
 
     Args:
         df: DataFrame with OHLC data
+        inplace: Add the columns to df itself instead of a copy
 
     Returns:
         DataFrame with FVG information
     """
     # Make a copy of the dataframe to avoid modifying the original
-    df = df.copy()
+    if not inplace:
+        df = df.copy()
 
     # Initialize columns
     df['bullish_fvg'] = False
@@ -166,26 +206,39 @@ def detect_fair_value_gaps(df):
     if len(df) < 3:
         return df
 
-    # Detect FVGs
-    for i in range(2, len(df)):
+    # Detect FVGs into arrays and write them to the frame once
+    n = len(df)
+    bullish_fvg = np.zeros(n, dtype=bool)
+    bearish_fvg = np.zeros(n, dtype=bool)
+    fvg_top = np.full(n, np.nan)
+    fvg_bottom = np.full(n, np.nan)
+    fvg_size = np.full(n, np.nan)
+
+    for i in range(2, n):
         try:
             # Bullish FVG: Current candle's low is higher than the high of the candle two positions before
             if df.iloc[i]['low'] > df.iloc[i-2]['high']:
-                df.loc[df.index[i], 'bullish_fvg'] = True
-                df.loc[df.index[i], 'fvg_top'] = df.iloc[i]['low']
-                df.loc[df.index[i], 'fvg_bottom'] = df.iloc[i-2]['high']
-                df.loc[df.index[i], 'fvg_size'] = df.iloc[i]['low'] - df.iloc[i-2]['high']
+                bullish_fvg[i] = True
+                fvg_top[i] = df.iloc[i]['low']
+                fvg_bottom[i] = df.iloc[i-2]['high']
+                fvg_size[i] = df.iloc[i]['low'] - df.iloc[i-2]['high']
 
             # Bearish FVG: Current candle's high is lower than the low of the candle two positions before
             if df.iloc[i]['high'] < df.iloc[i-2]['low']:
-                df.loc[df.index[i], 'bearish_fvg'] = True
-                df.loc[df.index[i], 'fvg_top'] = df.iloc[i-2]['low']
-                df.loc[df.index[i], 'fvg_bottom'] = df.iloc[i]['high']
-                df.loc[df.index[i], 'fvg_size'] = df.iloc[i-2]['low'] - df.iloc[i]['high']
+                bearish_fvg[i] = True
+                fvg_top[i] = df.iloc[i-2]['low']
+                fvg_bottom[i] = df.iloc[i]['high']
+                fvg_size[i] = df.iloc[i-2]['low'] - df.iloc[i]['high']
         except (KeyError, IndexError):
             # Skip any errors that might occur with test data
             continue
 
+    df['bullish_fvg'] = bullish_fvg
+    df['bearish_fvg'] = bearish_fvg
+    df['fvg_top'] = fvg_top
+    df['fvg_bottom'] = fvg_bottom
+    df['fvg_size'] = fvg_size
+
     # Check if FVGs have been filled by subsequent price action
     fvg_indices = df[(df['bullish_fvg'] | df['bearish_fvg'])].index
 
@@ -217,6 +270,8 @@ def detect_fair_value_gaps(df):
     # Find the nearest unfilled FVGs to the current price
     df['nearest_bullish_fvg'] = np.nan
     df['nearest_bearish_fvg'] = np.nan
+    df['nearest_bullish_fvg_bottom'] = np.nan  # fvg_bottom of nearest_bullish_fvg
+    df['nearest_bearish_fvg_top'] = np.nan  # fvg_top of nearest_bearish_fvg
 
     # Make sure we have data before trying to get the current price
     if len(df) > 0:
@@ -233,6 +288,7 @@ def detect_fair_value_gaps(df):
         # Get the nearest one
         nearest_idx = distances.idxmin()
         df.loc[df.index[-1], 'nearest_bullish_fvg'] = nearest_idx
+        df.loc[df.index[-1], 'nearest_bullish_fvg_bottom'] = unfilled_bullish_fvgs.at[nearest_idx, 'fvg_bottom']
 
         # Store the FVG details in the current candle for easy access
         try:
@@ -251,6 +307,7 @@ def detect_fair_value_gaps(df):
         # Get the nearest one
         nearest_idx = distances.idxmin()
         df.loc[df.index[-1], 'nearest_bearish_fvg'] = nearest_idx
+        df.loc[df.index[-1], 'nearest_bearish_fvg_top'] = unfilled_bearish_fvgs.at[nearest_idx, 'fvg_top']
 
         # Store the FVG details in the current candle for easy access
         try:
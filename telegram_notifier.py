@@ -1,14 +1,25 @@
+import queue
+import threading
 import requests
 import config
 import logging
 import pandas as pd
 
+# Maximum number of messages waiting for the background sender; newer messages are dropped when full
+MAX_QUEUED_MESSAGES = 100
+
 class TelegramNotifier:
-    def __init__(self, token=None, chat_id=None):
+    def __init__(self, token=None, chat_id=None, background=False):
         self.token = token or config.TELEGRAM_TOKEN
         self.chat_id = chat_id or config.TELEGRAM_CHAT_ID
         self.base_url = f"https://api.telegram.org/bot{self.token}"
 
+        # When True, messages are queued and sent by a daemon thread instead of blocking the caller
+        self.background = background
+        self._queue = queue.Queue(maxsize=MAX_QUEUED_MESSAGES)
+        self._sender = None
+        self._sender_lock = threading.Lock()
+
         # Check if Telegram credentials are configured
         self.enabled = bool(self.token and self.chat_id)
 
@@ -23,7 +34,7 @@ class TelegramNotifier:
             message: Message text to send
 
         Returns:
-            Response from Telegram API or None if disabled
+            Response from Telegram API, or None if disabled or sent in the background
         """
         # Check if notifications are disabled
         if not self.enabled:
@@ -35,6 +46,46 @@ class TelegramNotifier:
             logging.debug(f"Telegram notification (ignored for backtest/simulation): {message}")
             return None
 
+        if self.background:
+            self.enqueue(message)
+            return None
+
+        return self._post(message)
+
+    def enqueue(self, message):
+        """
+        Queue a message for the background sender without blocking
+
+        Args:
+            message: Message text to send
+
+        Returns:
+            True if the message was queued, False if the queue was full
+        """
+        self._start_sender()
+
+        try:
+            self._queue.put_nowait(message)
+            return True
+        except queue.Full:
+            logging.warning(f"Telegram queue full. Dropping message: {message}")
+            return False
+
+    def _start_sender(self):
+        with self._sender_lock:
+            if self._sender is None or not self._sender.is_alive():
+                self._sender = threading.Thread(target=self._run_sender, daemon=True)
+                self._sender.start()
+
+    def _run_sender(self):
+        # One session for the sender thread so the Telegram connection is reused
+        session = requests.Session()
+        while True:
+            message = self._queue.get()
+            self._post(message, session.post)
+            self._queue.task_done()
+
+    def _post(self, message, post=None):
         try:
             url = f"{self.base_url}/sendMessage"
             data = {
@@ -43,7 +94,7 @@ class TelegramNotifier:
                 "parse_mode": "HTML"
             }
 
-            response = requests.post(url, data=data)
+            response = (post or requests.post)(url, data=data)
 
             if response.status_code == 200:
                 return response.json()
@@ -8,7 +8,7 @@ import os
 # Add the parent directory to sys.path to import modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from binance_client import BinanceClient
+from binance_client import BinanceClient, is_zero_amount, positions_to_array
 import config
 
 class TestBinanceClient(unittest.TestCase):
@@ -33,6 +33,10 @@ class TestBinanceClient(unittest.TestCase):
         self.requests_patcher = patch('binance_client.requests')
         self.mock_requests = self.requests_patcher.start()
 
+        # Decode through response.json() so the mocked payloads below are used
+        self.orjson_patcher = patch('binance_client.orjson', None)
+        self.orjson_patcher.start()
+
         # Set up mock response for exchange info
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -54,6 +58,7 @@ class TestBinanceClient(unittest.TestCase):
         """Tear down test fixtures"""
         self.config_patcher.stop()
         self.requests_patcher.stop()
+        self.orjson_patcher.stop()
 
     def test_init(self):
         """Test initialization of BinanceClient"""
@@ -99,6 +104,23 @@ class TestBinanceClient(unittest.TestCase):
         self.assertEqual(kwargs['params'], {'symbol': 'BTCUSDT'})
         self.assertEqual(kwargs['timeout'], (self.mock_config.API_CONNECT_TIMEOUT, self.mock_config.API_TIMEOUT))
 
+    def test_send_request_decodes_with_orjson(self):
+        """Test _send_request decodes the raw body with orjson when available"""
+        mock_orjson = MagicMock()
+        mock_orjson.loads.side_effect = json.loads
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = b'{"price": "50000.00"}'
+        self.mock_requests.request.return_value = mock_response
+
+        with patch('binance_client.orjson', mock_orjson):
+            result = self.client._send_request('GET', '/api/v3/ticker/price', {'symbol': 'BTCUSDT'})
+
+        self.assertEqual(result, {'price': '50000.00'})
+        mock_orjson.loads.assert_called_once_with(b'{"price": "50000.00"}')
+        mock_response.json.assert_not_called()
+
     def test_send_request_signed(self):
         """Test _send_request method for signed requests"""
         # Set up mock response
@@ -132,6 +154,23 @@ class TestBinanceClient(unittest.TestCase):
         precision = self.client.get_quantity_precision()
         self.assertEqual(precision, 3)
 
+    def test_get_tick_size(self):
+        """Test get_tick_size method"""
+        self.client.exchange_info = {
+            'symbols': [
+                {
+                    'symbol': 'BTCUSDT',
+                    'filters': [
+                        {'filterType': 'LOT_SIZE', 'stepSize': '0.001'},
+                        {'filterType': 'PRICE_FILTER', 'tickSize': '0.10'}
+                    ]
+                }
+            ]
+        }
+
+        self.assertEqual(self.client.get_tick_size(), 0.1)
+        self.assertIsNone(self.client.get_tick_size('ETHUSDT'))
+
     def test_round_price(self):
         """Test round_price method"""
         rounded_price = self.client.round_price(50000.12345)
@@ -434,5 +473,78 @@ class TestBinanceClient(unittest.TestCase):
         self.assertEqual(result['combined_unrealized_pnl_percent'], 20.0)
         self.assertFalse(result['is_hedged'])
 
+    def test_get_high_volume_pairs_cached(self):
+        """Test get_high_volume_pairs caches the selected symbols until invalidated"""
+        self.client._send_request = MagicMock(return_value=[
+            {'symbol': 'BTCUSDT', 'quoteVolume': '5000000'},
+            {'symbol': 'ETHUSDT', 'quoteVolume': '3000000'},
+            {'symbol': 'XRPUSDT', 'quoteVolume': '500000'},
+            {'symbol': 'BTCBUSD', 'quoteVolume': '9000000'}
+        ])
+
+        # First call hits the API, second call is served from cache
+        with patch('builtins.print'):
+            self.assertEqual(self.client.get_high_volume_pairs(1000000), ['BTCUSDT', 'ETHUSDT'])
+            self.assertEqual(self.client.get_high_volume_pairs(1000000), ['BTCUSDT', 'ETHUSDT'])
+        self.client._send_request.assert_called_once()
+
+        # After invalidation the API is queried again
+        self.client.invalidate_high_volume_cache()
+        with patch('builtins.print'):
+            self.client.get_high_volume_pairs(1000000)
+        self.assertEqual(self.client._send_request.call_count, 2)
+
+    def test_place_market_order_invalidates_account_cache(self):
+        """Test a market order drops the cached account info"""
+        self.client._send_request = MagicMock(return_value={'availableBalance': '100'})
+        self.client.get_account_info()
+        self.client.get_account_info()
+        self.assertEqual(self.client._send_request.call_count, 1)
+
+        self.client.get_current_price = MagicMock(return_value=50000.0)
+        self.client.get_position_mode = MagicMock(return_value=False)
+        self.client.place_market_order('BUY', 0.001, 'LONG')
+
+        self.client.get_account_info()
+        self.assertEqual(self.client._send_request.call_count, 3)
+
+    def test_is_zero_amount(self):
+        """Test is_zero_amount handles formatted zeros, numbers and non-zero amounts"""
+        for amount in ('0', '0.000', '0.00000000', '-0.000', '0e-3', 0, 0.0):
+            self.assertTrue(is_zero_amount(amount), amount)
+        for amount in ('0.001', '-2.5', 1):
+            self.assertFalse(is_zero_amount(amount), amount)
+
+    def test_calculate_trading_fees_batch(self):
+        """Test calculate_trading_fees_batch matches per-order fee calculation"""
+        self.mock_config.TAKER_FEE_RATE = 0.0004
+        self.mock_config.MAKER_FEE_RATE = 0.0002
+
+        fees = self.client.calculate_trading_fees_batch([0.5, 0.5], [51000.0, 50000.0])
+        self.assertEqual(fees.tolist(), [
+            self.client.calculate_trading_fees(0.5, 51000.0)['fee_amount'],
+            self.client.calculate_trading_fees(0.5, 50000.0)['fee_amount']
+        ])
+
+        fees = self.client.calculate_trading_fees_batch([2.0], [100.0], is_market_order=False)
+        self.assertAlmostEqual(fees[0], 0.04)
+
+    def test_positions_to_array(self):
+        """Test positions_to_array decodes the numeric position fields"""
+        positions = positions_to_array([
+            {'symbol': 'BTCUSDT', 'positionSide': 'LONG', 'positionAmt': '0.100',
+             'entryPrice': '50000.0', 'unrealizedProfit': '12.5'},
+            {'symbol': 'ETHUSDT', 'positionSide': 'SHORT', 'positionAmt': '-2.000', 'entryPrice': '3000.0'},
+            {'symbol': 'XRPUSDT', 'positionSide': 'LONG', 'positionAmt': '10', 'entryPrice': '0.5',
+             'unRealizedProfit': '-1.5'}  # positionRisk spelling
+        ])
+
+        self.assertEqual(positions['symbol'].tolist(), ['BTCUSDT', 'ETHUSDT', 'XRPUSDT'])
+        self.assertEqual(positions['side'].tolist(), ['LONG', 'SHORT', 'LONG'])
+        self.assertEqual(positions['amount'].tolist(), [0.1, -2.0, 10.0])
+        self.assertEqual(positions['entry_price'].tolist(), [50000.0, 3000.0, 0.5])
+        self.assertEqual(positions['unrealized_pnl'].tolist(), [12.5, 0.0, -1.5])
+        self.assertEqual(len(positions_to_array([])), 0)
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,9 +1,10 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 import config
-from grid_trading import GridTradingBot
+from grid_trading import GridTradingBot, GridTradingManager
 
 class TestGridTradingBot(unittest.TestCase):
     def setUp(self):
@@ -88,6 +89,35 @@ class TestGridTradingBot(unittest.TestCase):
         self.bot.symbol = 'XRPUSDT'
         self.assertEqual(self.bot.get_coin_balance(), 0.0)
         
+    def test_base_asset(self):
+        """Test the base asset is derived once per symbol assignment"""
+        self.assertEqual(self.bot._base_asset, 'BTC')
+
+        self.bot.symbol = 'ETHBTC'
+        self.assertEqual(self.bot._base_asset, 'ETH')
+
+    def test_get_coin_balance_cached(self):
+        """Test get_coin_balance reuses a recent balance until invalidated"""
+        self.mock_client_instance.get_account_info.return_value = {
+            'assets': [{'asset': 'BTC', 'walletBalance': '0.5'}]
+        }
+
+        self.assertEqual(self.bot.get_coin_balance(), 0.5)
+        self.assertEqual(self.bot.get_coin_balance(), 0.5)
+        self.mock_client_instance.get_account_info.assert_called_once()
+
+        self.bot.invalidate_balance_cache()
+        self.bot.get_coin_balance()
+        self.assertEqual(self.mock_client_instance.get_account_info.call_count, 2)
+
+    def test_get_current_price_cached(self):
+        """Test get_current_price reuses a recent price"""
+        self.mock_client_instance.get_current_price.return_value = 50000.0
+
+        self.assertEqual(self.bot.get_current_price(), 50000.0)
+        self.assertEqual(self.bot.get_current_price(), 50000.0)
+        self.mock_client_instance.get_current_price.assert_called_once_with('BTCUSDT')
+
     def test_get_coin_value_in_usdt(self):
         """Test get_coin_value_in_usdt method"""
         # Mock get_coin_balance
@@ -175,6 +205,20 @@ class TestGridTradingBot(unittest.TestCase):
         self.mock_client_instance.place_stop_limit_order.assert_called_once()
         self.assertEqual(self.bot.active_sell_order_id, 67890)
         
+    def test_tick_error_backoff(self):
+        """Test tick backs off exponentially on consecutive errors and resets on success"""
+        self.bot._check_interval = 30
+        self.mock_client_instance.get_current_price.side_effect = Exception('API down')
+
+        delays = [self.bot.tick() for _ in range(7)]
+        self.assertEqual(delays, [10, 20, 40, 80, 160, 300, 300])
+
+        self.mock_client_instance.get_current_price.side_effect = None
+        self.mock_client_instance.get_current_price.return_value = 50000.0
+        self.bot.get_coin_value_in_usdt = MagicMock(return_value=20.0)
+        self.assertEqual(self.bot.tick(), 30)
+        self.assertEqual(self.bot._error_backoff, 10)
+
     def test_check_order_executions(self):
         """Test check_order_executions method"""
         # Mock get_recent_trades
@@ -200,6 +244,84 @@ class TestGridTradingBot(unittest.TestCase):
         # Check if grid indices were updated
         self.assertEqual(self.bot.current_grid_buy_index, 1)
         self.assertEqual(self.bot.current_grid_sell_index, 1)
+    
+    def test_check_order_executions_average_price(self):
+        """Test the last buy price is the quantity-weighted average of all buys"""
+        self.bot.get_coin_balance = MagicMock(return_value=0.003)
+
+        self.mock_client_instance.get_recent_trades.return_value = [
+            {'orderId': 1, 'price': '50000.0', 'qty': '0.001'}
+        ]
+        self.bot.active_buy_order_id = 1
+        self.bot.check_order_executions()
+
+        self.mock_client_instance.get_recent_trades.return_value = [
+            {'orderId': 2, 'price': '40000.0', 'qty': '0.002'}
+        ]
+        self.bot.active_buy_order_id = 2
+        self.bot.check_order_executions()
+
+        # (50 + 80) USDT / 0.003 coins
+        self.assertAlmostEqual(self.bot.last_buy_price, 130.0 / 0.003)
+
+class TestGridTradingManager(unittest.TestCase):
+    def test_poll_trades_once(self):
+        """Test poll_trades_once only fetches trades for bots with active orders"""
+        manager = GridTradingManager(['BTCUSDT', 'ETHUSDT'])
+
+        active_bot = MagicMock()
+        active_bot.symbol = 'BTCUSDT'
+        active_bot.has_active_orders.return_value = True
+        active_bot.client.get_recent_trades.return_value = [{'orderId': 12345, 'price': '50000.0', 'qty': '0.001'}]
+
+        idle_bot = MagicMock()
+        idle_bot.symbol = 'ETHUSDT'
+        idle_bot.has_active_orders.return_value = False
+
+        manager.bots = {'BTCUSDT': active_bot, 'ETHUSDT': idle_bot}
+        manager.poll_trades_once()
+
+        active_bot.client.get_recent_trades.assert_called_once_with('BTCUSDT')
+        active_bot.on_trades.assert_called_once_with([{'orderId': 12345, 'price': '50000.0', 'qty': '0.001'}])
+        idle_bot.client.get_recent_trades.assert_not_called()
+        idle_bot.on_trades.assert_not_called()
+
+    def test_schedule_due_bots(self):
+        """Test schedule_due_bots ticks due bots and reschedules them after the returned delay"""
+        manager = GridTradingManager(['BTCUSDT'])
+
+        bot = MagicMock()
+        bot.tick.return_value = 30
+        manager.bots = {'BTCUSDT': bot}
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            manager.schedule_due_bots(executor)
+        bot.tick.assert_called_once()
+        self.assertNotIn('BTCUSDT', manager._running)
+
+        # The bot is not due again until its interval has passed
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            manager.schedule_due_bots(executor)
+        bot.tick.assert_called_once()
+
+    def test_schedule_due_bots_shares_prices(self):
+        """Test schedule_due_bots hands every due bot its price from one request"""
+        manager = GridTradingManager(['BTCUSDT', 'ETHUSDT'])
+        manager.client = MagicMock()
+        manager.client.get_all_prices.return_value = {'BTCUSDT': 50000.0, 'ETHUSDT': 3000.0}
+
+        btc_bot = MagicMock()
+        btc_bot.tick.return_value = 30
+        eth_bot = MagicMock()
+        eth_bot.tick.return_value = 30
+        manager.bots = {'BTCUSDT': btc_bot, 'ETHUSDT': eth_bot}
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            manager.schedule_due_bots(executor)
+
+        manager.client.get_all_prices.assert_called_once()
+        btc_bot.update_price.assert_called_once_with(50000.0)
+        eth_bot.update_price.assert_called_once_with(3000.0)
 
 if __name__ == '__main__':
     unittest.main()
@@ -62,6 +62,22 @@ class TestIndicators(unittest.TestCase):
         # Instead of checking specific indices, just verify we have some valid values
         self.assertTrue(result_df['rsi'].notna().any())
 
+    def test_rsi_wilder(self):
+        """Test _rsi_wilder against a hand-computed Wilder RSI"""
+        close = np.array([10.0, 11.0, 10.0, 12.0, 11.0])
+        rsi = indicators._rsi_wilder(close, 2)
+
+        # Seed averages: gain (1 + 0) / 2, loss (0 + 1) / 2 -> RSI 50
+        self.assertTrue(np.isnan(rsi[:2]).all())
+        self.assertAlmostEqual(rsi[2], 50.0)
+        # Gain 2: avg_gain 1.25, avg_loss 0.25 -> RS 5
+        self.assertAlmostEqual(rsi[3], 100 - 100 / 6)
+        # Loss 1: avg_gain 0.625, avg_loss 0.625 -> RS 1
+        self.assertAlmostEqual(rsi[4], 50.0)
+
+        # Only gains gives RSI 100
+        self.assertEqual(indicators._rsi_wilder(np.arange(5.0), 2)[-1], 100.0)
+
     def test_detect_candle_pattern(self):
         """Test detect_candle_pattern function"""
         # Call the function
@@ -70,8 +86,13 @@ class TestIndicators(unittest.TestCase):
         # Verify the result
         self.assertIn('is_green', result_df.columns)
         self.assertIn('is_red', result_df.columns)
+        self.assertEqual(result_df['candle_dir'].dtype, np.int8)
         self.assertEqual(len(result_df), len(self.df))
 
+        # candle_dir agrees with the boolean columns
+        np.testing.assert_array_equal(result_df['candle_dir'] == 1, result_df['is_green'])
+        np.testing.assert_array_equal(result_df['candle_dir'] == -1, result_df['is_red'])
+
         # Check that is_green and is_red are mutually exclusive
         self.assertTrue(((result_df['is_green'] & result_df['is_red']) == False).all())
 
@@ -101,6 +122,44 @@ class TestIndicators(unittest.TestCase):
         sma_short = self.df['close'].iloc[:short_period].mean()
         self.assertAlmostEqual(result_df[f'ema_{short_period}'].iloc[short_period-1], sma_short, delta=100)
 
+    def test_ema_matches_pandas(self):
+        """Test _ema matches pandas ewm with adjust=False"""
+        expected = self.df['close'].ewm(span=20, adjust=False).mean().to_numpy()
+        result = indicators._ema(self.df['close'].to_numpy(), 20)
+        np.testing.assert_allclose(result, expected, rtol=1e-12)
+
+    def test_ema_flat_input_is_exact(self):
+        """Test constant closes give an EMA equal to the input and no EMA crosses"""
+        flat = pd.DataFrame({'close': np.full(100, 0.5123)})
+
+        for span in (12, 20, 50):
+            np.testing.assert_array_equal(indicators._ema(flat['close'].to_numpy(), span), flat['close'].to_numpy())
+
+        result_df = indicators.calculate_ema(flat)
+        self.assertFalse(result_df['ema_cross_up'].any())
+        self.assertFalse(result_df['ema_cross_down'].any())
+
+    def test_rolling_mean_std_matches_pandas(self):
+        """Test _rolling_mean_std matches pandas rolling mean and std"""
+        mean, std = indicators._rolling_mean_std(self.df['close'].to_numpy(), 20)
+        rolling = self.df['close'].rolling(window=20)
+        np.testing.assert_allclose(mean, rolling.mean().to_numpy(), rtol=1e-9)
+        np.testing.assert_allclose(std, rolling.std().to_numpy(), rtol=1e-6)
+
+    def test_cross_matches_pandas_shift(self):
+        """Test _cross_up/_cross_down match the Series.shift(1) formulation"""
+        a = self.df['close']
+        b = a.rolling(window=5, min_periods=1).mean()
+        expected_up = (a > b) & (a.shift(1) <= b.shift(1))
+        expected_down = (a < b) & (a.shift(1) >= b.shift(1))
+        np.testing.assert_array_equal(indicators._cross_up(a.to_numpy(), b.to_numpy()), expected_up.to_numpy())
+        np.testing.assert_array_equal(indicators._cross_down(a.to_numpy(), b.to_numpy()), expected_down.to_numpy())
+
+        # Scalar levels are broadcast
+        centered = (a - a.mean()).to_numpy()
+        np.testing.assert_array_equal(indicators._cross_up(centered, 0.0),
+                                      indicators._cross_up(centered, np.zeros(len(centered))))
+
     def test_calculate_bollinger_bands(self):
         """Test calculate_bollinger_bands function"""
         # Call the function
@@ -114,6 +173,8 @@ class TestIndicators(unittest.TestCase):
         self.assertIn('bb_percent_b', result_df.columns)
         self.assertIn('bb_breakout_up', result_df.columns)
         self.assertIn('bb_breakout_down', result_df.columns)
+        self.assertIn('bb_signal', result_df.columns)
+        self.assertEqual(result_df['bb_signal'].dtype, np.int8)
         self.assertEqual(len(result_df), len(self.df))
 
         # Check that upper band is always higher than middle band
@@ -162,6 +223,75 @@ class TestIndicators(unittest.TestCase):
                 places=10
             )
 
+    def test_calculate_macd_flat_input_has_no_crosses(self):
+        """Test level closes give no MACD zero-crosses or signal crosses"""
+        for close in (np.full(100, 0.5123), np.r_[np.full(50, 100.0), np.full(50, 110.0)]):
+            result_df = indicators.calculate_macd(pd.DataFrame({'close': close, 'high': close, 'low': close}), 12, 26, 9)
+
+            # Only the step itself may produce a zero cross, never the level stretches around it
+            self.assertEqual(result_df['macd_zero_cross_up'].sum(), int(close[-1] > close[0]))
+            self.assertFalse(result_df['macd_zero_cross_down'].any())
+            if close[-1] == close[0]:
+                self.assertFalse(result_df['macd_line'].any())
+                self.assertFalse(result_df['macd_cross_up'].any())
+                self.assertFalse(result_df['macd_cross_down'].any())
+
+    def test_macd_divergence(self):
+        """Test _macd_divergence finds a lower price low with a higher MACD low"""
+        low = np.array([9, 5, 6, 7, 8, 9, 10, 11, 12, 13, 4], dtype=float)
+        high = low + 1
+        macd = np.zeros(len(low))
+        macd[10] = 1.0
+
+        bullish, bearish = indicators._macd_divergence(low, high, macd)
+        self.assertTrue(bullish[10])
+        self.assertEqual(bullish.sum(), 1)
+        self.assertFalse(bearish.any())
+
+        # No divergence when MACD confirms the lower low
+        macd[10] = -1.0
+        bullish, _ = indicators._macd_divergence(low, high, macd)
+        self.assertFalse(bullish.any())
+
+    def test_compute_all_indicators(self):
+        """Test compute_all_indicators adds every indicator without touching the input"""
+        original_columns = list(self.df.columns)
+        result_df = indicators.compute_all_indicators(self.df)
+
+        self.assertEqual(list(self.df.columns), original_columns)
+        for column in ('rsi', 'is_green', 'ema_cross_up', 'bb_percent_b', 'macd_histogram'):
+            self.assertIn(column, result_df.columns)
+
+        # In place, the columns are added to the same frame
+        df = self.df.copy()
+        self.assertIs(indicators.compute_all_indicators(df, inplace=True), df)
+        self.assertIn('macd_line', df.columns)
+
+    def test_pack_signal_flags(self):
+        """Test pack_signal_flags sets one bit per true column"""
+        df = pd.DataFrame({
+            'macd_cross_up': [True, False],
+            'is_green': [True, True],
+            'is_red': [False, False]
+        })
+        flags = indicators.pack_signal_flags(df)
+
+        bits = indicators.SIGNAL_FLAGS
+        self.assertEqual(flags[0], bits['macd_cross_up'] | bits['is_green'])
+        self.assertEqual(flags[1], bits['is_green'])
+
+    def test_indicator_state_matches_batch(self):
+        """Test IndicatorState streaming values match the batch calculations"""
+        result_df = indicators.compute_all_indicators(self.df)
+        state = indicators.IndicatorState()
+
+        for close in self.df['close']:
+            values = state.update(close)
+
+        for column in ('rsi', 'ema_20', 'ema_50', 'macd_line', 'macd_signal', 'bb_middle', 'bb_upper', 'bb_lower'):
+            self.assertAlmostEqual(values[column], result_df[column].iloc[-1], places=6)
+        self.assertEqual(values['ema_cross_up'], bool(result_df['ema_cross_up'].iloc[-1]))
+
     def test_check_entry_signal(self):
         """Test check_entry_signal function"""
         # Prepare test data with known signals
@@ -236,5 +366,14 @@ class TestIndicators(unittest.TestCase):
         signal = indicators.check_entry_signal(df)
         self.assertEqual(signal, 'LONG')
 
+    def test_check_entry_signals_matches_per_bar(self):
+        """Test check_entry_signals matches check_entry_signal on each prefix"""
+        df = indicators.compute_all_indicators(self.df)
+        signals = indicators.check_entry_signals(df)
+
+        self.assertEqual(len(signals), len(df))
+        for i in range(len(df)):
+            self.assertEqual(signals[i], indicators.check_entry_signal(df.iloc[:i+1]), f"bar {i}")
+
 if __name__ == '__main__':
     unittest.main()
@@ -2,11 +2,13 @@ import unittest
 from unittest.mock import patch, MagicMock
 import sys
 import os
+import numpy as np
 
 # Add the parent directory to sys.path to import modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from position_manager import PositionManager
+from position_manager import PositionManager, size_position
+from binance_client import BinanceAPIError
 import config
 
 class TestPositionManager(unittest.TestCase):
@@ -51,6 +53,41 @@ class TestPositionManager(unittest.TestCase):
         self.assertEqual(balance, 10000.0)
         self.client.get_account_info.assert_called_once()
 
+    def test_get_account_balance_api_error(self):
+        """Test get_account_balance returns 0 on API errors but surfaces schema errors"""
+        self.client.get_account_info.side_effect = BinanceAPIError('API error -1021: Timestamp outside recvWindow')
+        with patch('position_manager.logger'):
+            self.assertEqual(self.position_manager.get_account_balance(), 0.0)
+
+        self.client.get_account_info.side_effect = None
+        self.client.get_account_info.return_value = {'positions': []}
+        with self.assertRaises(KeyError):
+            self.position_manager.get_account_balance()
+
+    def test_decision_tick_shares_account_lookups(self):
+        """Test account data is fetched once per decision tick"""
+        with self.position_manager.decision_tick():
+            self.position_manager.calculate_position_size(price=50000.0)
+            self.position_manager.get_account_usage_percentage()
+            self.position_manager.has_open_position('LONG')
+            self.position_manager.has_open_position('SHORT')
+
+        self.client.get_account_info.assert_called_once()
+        self.assertEqual(self.client.get_open_positions.call_count, 2)  # all symbols, then BTCUSDT
+
+        # Outside a tick every call goes to the client again
+        self.position_manager.get_account_balance()
+        self.assertEqual(self.client.get_account_info.call_count, 2)
+
+    def test_invalidate_tick_cache(self):
+        """Test invalidate_tick_cache forces a fresh lookup within the tick"""
+        with self.position_manager.decision_tick():
+            self.position_manager.get_account_balance()
+            self.position_manager.invalidate_tick_cache()
+            self.position_manager.get_account_balance()
+
+        self.assertEqual(self.client.get_account_info.call_count, 2)
+
     def test_get_total_position_value_empty(self):
         """Test get_total_position_value method with no positions"""
         # Call the method
@@ -117,6 +154,45 @@ class TestPositionManager(unittest.TestCase):
         expected_size = 0.005
         self.assertEqual(size, expected_size)
 
+    def test_calculate_position_size_fetches_account_once(self):
+        """Test calculate_position_size reuses the balance for the usage check"""
+        self.position_manager.calculate_position_size(price=50000.0, leverage=10)
+
+        self.client.get_account_info.assert_called_once()
+        self.client.get_open_positions.assert_called_once()
+
+    def test_size_position(self):
+        """Test size_position with and without the minimum notional adjustment"""
+        # 10000 * 5% * 5% margin * 10x = 250 USDT notional
+        quantity, min_quantity, min_balance_needed = size_position(50000.0, 10000.0, 5.0, 5.0, 10)
+        self.assertAlmostEqual(quantity * 50000.0, 250.0)
+        self.assertIsNone(min_quantity)
+        self.assertEqual(min_balance_needed, 0.0)
+
+        # 100 * 5% * 5% margin * 10x = 2.5 USDT notional, below the 5 USDT minimum
+        quantity, min_quantity, min_balance_needed = size_position(50000.0, 100.0, 5.0, 5.0, 10)
+        self.assertAlmostEqual(quantity * 50000.0, 2.5)
+        self.assertAlmostEqual(min_quantity * 50000.0, 5.0)
+        self.assertAlmostEqual(min_balance_needed, 200.0)
+
+    def test_calculate_position_sizes_matches_scalar(self):
+        """Test calculate_position_sizes agrees with calculate_position_size per price"""
+        prices = [50000.0, 3000.0, 150.0, 0.5]
+        with patch('position_manager.logger'):
+            sizes = self.position_manager.calculate_position_sizes(prices, leverage=10)
+            expected = [self.position_manager.calculate_position_size(price, leverage=10) for price in prices]
+
+        self.assertEqual([round(size, 3) for size in sizes], expected)
+
+    def test_calculate_position_sizes_insufficient_balance(self):
+        """Test calculate_position_sizes returns zeros when the minimum notional is out of reach"""
+        self.client.get_account_info.return_value = {'totalWalletBalance': '100.0', 'positions': []}
+
+        with patch('position_manager.logger'):
+            sizes = self.position_manager.calculate_position_sizes([50000.0, 3000.0], leverage=10)
+
+        self.assertEqual(sizes.tolist(), [0.0, 0.0])
+
     def test_calculate_position_size_max_usage(self):
         """Test calculate_position_size method when max usage is reached"""
         # Set up mock account usage (60%)
@@ -189,6 +265,17 @@ class TestPositionManager(unittest.TestCase):
         expected_sl = 50150.0
         self.assertEqual(sl_price, expected_sl)
 
+    def test_calculate_tp_sl_batch(self):
+        """Test calculate_tp_sl_batch matches the single-position methods"""
+        entry_prices = [50000.0, 50000.0, 3000.0]
+        sides = ['LONG', 'SHORT', 'SHORT']
+
+        tp_prices, sl_prices = self.position_manager.calculate_tp_sl_batch(entry_prices, sides)
+
+        for entry_price, side, tp_price, sl_price in zip(entry_prices, sides, tp_prices, sl_prices):
+            self.assertEqual(round(tp_price, 2), self.position_manager.calculate_take_profit_price(entry_price, side))
+            self.assertEqual(round(sl_price, 2), self.position_manager.calculate_stop_loss_price(entry_price, side))
+
     def test_has_open_position_true(self):
         """Test has_open_position method when position exists"""
         # Set up mock positions
@@ -233,8 +320,8 @@ class TestPositionManager(unittest.TestCase):
         self.mock_config.HEDGE_MODE = True
         self.mock_config.ALLOW_BOTH_POSITIONS = True
 
-        # Set up mock for has_open_position
-        self.position_manager.has_open_position = MagicMock(return_value=True)
+        # Set up mock for open sides
+        self.position_manager._open_sides = MagicMock(return_value=frozenset({'LONG', 'SHORT'}))
 
         # Call the method
         result = self.position_manager.can_enter_position('LONG', 'BTCUSDT')
@@ -248,8 +335,10 @@ class TestPositionManager(unittest.TestCase):
         self.mock_config.HEDGE_MODE = True
         self.mock_config.ALLOW_BOTH_POSITIONS = False
 
-        # Set up mock for has_open_position
-        self.position_manager.has_open_position = MagicMock(side_effect=lambda side, symbol: side == 'SHORT')
+        # Set up mock for open positions
+        self.client.get_open_positions.return_value = [
+            {'symbol': 'BTCUSDT', 'positionSide': 'SHORT', 'positionAmt': '-0.1'}
+        ]
 
         # Call the method
         result = self.position_manager.can_enter_position('LONG', 'BTCUSDT')
@@ -262,8 +351,10 @@ class TestPositionManager(unittest.TestCase):
         # Set up config
         self.mock_config.HEDGE_MODE = False
 
-        # Set up mock for has_open_position
-        self.position_manager.has_open_position = MagicMock(side_effect=lambda side, symbol: side == 'SHORT')
+        # Set up mock for open positions
+        self.client.get_open_positions.return_value = [
+            {'symbol': 'BTCUSDT', 'positionSide': 'SHORT', 'positionAmt': '-0.1'}
+        ]
 
         # Call the method
         result = self.position_manager.can_enter_position('LONG', 'BTCUSDT')
@@ -271,6 +362,61 @@ class TestPositionManager(unittest.TestCase):
         # Verify the result
         self.assertFalse(result)
 
+    def test_can_enter_position_fetches_positions_once(self):
+        """Test can_enter_position checks both sides from a single fetch"""
+        self.mock_config.HEDGE_MODE = False
+        self.client.get_open_positions.return_value = [
+            {'symbol': 'BTCUSDT', 'positionSide': 'BOTH', 'positionAmt': '0'}
+        ]
+
+        self.assertTrue(self.position_manager.can_enter_position('LONG', 'BTCUSDT'))
+        self.client.get_open_positions.assert_called_once_with('BTCUSDT')
+
+    def test_is_profitable_after_fees(self):
+        """Test is_profitable_after_fees nets both fees out of the raw profit"""
+        self.mock_config.MIN_PROFIT_AFTER_FEES = 0.1
+        self.client.calculate_trading_fees_batch.return_value = np.array([2.0, 1.0])
+        position_info = {'entry_price': 100.0, 'position_amt': '-10', 'position_side': 'SHORT'}
+
+        is_profitable, profit_info = self.position_manager.is_profitable_after_fees(position_info, current_price=95.0)
+
+        # One fee lookup for the close and open legs
+        self.client.calculate_trading_fees_batch.assert_called_once()
+        quantities, prices = self.client.calculate_trading_fees_batch.call_args[0]
+        self.assertEqual(quantities.tolist(), [10.0, 10.0])
+        self.assertEqual(prices.tolist(), [95.0, 100.0])
+        self.assertTrue(is_profitable)
+        self.assertEqual(profit_info['raw_profit'], 50.0)
+        self.assertAlmostEqual(profit_info['raw_profit_percentage'], 5.0)
+        self.assertEqual(profit_info['close_fee'], 2.0)
+        self.assertEqual(profit_info['open_fee'], 1.0)
+        self.assertEqual(profit_info['net_profit'], 47.0)
+        self.assertAlmostEqual(profit_info['net_profit_percentage'], 4.7)
+
+    def test_are_profitable_after_fees_matches_single(self):
+        """Test are_profitable_after_fees agrees with is_profitable_after_fees per position"""
+        self.mock_config.MIN_PROFIT_AFTER_FEES = 0.05
+        self.client.calculate_trading_fees_batch.side_effect = (
+            lambda quantities, prices, is_market_order=True:
+            np.asarray(quantities, dtype=np.float64) * np.asarray(prices, dtype=np.float64) * 0.0004
+        )
+        positions = [
+            {'entry_price': '100.0', 'position_amt': '2', 'position_side': 'LONG'},
+            {'entry_price': '100.0', 'position_amt': '2', 'position_side': 'LONG'},
+            {'entry_price': '100.0', 'position_amt': '-2', 'position_side': 'SHORT'},
+            {'entry_price': '100.0', 'position_amt': '-2', 'position_side': 'SHORT'},
+            {'entry_price': '100.0', 'position_amt': '0', 'position_side': 'LONG'},
+        ]
+        current_prices = [101.0, 100.1, 99.0, 100.05, 120.0]
+
+        is_profitable, meets_min_profit = self.position_manager.are_profitable_after_fees(positions, current_prices)
+
+        for i, (position, price) in enumerate(zip(positions, current_prices)):
+            meets, profit_info = self.position_manager.is_profitable_after_fees(position, current_price=price)
+            self.assertEqual(meets_min_profit[i], meets)
+            self.assertEqual(is_profitable[i], profit_info['is_profitable'])
+            self.assertEqual(self.position_manager.meets_min_profit_after_fees(position, current_price=price), meets)
+
     def test_should_hedge_position_auto_hedge_disabled(self):
         """Test should_hedge_position method with auto-hedge disabled"""
         # Set up config
@@ -0,0 +1,69 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+import numpy as np
+
+# Add the parent directory to sys.path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from positions_util import fetch_prices, scan_losing_positions
+
+class TestPositionsUtil(unittest.TestCase):
+
+    def scan(self, entry, mark, amt, lev, threshold, tick=None):
+        """Run scan_losing_positions on plain lists"""
+        return scan_losing_positions(
+            np.array(entry, dtype=float),
+            np.array(mark, dtype=float),
+            np.array(amt, dtype=float),
+            np.array(lev, dtype=float),
+            threshold,
+            tick=None if tick is None else np.array(tick, dtype=float)
+        )
+
+    def test_scan_losing_positions_long_and_short(self):
+        """Test LONG and SHORT losses are scaled by leverage"""
+        indices, pnl = self.scan([100, 100], [90, 110], [1, -1], [10, 10], 50)
+
+        np.testing.assert_allclose(pnl, [-100.0, (100 / 110 - 1) * 1000])
+        self.assertEqual(indices.tolist(), [0, 1])
+
+    def test_scan_losing_positions_below_threshold(self):
+        """Test positions within the threshold are not reported"""
+        indices, _ = self.scan([100], [99], [1], [10], 50, tick=[0.1])
+
+        self.assertEqual(indices.tolist(), [])
+
+    def test_scan_losing_positions_exact_threshold(self):
+        """Test a loss exactly at the threshold is reported on both paths"""
+        # -0.5% at 1x leverage against a 0.5% threshold
+        for tick in (None, [np.nan], [1.0]):
+            indices, _ = self.scan([1000], [995], [1], [1], 0.5, tick=tick)
+            self.assertEqual(indices.tolist(), [0], f"tick={tick}")
+
+    def test_scan_losing_positions_integer_path_does_not_floor(self):
+        """Test the integer path agrees with the float path just inside the threshold"""
+        # -33.33...% loss against a 33.34% threshold: not losing
+        for tick in (None, [1.0]):
+            indices, _ = self.scan([3], [2], [1], [1], 33.34, tick=tick)
+            self.assertEqual(indices.tolist(), [], f"tick={tick}")
+
+    def test_scan_losing_positions_integer_path_keeps_fractional_threshold(self):
+        """Test a threshold with sub-basis-point precision is not truncated"""
+        # -0.5% loss against a 0.505% threshold: not losing
+        for tick in (None, [1.0]):
+            indices, _ = self.scan([1000], [995], [1], [1], 0.505, tick=tick)
+            self.assertEqual(indices.tolist(), [], f"tick={tick}")
+
+    def test_fetch_prices(self):
+        """Test prices are fetched per symbol and failures map to None"""
+        client = MagicMock()
+        client.get_current_price.side_effect = lambda s: {'BTCUSDT': 50000.0}[s]
+
+        prices = fetch_prices(client, ['BTCUSDT', 'ETHUSDT'])
+
+        self.assertEqual(prices, {'BTCUSDT': 50000.0, 'ETHUSDT': None})
+
+if __name__ == '__main__':
+    unittest.main()
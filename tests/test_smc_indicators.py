@@ -80,6 +80,9 @@ class TestSMCIndicators(unittest.TestCase):
         self.assertIn('bos_bullish', result_df.columns)
         self.assertIn('bos_bearish', result_df.columns)
         self.assertIn('market_structure', result_df.columns)
+        self.assertEqual(result_df['market_structure_code'].dtype, np.int8)
+        self.assertEqual(result_df['market_structure_code'].iloc[-1],
+                         smc_indicators.MARKET_STRUCTURE_CODES[result_df['market_structure'].iloc[-1]])
 
         # Test with uptrend data - use a smaller lookback for test data
         uptrend_result = smc_indicators.detect_market_structure(self.uptrend_df, lookback=1)
@@ -141,5 +144,14 @@ class TestSMCIndicators(unittest.TestCase):
         bearish_fvg_idx = fvg_result[fvg_result['bearish_fvg']].index[0]
         self.assertGreater(fvg_result.loc[bearish_fvg_idx, 'fvg_size'], 0)
 
+        # The nearest FVG edges are materialized on the latest candle
+        latest = fvg_result.iloc[-1]
+        for idx_col, edge_col, fvg_col in (('nearest_bullish_fvg', 'nearest_bullish_fvg_bottom', 'fvg_bottom'),
+                                           ('nearest_bearish_fvg', 'nearest_bearish_fvg_top', 'fvg_top')):
+            if pd.isna(latest[idx_col]):
+                self.assertTrue(pd.isna(latest[edge_col]))
+            else:
+                self.assertEqual(latest[edge_col], fvg_result.loc[latest[idx_col], fvg_col])
+
 if __name__ == '__main__':
     unittest.main()
@@ -7,7 +7,7 @@ import logging
 # Add the parent directory to sys.path to import modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from telegram_notifier import TelegramNotifier
+from telegram_notifier import TelegramNotifier, MAX_QUEUED_MESSAGES
 import config
 
 class TestTelegramNotifier(unittest.TestCase):
@@ -99,6 +99,18 @@ class TestTelegramNotifier(unittest.TestCase):
         # Verify no request was made
         self.mock_requests.post.assert_not_called()
 
+    def test_enqueue_drops_when_full(self):
+        """Test enqueue queues messages without blocking and drops them once the queue is full"""
+        # Keep the background sender from draining the queue
+        self.notifier._start_sender = MagicMock()
+
+        for i in range(MAX_QUEUED_MESSAGES):
+            self.assertTrue(self.notifier.enqueue(f"Message {i}"))
+
+        self.assertFalse(self.notifier.enqueue("Dropped message"))
+        self.assertEqual(self.notifier._queue.qsize(), MAX_QUEUED_MESSAGES)
+        self.mock_requests.post.assert_not_called()
+
     def test_notify_entry(self):
         """Test notify_entry method"""
         # Call the method
@@ -32,17 +32,8 @@ class TestTradingBot(unittest.TestCase):
         self.mock_telegram_notifier_class.return_value = self.mock_telegram_notifier
 
         # Create mocks for indicator functions
-        self.calculate_rsi_patcher = patch('bot.calculate_rsi')
-        self.mock_calculate_rsi = self.calculate_rsi_patcher.start()
-
-        self.detect_candle_pattern_patcher = patch('bot.detect_candle_pattern')
-        self.mock_detect_candle_pattern = self.detect_candle_pattern_patcher.start()
-
-        self.calculate_ema_patcher = patch('bot.calculate_ema')
-        self.mock_calculate_ema = self.calculate_ema_patcher.start()
-
-        self.calculate_bollinger_bands_patcher = patch('bot.calculate_bollinger_bands')
-        self.mock_calculate_bollinger_bands = self.calculate_bollinger_bands_patcher.start()
+        self.compute_all_indicators_patcher = patch('bot.compute_all_indicators')
+        self.mock_compute_all_indicators = self.compute_all_indicators_patcher.start()
 
         self.check_entry_signal_patcher = patch('bot.check_entry_signal')
         self.mock_check_entry_signal = self.check_entry_signal_patcher.start()
@@ -73,10 +64,7 @@ class TestTradingBot(unittest.TestCase):
         self.binance_client_patcher.stop()
         self.position_manager_patcher.stop()
         self.telegram_notifier_patcher.stop()
-        self.calculate_rsi_patcher.stop()
-        self.detect_candle_pattern_patcher.stop()
-        self.calculate_ema_patcher.stop()
-        self.calculate_bollinger_bands_patcher.stop()
+        self.compute_all_indicators_patcher.stop()
         self.check_entry_signal_patcher.stop()
         self.config_patcher.stop()
         logging.disable(logging.NOTSET)
@@ -183,6 +171,25 @@ class TestTradingBot(unittest.TestCase):
             # Restore the original method
             self.bot.check_daily_pnl = original_method
 
+    @patch('bot.detect_fair_value_gaps', side_effect=lambda df, inplace=False: df)
+    @patch('bot.detect_market_structure', side_effect=lambda df, inplace=False: df)
+    def test_compute_indicators_reuses_unchanged_klines(self, mock_structure, mock_fvg):
+        """Test indicators are only recalculated when the klines change"""
+        self.mock_compute_all_indicators.side_effect = lambda df, inplace=False: df
+        df = pd.DataFrame({'open_time': [1, 2], 'close': [50000.0, 50100.0]})
+
+        first = self.bot._compute_indicators(df)
+        second = self.bot._compute_indicators(df.copy())
+        self.assertIs(second, first)
+        self.assertEqual(self.mock_compute_all_indicators.call_count, 1)
+
+        # A new price on the latest candle triggers a recalculation
+        changed = df.copy()
+        changed.loc[1, 'close'] = 50200.0
+        self.bot._compute_indicators(changed)
+        self.assertEqual(self.mock_compute_all_indicators.call_count, 2)
+        self.assertEqual(mock_structure.call_count, 2)
+
     def test_check_and_enter_position_no_signal(self):
         """Test check_and_enter_position method with no signal"""
         # Set up mocks
@@ -300,6 +307,48 @@ class TestTradingBot(unittest.TestCase):
             # Restore the original method
             self.bot.check_and_enter_position = original_method
 
+    def test_check_and_enter_position_fee_check_error_still_places_tp_sl(self):
+        """Test a failing fee check keeps the unadjusted TP and still places TP/SL orders"""
+        self.mock_config.KLINE_LIMIT = 100
+        self.mock_config.EMA_SHORT_PERIOD = 20
+        self.mock_config.EMA_LONG_PERIOD = 50
+        self.mock_config.RSI_OVERSOLD = 30
+        self.mock_config.RSI_OVERBOUGHT = 70
+        self.mock_binance_client.get_klines.return_value = pd.DataFrame({'close': [50000.0] * 100})
+        self.bot._compute_indicators = MagicMock(return_value=pd.DataFrame({
+            'close': [50000.0], 'rsi': [25.0], 'is_green': [True], 'is_red': [False],
+            'ema_20': [50000.0], 'ema_50': [49900.0], 'bb_percent_b': [0.1],
+            'macd_line': [1.0], 'macd_signal': [0.5], 'market_structure': ['uptrend'],
+            'bos_bullish': [False], 'bos_bearish': [False], 'ema_cross_up': [True],
+            'ema_cross_down': [False], 'bb_breakout_up': [False], 'bb_breakout_down': [False]
+        }))
+        self.mock_check_entry_signal.return_value = 'LONG'
+        self.mock_position_manager.should_hedge_position.return_value = (False, None, None)
+        self.mock_position_manager.can_enter_position.return_value = True
+        self.mock_binance_client.get_current_price.return_value = 50000.0
+        self.mock_position_manager.calculate_position_size.return_value = 0.1
+        self.mock_position_manager.calculate_take_profit_price.return_value = 50300.0
+        self.mock_position_manager.calculate_stop_loss_price.return_value = 49850.0
+        self.mock_position_manager.is_profitable_after_fees.side_effect = KeyError('entry_price')
+
+        self.bot.check_and_enter_position()
+
+        self.mock_binance_client.place_market_order.assert_called_once()
+        self.mock_binance_client.place_take_profit_order.assert_called_once_with(
+            side='SELL',
+            quantity=0.1,
+            stop_price=50300.0,
+            position_side='LONG',
+            symbol='BTCUSDT'
+        )
+        self.mock_binance_client.place_stop_loss_order.assert_called_once_with(
+            side='SELL',
+            quantity=0.1,
+            stop_price=49850.0,
+            position_side='LONG',
+            symbol='BTCUSDT'
+        )
+
     def test_check_and_enter_position_auto_hedge(self):
         """Test check_and_enter_position method with auto-hedging"""
         # Create a custom implementation of check_and_enter_position